@@ -0,0 +1,23 @@
+"""Advisories of the predefined sizes shared by the benchmarks (generated once per session)."""
+
+import msgspec
+import pytest
+
+from benchmarks.generate import SIZES, sized
+
+
+@pytest.fixture(scope='session', params=tuple(SIZES))
+def advisory(request):
+    return sized(request.param)
+
+
+@pytest.fixture(scope='session')
+def encoded(advisory):
+    return msgspec.json.encode(advisory)
+
+
+@pytest.fixture(scope='session')
+def advisory_path(advisory, encoded, tmp_path_factory):
+    path = tmp_path_factory.mktemp('advisories') / f'{advisory["document"]["tracking"]["id"]}.json'
+    path.write_bytes(encoded)
+    return str(path)
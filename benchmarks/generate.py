@@ -0,0 +1,175 @@
+"""Deterministic generator of synthetic CSAF advisories of configurable size (valid per model and mandatory rules).
+
+Usage (write an advisory with 10000 products and 100 vulnerabilities to stdout):
+
+  python -m benchmarks.generate --products 10000 --vulnerabilities 100
+"""
+
+import argparse
+import inspect
+import math
+import random
+import sys
+from typing import Any, Dict, List, Optional
+
+import msgspec
+
+import csaf.scoring as scoring
+
+BRANCH_CATEGORIES = ('vendor', 'product_family', 'product_name')  # the leaves are product versions
+VECTORS = (  # a small pool as the same vectors recur in the wild
+    'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H',
+    'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H',
+    'CVSS:3.1/AV:N/AC:L/PR:L/UI:N/S:C/C:L/I:L/A:N',
+    'CVSS:3.1/AV:L/AC:L/PR:H/UI:R/S:U/C:H/I:H/A:H',
+    'CVSS:3.1/AV:N/AC:H/PR:N/UI:R/S:U/C:L/I:N/A:N/E:P/RL:O/RC:C',
+    'CVSS:3.0/AV:A/AC:L/PR:L/UI:N/S:U/C:H/I:N/A:N',
+)
+SHAPE = ('products', 'depth', 'relationships', 'groups', 'vulnerabilities', 'scores')
+SIZES = {  # name and shape for the scaling curves
+    'small': {'products': 10, 'depth': 2, 'relationships': 2, 'groups': 2, 'vulnerabilities': 2, 'scores': 1},
+    'medium': {'products': 1000, 'depth': 3, 'relationships': 100, 'groups': 50, 'vulnerabilities': 20, 'scores': 2},
+    'large': {'products': 10000, 'depth': 4, 'relationships': 1000, 'groups': 200, 'vulnerabilities': 100, 'scores': 3},
+}
+RELEASE_DATE = '2024-01-01T00:00:00.000Z'
+
+
+def document(name: str) -> Dict[str, Any]:
+    """Return the document meta data of the advisory."""
+    return {
+        'category': 'csaf_base',
+        'csaf_version': '2.0',
+        'publisher': {'category': 'vendor', 'name': 'ACME', 'namespace': 'https://example.com'},
+        'title': f'Synthetic advisory {name}',
+        'tracking': {
+            'current_release_date': RELEASE_DATE,
+            'id': f'example-com-{name}',
+            'initial_release_date': RELEASE_DATE,
+            'revision_history': [{'date': RELEASE_DATE, 'number': '1', 'summary': 'Initial version.'}],
+            'status': 'final',
+            'version': '1',
+        },
+    }
+
+
+def branches(product_ids: List[str], depth: int, level: int = 0) -> List[Dict[str, Any]]:
+    """Return the branches with the products as leaves below depth levels of roughly equal fan out."""
+    if depth <= 1:
+        return [
+            {
+                'category': 'product_version',
+                'name': f'{pos}.0',
+                'product': {'name': f'Product {product_id}', 'product_id': product_id},
+            }
+            for pos, product_id in enumerate(product_ids)
+        ]
+    fan_out = max(2, math.ceil(len(product_ids) ** (1 / depth)))
+    chunk = max(1, math.ceil(len(product_ids) / fan_out))
+    return [
+        {
+            'category': BRANCH_CATEGORIES[min(level, len(BRANCH_CATEGORIES) - 1)],
+            'name': f'Level {level} part {start // chunk}',
+            'branches': branches(product_ids[start : start + chunk], depth - 1, level + 1),
+        }
+        for start in range(0, len(product_ids), chunk)
+    ]
+
+
+def cvss_v3(vector: str) -> Dict[str, Any]:
+    """Return the CVSS v3 object of the vector with the computed scores and severities."""
+    parsed = scoring.parse(vector)
+    scores = scoring.compute(parsed)
+    return {
+        'version': parsed[0],
+        'vectorString': vector,
+        'baseScore': scores.base,
+        'baseSeverity': scoring.severity(scores.base),
+        'temporalScore': scores.temporal,
+        'temporalSeverity': scoring.severity(scores.temporal),
+    }
+
+
+def advisory(
+    products: int = 100,
+    depth: int = 3,
+    relationships: int = 10,
+    groups: int = 10,
+    vulnerabilities: int = 10,
+    scores: int = 2,
+    seed: int = 42,
+    name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return an advisory of the given shape (the same shape and seed always yield the same advisory)."""
+    rng = random.Random(seed)
+    product_ids = [f'CSAFPID-{n}' for n in range(max(products, 2))]
+    name = name or f'{products}-{vulnerabilities}-{seed}'
+
+    product_tree: Dict[str, Any] = {'branches': branches(product_ids, depth)}
+    if relationships:
+        product_tree['relationships'] = [
+            {
+                'category': 'installed_on',
+                'full_product_name': {'name': f'Relationship {n}', 'product_id': f'CSAFPID-R{n}'},
+                'product_reference': product_reference,
+                'relates_to_product_reference': relates_to,
+            }
+            for n, (product_reference, relates_to) in enumerate(
+                rng.sample(product_ids, 2) for _ in range(relationships)
+            )
+        ]
+    group_ids = [f'CSAFGID-{n}' for n in range(groups)]
+    if groups:
+        product_tree['product_groups'] = [
+            {'group_id': group_id, 'product_ids': rng.sample(product_ids, min(len(product_ids), rng.randint(2, 10)))}
+            for group_id in group_ids
+        ]
+
+    members = product_ids + [f'CSAFPID-R{n}' for n in range(relationships)]
+    entries = []
+    for n in range(vulnerabilities):
+        sample = rng.sample(members, max(3, len(members) // 10))
+        third = len(sample) // 3
+        affected, fixed, not_affected = sample[:third], sample[third : 2 * third], sample[2 * third :]
+        vulnerability: Dict[str, Any] = {
+            'cve': f'CVE-2024-{n:05d}',
+            'product_status': {'known_affected': affected, 'fixed': fixed, 'known_not_affected': not_affected},
+            'scores': [
+                {'products': rng.sample(affected, min(len(affected), 5)), 'cvss_v3': cvss_v3(rng.choice(VECTORS))}
+                for _ in range(scores if affected else 0)
+            ],
+        }
+        if group_ids:
+            vulnerability['remediations'] = [
+                {'category': 'vendor_fix', 'details': 'Update.', 'group_ids': [rng.choice(group_ids)]}
+            ]
+        entries.append(vulnerability)
+
+    generated: Dict[str, Any] = {'document': document(name), 'product_tree': product_tree}
+    if entries:
+        generated['vulnerabilities'] = entries
+    return generated
+
+
+def sized(size: str, seed: int = 42) -> Dict[str, Any]:
+    """Return the advisory of the named size."""
+    return advisory(**SIZES[size], seed=seed, name=size)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Write the advisory of the shape given on the command line as JSON to stdout."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.generate', description='Generate a CSAF advisory.')
+    defaults = inspect.signature(advisory).parameters
+    for option in SHAPE + ('seed',):
+        parser.add_argument(f'--{option}', type=int, default=defaults[option].default)
+    parser.add_argument('--size', choices=tuple(SIZES), help='use a predefined shape (overrides the counts)')
+    options = parser.parse_args(argv)
+    if options.size:
+        generated = sized(options.size, options.seed)
+    else:
+        generated = advisory(**{option: getattr(options, option) for option in SHAPE}, seed=options.seed)
+    sys.stdout.buffer.write(msgspec.json.format(msgspec.json.encode(generated), indent=2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
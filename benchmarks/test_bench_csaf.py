@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import csaf.csaf as api  # noqa: E402
+import csaf.mandatory.rules as rules  # noqa: E402
+import csaf.scoring as scoring  # noqa: E402
+import csaf.stream as stream  # noqa: E402
+from csaf.csaf import CSAF  # noqa: E402
+from csaf.mandatory.index import harvest  # noqa: E402
+
+OPTIONS = {  # validation modes of process
+    'rules': {},
+    'msgspec': {'engine': 'msgspec'},
+    'pydantic': {'engine': 'pydantic'},
+    'schema': {'schema': True},
+}
+RULES = sorted(name for name in dir(rules) if name.startswith('is_valid_'))
+
+
+@pytest.mark.parametrize('mode', OPTIONS)
+def test_process(benchmark, advisory_path, mode):
+    code, message = benchmark(api.process, 'validate', 'commit', advisory_path, OPTIONS[mode])
+    assert (code, message) == (0, '')
+
+
+def test_verify_json(benchmark, encoded):
+    assert benchmark(api.verify_json, encoded)[0] == 0
+
+
+def test_verify_sections(benchmark, encoded):
+    assert benchmark(api.verify_sections, encoded)[0] == 0
+
+
+def test_model_validate(benchmark, advisory):
+    assert isinstance(benchmark(CSAF.model_validate, advisory), CSAF)
+
+
+def test_decode_structs(benchmark, encoded):
+    benchmark(api.decode, encoded, 'msgspec')
+
+
+def test_harvest(benchmark, advisory):
+    benchmark(harvest, advisory)
+
+
+def test_evaluate(benchmark, advisory):
+    assert benchmark(rules.evaluate, advisory) == ()
+
+
+@pytest.mark.parametrize('rule', RULES)
+def test_rule(benchmark, advisory, rule):
+    assert benchmark(getattr(rules, rule), advisory) is not False
+
+
+def test_compute_many(benchmark, advisory):
+    parsed = [
+        scoring.parse(score['cvss_v3']['vectorString'])
+        for vulnerability in advisory.get('vulnerabilities', ())
+        for score in vulnerability['scores']
+    ]
+    assert len(benchmark(scoring.compute_many, parsed)) == len(parsed)
+
+
+def test_stream_events(benchmark, encoded):
+    benchmark(lambda data: sum(1 for _ in stream.events(data)), encoded)
@@ -0,0 +1,38 @@
+import msgspec
+
+import csaf.mandatory.rules as rules
+import csaf.structs as structs
+from benchmarks import generate
+from csaf.csaf import CSAF
+from csaf.mandatory.index import harvest
+
+
+def test_advisory_is_deterministic_per_seed():
+    assert generate.advisory(seed=7) == generate.advisory(seed=7)
+    assert generate.advisory(seed=7) != generate.advisory(seed=8)
+
+
+def test_advisory_has_the_requested_shape():
+    index = harvest(generate.advisory(products=50, depth=4, relationships=5, groups=3, vulnerabilities=4, scores=2))
+    assert len(index.product_ids) == 50 + 5
+    assert len(index.group_ids) == 3
+    assert len(index.relationships) == 5
+    assert len(index.statuses) == 4
+    assert len(index.cvss) == 4 * 2
+    depths = {pointer.count('/branches/') for pointer, _ in index.product_ids if pointer.startswith('/product_tree/b')}
+    assert depths == {4}
+
+
+def test_sized_advisory_is_valid(advisory, encoded):
+    assert rules.evaluate(advisory) == ()
+    assert isinstance(CSAF.model_validate(advisory), CSAF)
+    assert isinstance(structs.DECODER.decode(encoded), structs.CSAF)
+
+
+def test_main_writes_json(capsysbinary):
+    assert generate.main(['--products', '5', '--vulnerabilities', '1', '--relationships', '0', '--groups', '0']) == 0
+    generated = msgspec.json.decode(capsysbinary.readouterr().out)
+    assert len(generated['vulnerabilities']) == 1
+    assert 'relationships' not in generated['product_tree']
+    assert generate.main(['--size', 'small']) == 0
+    assert msgspec.json.decode(capsysbinary.readouterr().out) == generate.sized('small')
@@ -3,7 +3,7 @@
 import logging
 import os
 import pathlib
-from typing import no_type_check
+from typing import Any, no_type_check
 
 APP_BLURB = (
     'Common Security Advisory Framework (CSAF) Verification, Validation, and Application Programming Interface (API).'
@@ -18,6 +18,7 @@ STRICT = bool(os.getenv(f'{APP_ENV}_STRICT', ''))
 ENCODING = 'utf-8'
 ENCODING_ERRORS_POLICY = 'ignore'
 DEFAULT_CONFIG_NAME = f'.{APP_ALIAS}.json'
+DEFAULT_CACHE_NAME = f'.{APP_ALIAS}_cache.sqlite'
 
 FAKE_SECRET = '*' * 13
 
@@ -50,12 +51,30 @@ def init_logger(name=None, level=None):
 
 init_logger(name=APP_ENV, level=logging.DEBUG if DEBUG else None)
 
-from csaf.csaf import is_valid  # noqa
-
 # [[[fill git_describe()]]]
 __version__ = '2023.11.27+parent.g543c3eb3'
 # [[[end]]] (checksum: 5069bde68b3f316ade142397bf03880b)
 __version_info__ = tuple(
     e if '-' not in e else e.split('-')[0] for part in __version__.split('+') for e in part.split('.') if e != 'parent'
 )
-__all__ = ['is_valid', 'log']
+__all__ = ['Vex', 'avalidate', 'avalidate_many', 'is_valid', 'log']
+
+
+def __getattr__(name: str) -> Any:
+    """Import the validation and query API (models, rules, and their dependencies) on first access only (PEP 562)."""
+    if name == 'is_valid':
+        from csaf.csaf import is_valid
+
+        globals()[name] = is_valid
+        return is_valid
+    if name in ('avalidate', 'avalidate_many'):
+        import csaf.aio as aio
+
+        globals()[name] = getattr(aio, name)
+        return globals()[name]
+    if name == 'Vex':
+        from csaf.vex import Vex
+
+        globals()[name] = Vex
+        return Vex
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
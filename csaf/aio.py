@@ -0,0 +1,76 @@
+"""Asynchronous API for validating advisories from within a running event loop.
+
+Reading and validating an advisory never blocks the event loop: both run in an executor.
+The default executor of the loop (threads) suits mixed workloads; pass a process pool executor
+to spread CPU bound validations of many advisories over all cores.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import AsyncIterator, Iterable, Mapping, Optional, Set, Union
+
+from csaf.result import Result
+
+Source = Union[str, 'os.PathLike[str]', bytes, bytearray, memoryview]
+DEFAULT_CONCURRENCY = 8
+MEMORY_NAME = '<memory>'
+
+
+def _assess_data(data: bytes, name: str, options: Mapping[str, object]) -> Result:
+    """Validate advisory data (runs in the executor)."""
+    from csaf.csaf import assess_buffer
+
+    engine, schema = str(options.get('engine') or ''), bool(options.get('schema', False))
+    bail_out, profiles = bool(options.get('bail_out', False)), options.get('profiles') or ('mandatory',)
+    return assess_buffer(name, data, engine, schema, bail_out, profiles)  # type: ignore[arg-type]
+
+
+def _assess_path(path: str, options: Mapping[str, object]) -> Result:
+    """Read and validate the advisory at path (runs in the executor)."""
+    from csaf.csaf import assess_guarded
+
+    return assess_guarded('validate', 'commit', path, options)
+
+
+async def avalidate(
+    source: Source,
+    options: Optional[Mapping[str, object]] = None,
+    executor: Optional[Executor] = None,
+    name: str = MEMORY_NAME,
+) -> Result:
+    """Validate the advisory at the path or given as bytes (named name) and return the result."""
+    loop = asyncio.get_running_loop()
+    options = options or {}
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return await loop.run_in_executor(executor, _assess_data, bytes(source), name, options)
+    return await loop.run_in_executor(executor, _assess_path, os.fspath(source), options)
+
+
+async def avalidate_many(
+    sources: Iterable[Source],
+    options: Optional[Mapping[str, object]] = None,
+    executor: Optional[Executor] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> AsyncIterator[Result]:
+    """Validate the advisories and yield the results in order of completion.
+
+    At most concurrency validations are pending at any time, so sources may be a lazy (even endless) iterable.
+    Advisories given as bytes are named by their position in sources (like <memory>#3).
+    """
+    pending: Set['asyncio.Task[Result]'] = set()
+    try:
+        for pos, source in enumerate(sources):
+            name = f'{MEMORY_NAME}#{pos}'
+            pending.add(asyncio.ensure_future(avalidate(source, options, executor, name)))
+            if len(pending) >= max(1, concurrency):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
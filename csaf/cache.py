@@ -0,0 +1,159 @@
+"""Persistent cache of validation results keyed by the SHA-256 of the advisory bytes.
+
+Entries are only valid for the same csaf version, rule set version, and profile (the options changing the outcome).
+In incremental mode advisories are also keyed by their identity and version as stated in the tracking metadata,
+so republished advisories are recognized without hashing or validating them again.
+Entries of other versions are dropped when the cache is opened, so the file does not grow across upgrades.
+One connection is kept per cache path, process, and thread (workers open their own connections).
+Lookups are accounted in the metrics registry as the pseudo rule cache (misses count as failures).
+"""
+
+import atexit
+import datetime as dt
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import msgspec
+
+import csaf
+import csaf.metrics as metrics
+import csaf.structs as structs
+from csaf.mandatory.rules import ruleset_version
+from csaf.result import Result
+
+Buffer = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+BUSY_TIMEOUT_SECONDS = 30.0
+METRICS_RULE = 'cache'
+SCHEMA = """\
+CREATE TABLE IF NOT EXISTS results (
+  digest TEXT NOT NULL,
+  version TEXT NOT NULL,
+  ruleset TEXT NOT NULL,
+  profile TEXT NOT NULL,
+  result BLOB NOT NULL,
+  PRIMARY KEY (digest, version, ruleset, profile)
+) WITHOUT ROWID
+"""
+
+
+def digest(data: Buffer) -> str:
+    """Return the SHA-256 hex digest of the advisory (text is encoded as UTF-8)."""
+    return hashlib.sha256(data.encode(csaf.ENCODING) if isinstance(data, str) else data).hexdigest()
+
+
+def _moment(text: str) -> Optional[dt.datetime]:
+    """Return the timestamp as timezone aware datetime (naive ones taken as UTC) or None if not parsable."""
+    if text[-1:] in ('Z', 'z'):  # fromisoformat accepts the UTC designator only from Python 3.11 on
+        text = f'{text[:-1]}+00:00'
+    try:
+        moment = dt.datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return moment if moment.tzinfo else moment.replace(tzinfo=dt.timezone.utc)
+
+
+def tracking_key(data: Buffer) -> str:
+    """Return the key of the advisory from publisher namespace, tracking id, version, and current release date.
+
+    Only the tracking metadata is decoded.
+    The empty string is returned if the metadata is missing or inconsistent (draft status, version differing
+    from the number of the latest revision, or current release date before the latest revision),
+    callers then fall back to the content hash.
+    """
+    try:
+        document = structs.TRACKING_DECODER.decode(data).document  # type: ignore[arg-type]
+    except msgspec.DecodeError:
+        return ''
+    tracking = document.tracking
+    if not (tracking.id and tracking.version and tracking.current_release_date) or tracking.status == 'draft':
+        return ''
+    current = _moment(tracking.current_release_date)
+    revisions: List[Tuple[dt.datetime, str]] = []
+    for revision in tracking.revision_history:
+        moment = _moment(revision.date)
+        if moment is None:
+            return ''
+        revisions.append((moment, revision.number))
+    if current is None or not revisions:
+        return ''
+    latest_date, latest_number = max(revisions)
+    if latest_number != tracking.version or current < latest_date:
+        return ''
+    namespace = document.publisher.namespace
+    return f'tracking:{namespace}|{tracking.id}|{tracking.version}|{tracking.current_release_date}'
+
+
+def profile_of(
+    engine: str = '', schema: bool = False, bail_out: bool = False, profiles: Sequence[str] = ('mandatory',)
+) -> str:
+    """Return the cache profile for the options that change the outcome of a validation."""
+    return f'engine={engine or "-"};schema={int(schema)};bail_out={int(bail_out)};rules={",".join(sorted(profiles))}'
+
+
+class ResultCache:
+    """Validation results of advisories stored in a SQLite database."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.version = csaf.__version__
+        self.ruleset = ruleset_version()
+        self.connection = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(SCHEMA)
+        self.connection.execute('DELETE FROM results WHERE version != ? OR ruleset != ?', (self.version, self.ruleset))
+        self.decoder = msgspec.msgpack.Decoder(Result)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, profile: str) -> Optional[Result]:
+        """Return the cached result (with an empty path) or None."""
+        start = perf_counter()
+        row = self.connection.execute(
+            'SELECT result FROM results WHERE digest = ? AND version = ? AND ruleset = ? AND profile = ?',
+            (key, self.version, self.ruleset, profile),
+        ).fetchone()
+        hit = None if row is None else self.decoder.decode(row[0])
+        if hit is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        metrics.REGISTRY.record(METRICS_RULE, perf_counter() - start, hit is None)
+        return hit
+
+    def put(self, key: str, profile: str, result: Result) -> None:
+        """Store the result (without the path as the same bytes may live at many paths)."""
+        stored = msgspec.structs.replace(result, path='')
+        self.connection.execute(
+            'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+            (key, self.version, self.ruleset, profile, msgspec.msgpack.encode(stored)),
+        )
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.connection.close()
+
+
+_OPEN: Dict[Tuple[str, int, int], ResultCache] = {}
+
+
+def open_cache(path: str) -> ResultCache:
+    """Return the cache at path opened once per process and thread."""
+    key = (path, os.getpid(), threading.get_ident())
+    if key not in _OPEN:
+        _OPEN[key] = ResultCache(path)
+    return _OPEN[key]
+
+
+@atexit.register
+def close() -> None:
+    """Close all caches opened by this process."""
+    for key in [key for key in _OPEN if key[1] == os.getpid()]:
+        _OPEN.pop(key).close()
@@ -1,16 +1,35 @@
-"""Commandline API gateway for csaf."""
+"""Commandline API gateway for csaf.
 
+The modules behind the commands are imported within the commands so that trivial invocations
+(like version, help, template, or shell completion) do not pay for loading the models and validators.
+"""
+
+import os
 import sys
-from typing import List, Mapping
+from enum import Enum
+from typing import List, Mapping, Optional
 
 import typer
 
 import csaf
-import csaf.config as cfg
-import csaf.csaf as lint
-import csaf.env as env
 from csaf import log
 
+
+class ReportFormat(str, Enum):
+    """Output formats of the validation results."""
+
+    text = 'text'
+    json = 'json'
+    sarif = 'sarif'
+
+
+class DecodeEngine(str, Enum):
+    """Engines for decoding and type checking advisories against the CSAF model."""
+
+    pydantic = 'pydantic'
+    msgspec = 'msgspec'
+
+
 app = typer.Typer(
     add_completion=False,
     context_settings={'help_option_names': ['-h', '--help']},
@@ -48,6 +67,8 @@ def app_template() -> int:
     In case an explicit path is given to the config option of commands that offer
     it, only that path is considered.
     """
+    import csaf.config as cfg
+
     sys.stdout.write(cfg.generate_template())
     return sys.exit(0)
 
@@ -55,10 +76,63 @@ def app_template() -> int:
 @app.command('report')
 def report() -> int:
     """Output the report of the environment for support."""
+    import csaf.env as env
+
     sys.stdout.write(env.report())
     return sys.exit(0)
 
 
+@app.command('serve')
+def app_serve(
+    host: str = typer.Option(
+        '127.0.0.1',
+        '-H',
+        '--host',
+        help='Address to listen on for HTTP requests (default is 127.0.0.1)',
+        metavar='<host>',
+        show_default=False,
+    ),
+    port: int = typer.Option(
+        8455,
+        '-p',
+        '--port',
+        help='Port to listen on for HTTP requests (default is 8455)',
+        metavar='<port>',
+        show_default=False,
+    ),
+    unix_socket: str = typer.Option(
+        '',
+        '-u',
+        '--unix-socket',
+        help='Path of a Unix domain socket to listen on in addition (default is none)',
+        metavar='<socketpath>',
+    ),
+    jobs: int = typer.Option(
+        1,
+        '-j',
+        '--jobs',
+        help='Number of worker processes (default is 1 and 0 means one per CPU)',
+        metavar='<count>',
+        show_default=False,
+    ),
+) -> None:
+    """
+    Serve validation requests (POST /validate with the advisory as body) until interrupted.
+
+    The workers keep models, schemas, and rules loaded between requests.
+    The query parameters engine (msgspec or pydantic) and schema (1 or 0) select the
+    stages like the options of the validate command. GET /health reports the version.
+    """
+    import asyncio
+
+    import csaf.serve as service
+
+    try:
+        asyncio.run(service.serve(host=host, port=port, unix_socket=unix_socket, jobs=jobs))
+    except KeyboardInterrupt:
+        log.info('validation service stopped')
+
+
 @app.command('validate')
 def validate(
     source: List[str],
@@ -106,6 +180,58 @@ def validate(
         '--strict',
         help='Ouput noisy warnings on console (default is False)',
     ),
+    jobs: int = typer.Option(
+        1,
+        '-j',
+        '--jobs',
+        help='Number of worker processes for many sources (default is 1 and 0 means one per CPU)',
+        metavar='<count>',
+    ),
+    report_format: ReportFormat = typer.Option(
+        ReportFormat.text,
+        '-f',
+        '--format',
+        help='Output format of the results (default is text)',
+        show_default=False,
+    ),
+    engine: Optional[DecodeEngine] = typer.Option(
+        None,
+        '-e',
+        '--engine',
+        help='Decode and type check advisories against the CSAF model (default is no typed decode)',
+        show_default=False,
+    ),
+    schema: bool = typer.Option(
+        False,
+        '-k',
+        '--schema',
+        help='Validate advisories against the CSAF JSON schema (default is False)',
+    ),
+    cache: bool = typer.Option(
+        False,
+        '-C',
+        '--cache',
+        help=f'Skip advisories unchanged since validated (cache in {csaf.DEFAULT_CACHE_NAME}, default is False)',
+    ),
+    incremental: bool = typer.Option(
+        False,
+        '-I',
+        '--incremental',
+        help='Skip advisories with unchanged tracking id, version, and release date (implies cache, default is False)',
+    ),
+    rules: str = typer.Option(
+        'mandatory',
+        '-r',
+        '--rules',
+        help='Comma separated rule profiles to evaluate from mandatory, optional, informative (default is mandatory)',
+        metavar='<profiles>',
+    ),
+    profile_rules: bool = typer.Option(
+        False,
+        '-P',
+        '--profile-rules',
+        help='Report wall time and failures per rule on standard error (default is False)',
+    ),
 ) -> int:
     """
     Common Security Advisory Framework (CSAF) Verification and Validation.
@@ -122,7 +248,26 @@ def validate(
     * CSAF_STRICT='AnythingTruthy'
 
     The quiet option (if given) disables any conflicting verbosity setting.
+
+    Sources may be files or folders (searched recursively for .json files).
+    Many sources are validated in batch mode and summarized in a table per file.
+    The formats json and sarif write the per rule findings of all sources to standard out.
+    The engine msgspec type checks considerably faster than the engine pydantic.
+    The schema option validates against the bundled CSAF JSON schema (offline).
+    The cache option stores the results per content hash and reuses them for unchanged advisories.
+    The incremental option recognizes unchanged advisories by the tracking metadata (falling back to the hash).
+    The bail out option stops at the first failing rule and (in batch mode) at the first failing advisory.
+    The rules option selects the tests (optional and informative findings do not fail advisories).
+    Rule plugins installed for the entry point group csaf.rules are evaluated with their profiles.
+    With bail out the rules run in the order of measured cost and failure rate (cheap, often failing first).
+    The profile rules option reports the rules taking the most time first (and the cache lookups as rule cache).
     """
+    import csaf.config as cfg
+    import csaf.csaf as lint
+    import csaf.metrics as metrics
+    import csaf.registry as registry
+    from csaf.result import as_json, as_sarif, as_table, worst
+
     command = 'validate'
     transaction_mode = 'commit' if not verify else 'dry-run'
     if quiet:
@@ -135,7 +280,7 @@ def validate(
     if strict:
         csaf.STRICT = True
 
-    if bail_out:
+    if bail_out is True:
         csaf.BAIL_OUT = True
 
     if transaction_mode == 'dry-run':
@@ -143,19 +288,51 @@ def validate(
 
     configuration = cfg.read_configuration(str(conf)) if conf else {}
 
+    try:
+        profiles = registry.parse_profiles(rules if isinstance(rules, str) else 'mandatory')
+    except ValueError as err:
+        log.error(str(err))
+        raise typer.Exit(code=2)
+
     options: Mapping[str, object] = {
         'configuration': configuration,
-        'bail_out': bail_out,
+        'bail_out': bail_out is True or bool(os.getenv(f'{csaf.APP_ENV}_BAIL_OUT', '')),
         'quiet': quiet,
         'strict': strict,
         'verbose': verbose,
+        'engine': engine.value if isinstance(engine, DecodeEngine) else '',
+        'schema': schema is True,
+        'cache': csaf.DEFAULT_CACHE_NAME if cache is True or incremental is True else '',
+        'incremental': incremental is True,
+        'profile_rules': profile_rules is True,
+        'profiles': profiles,
     }
 
-    paths = (inp,) if inp else tuple(source)
-    code, message = lint.process(command, transaction_mode, paths[0], options)
-    if message:
-        log.error(message)
-    return code
+    sources = (inp,) if inp else tuple(source)
+    paths = tuple(lint.expand(sources))
+    machine_readable = report_format in (ReportFormat.json, ReportFormat.sarif)
+    if not machine_readable and len(sources) == 1 and paths == sources:
+        code, message = lint.process(command, transaction_mode, paths[0], options)
+        if message:
+            log.error(message)
+        if profile_rules is True:
+            sys.stderr.write(metrics.REGISTRY.as_table())
+        raise typer.Exit(code=code)
+
+    if not paths:
+        log.error('no advisories found below the given sources')
+        raise typer.Exit(code=2)
+
+    results = lint.process_batch(command, transaction_mode, paths, options, jobs=jobs)
+    if report_format is ReportFormat.json:
+        sys.stdout.write(as_json(results))
+    elif report_format is ReportFormat.sarif:
+        sys.stdout.write(as_sarif(results))
+    else:
+        sys.stdout.write(as_table(results, failures_only=quiet)[1])
+    if profile_rules is True:
+        sys.stderr.write(metrics.REGISTRY.as_table())
+    raise typer.Exit(code=worst(results))
 
 
 @app.command('version')
@@ -0,0 +1,23 @@
+"""Common Platform Enumeration (CPE) names in the formatted string binding (2.3) or the URI binding (2.2).
+
+Validated strings are memoized (the same platforms repeat across the products of an advisory and a corpus).
+"""
+
+import re
+from functools import lru_cache
+
+MEMO_SIZE = 1 << 14
+MIN_LENGTH = 5
+PATTERN = (
+    r'^(cpe:2\.3:[aho\*\-](:(((\?*|\*?)([a-zA-Z0-9\-\._]|(\\[\\\*\?!"#\$%&\'\(\)\+,/:;<=>@\[\]\^`\{\|\}~]))+'
+    r'(\?*|\*?))|[\*\-])){5}(:(([a-zA-Z]{2,3}(-([a-zA-Z]{2}|[0-9]{3}))?)|[\*\-]))(:(((\?*|\*?)([a-zA-Z0-9\-\._]|'
+    r'(\\[\\\*\?!"#\$%&\'\(\)\+,/:;<=>@\[\]\^`\{\|\}~]))+(\?*|\*?))|[\*\-])){4})|([c][pP][eE]:/[AHOaho]?'
+    r'(:[A-Za-z0-9\._\-~%]*){0,6})$'
+)
+REGEX = re.compile(PATTERN)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def is_valid(text: str) -> bool:
+    """Verify the text is a CPE name as required by the CSAF JSON schema."""
+    return len(text) >= MIN_LENGTH and REGEX.match(text) is not None
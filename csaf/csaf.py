@@ -8,35 +8,78 @@ Minimal length of CSAF (spam) JSON is 116 bytes:
 
 from __future__ import annotations
 
+import mmap
+import os
 import pathlib
-from itertools import chain
-from typing import Annotated, Dict, Iterator, List, Mapping, Optional, Tuple, no_type_check
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import chain, repeat
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    no_type_check,
+)
 
-import jmespath
 import msgspec
 from langcodes import tag_is_valid
 from lazr.uri import URI, InvalidURIError  # type: ignore
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationError, field_validator
 
 import csaf
+import csaf.jmes as jmes
+import csaf.metrics as metrics
+import csaf.registry as registry
 from csaf import log
 from csaf.document import Document
-from csaf.mandatory.rules import (
-    is_valid,
-    is_valid_category,
-    is_valid_defined_group_ids,
-    is_valid_defined_product_ids,
-    is_valid_translator,
-    is_valid_unique_group_ids,
-    is_valid_unique_product_ids,
-)
+from csaf.mandatory.index import Index, harvest_events
+from csaf.mandatory.rules import evaluate, evaluate_index, is_valid  # noqa
 from csaf.product import ProductTree
+from csaf.result import Finding, Result
 from csaf.vulnerability import Vulnerability
 
+if TYPE_CHECKING:  # the optional engines (schema, streaming, structs, and cache) are imported on first use
+    import csaf.structs as structs
+
 ENCODING_ERRORS_POLICY = 'ignore'
+Buffer = Union[str, bytes, bytearray, memoryview, mmap.mmap]
 CSAF_MIN_BYTES = 92
 CSAF_WARN_MAX_BYTES = 15 << 20
+CSAF_MMAP_MIN_BYTES = 1 << 20
 CSAF_VERSION_STRING = '2.0'
+CSAF_FILE_SUFFIX = '.json'
+PROVIDER_FILE_NAMES = ('aggregator.json', 'provider-metadata.json')  # metadata files of CSAF providers and aggregators
+ROLIE_MEMBERS = re.compile(rb'^\s*\{\s*"(categories|feed|service)"\s*:')  # the single member of ROLIE documents
+ROLIE_PEEK_BYTES = 256
+ENGINES = ('pydantic', 'msgspec')
+DOCUMENT_PROPS = ('category', 'csaf_version', 'publisher', 'title', 'tracking')
+DOCUMENT_OPT_PROPS = (
+    'acknowledgments',
+    'aggregate_severity',
+    'distribution',
+    'lang',
+    'notes',
+    'references',
+    'source_lang',
+)
+PUBLISHER_PROPS = ('category', 'name', 'namespace')
+TRACKING_PROPS = ('current_release_date', 'id', 'initial_release_date', 'revision_history', 'status', 'version')
+
+jmes.register(
+    *DOCUMENT_PROPS,
+    *DOCUMENT_OPT_PROPS,
+    *(f'publisher.{prop}' for prop in PUBLISHER_PROPS),
+    *(f'tracking.{sub}' for sub in TRACKING_PROPS),
+)
 
 
 class CSAF(BaseModel):
@@ -237,13 +280,13 @@ def document_lang(value):
 @no_type_check
 def document_optional(document):
     """Verify optional properties of document if present follow rules."""
-    norm_props = ('category', 'csaf_version', 'publisher', 'title', 'tracking')
-    opt_props = ('acknowledgments', 'aggregate_severity', 'distribution', 'lang', 'notes', 'references', 'source_lang')
+    norm_props = DOCUMENT_PROPS
+    opt_props = DOCUMENT_OPT_PROPS
     known_props = {el for el in chain(norm_props, opt_props)}
     opt_map = {el: None for el in opt_props}
     parent = 'document'
     for prop in opt_props:
-        value = jmespath.search(f'{prop}', document)
+        value = jmes.search(f'{prop}', document)
         if value is not None:
             opt_map[prop] = value
 
@@ -272,26 +315,26 @@ def document_optional(document):
 def verify_document(document):
     """Root of /document member verifier"""
     parent = 'document'
-    for prop in ('category', 'csaf_version', 'publisher', 'title', 'tracking'):
-        if not jmespath.search(f'{prop}', document):
+    for prop in DOCUMENT_PROPS:
+        if not jmes.search(f'{prop}', document):
             return 1, f'missing {parent} property ({prop})'
 
     parent = 'document'
     prop = 'category'
-    if not jmespath.search(f'{prop}', document).strip():
+    if not jmes.search(f'{prop}', document).strip():
         log.warning(f'warning - {parent} property {prop} value is space-only')
     error, message = document_category(document[prop])
     if error:
         return error, message
 
     prop = 'csaf_version'
-    csaf_version = jmespath.search(f'{prop}', document)
+    csaf_version = jmes.search(f'{prop}', document)
     error, message = document_csaf_version(csaf_version)
     if error:
         return error, message
 
     prop = 'lang'
-    lang = jmespath.search(f'{prop}', document)
+    lang = jmes.search(f'{prop}', document)
     if lang is not None:
         error, message = document_lang(lang)
         if error:
@@ -299,21 +342,21 @@ def verify_document(document):
 
     # Publisher (publisher) is object requires ('category', 'name', 'namespace')
     parent = 'document.publisher'
-    for prop in ('category', 'name', 'namespace'):
-        if not jmespath.search(f'publisher.{prop}', document):
+    for prop in PUBLISHER_PROPS:
+        if not jmes.search(f'publisher.{prop}', document):
             return 1, f'missing {parent} property ({prop})'
 
     parent = 'document'
     prop = 'title'
-    if not jmespath.search(f'{prop}', document).strip():
+    if not jmes.search(f'{prop}', document).strip():
         log.warning(f'warning - {parent} property {prop} value is space-only')
 
     # Tracking (tracking) is object requires:
     # ('current_release_date', 'id', 'initial_release_date', 'revision_history', 'status', 'version')
     parent = 'document'
     prop = 'tracking'
-    for sub in ('current_release_date', 'id', 'initial_release_date', 'revision_history', 'status', 'version'):
-        if jmespath.search(f'{prop}.{sub}', document) is None:
+    for sub in TRACKING_PROPS:
+        if jmes.search(f'{prop}.{sub}', document) is None:
             return 1, f'missing {parent}.{prop} property ({sub})'
 
     return document_optional(document)
@@ -339,12 +382,24 @@ def reader(path: str) -> Iterator[str]:
             yield line
 
 
-def peek(data: str) -> str:
-    """Determine trivial format of data."""
+@contextmanager
+def loaded(path: str) -> Iterator[Buffer]:
+    """Context wrapper providing the bytes of the file in one read (memory-mapped for large files)."""
+    with open(pathlib.Path(path), 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size < CSAF_MMAP_MIN_BYTES:
+            yield handle.read()
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def peek(data: Buffer) -> str:
+    """Determine trivial format of data (text or bytes) inspecting only the first bytes."""
     if len(data) < CSAF_MIN_BYTES:
         return 'TOO_SHORT'
 
-    sample = data[:CSAF_MIN_BYTES].strip()
+    sample = data[:CSAF_MIN_BYTES]
+    sample = sample.strip() if isinstance(sample, str) else bytes(sample).strip().decode(csaf.ENCODING, 'ignore')
     if sample.startswith('{'):
         warn_size = '_MAYBE_TOO_LARGE' if len(data) > CSAF_WARN_MAX_BYTES else ''
         return f'JSON{warn_size}'
@@ -379,10 +434,10 @@ def verify_request(argv: Optional[List[str]]) -> Tuple[int, str, List[str]]:
     return 0, '', argv
 
 
-def verify_json(data: str) -> Tuple[int, str, List[str], Dict[str, object]]:
+def verify_json(data: Buffer) -> Tuple[int, str, List[str], Dict[str, object]]:
     """Verify the JSON as CSAF."""
     try:
-        doc = msgspec.json.decode(data)
+        doc = msgspec.json.decode(data)  # type: ignore[arg-type]  # any buffer is fine at runtime
     except msgspec.DecodeError:
         return 1, 'advisory is no valid JSON', [], {}
 
@@ -392,6 +447,44 @@ def verify_json(data: str) -> Tuple[int, str, List[str], Dict[str, object]]:
     return 0, 'OK', [], doc
 
 
+def verify_sections(data: Buffer) -> Tuple[int, str, Optional[Index]]:
+    """Verify the JSON as CSAF decoding one section at a time and return the index for the rules."""
+    import csaf.stream as stream
+
+    try:
+        index = harvest_events(stream.events(data))
+    except msgspec.DecodeError:
+        return 1, 'advisory is no valid JSON', None
+
+    error, message = level_zero(index.document)
+    if error:
+        return error, message, None
+    return 0, 'OK', index
+
+
+def decode(data: Buffer, engine: str = 'msgspec') -> Union[CSAF, structs.CSAF]:
+    """Decode and type check the advisory in one pass with the pydantic models or the msgspec structs.
+
+    Raises pydantic.ValidationError or msgspec.ValidationError for advisories not matching the model.
+    """
+    if engine == 'msgspec':
+        import csaf.structs as structs
+
+        return structs.DECODER.decode(data)  # type: ignore[arg-type]  # any buffer is fine at runtime
+    if engine == 'pydantic':
+        return CSAF.model_validate_json(data if isinstance(data, (str, bytes, bytearray)) else bytes(data))
+    raise ValueError(f'unknown engine ({engine}) - expected one of {", ".join(ENGINES)}')
+
+
+def type_check(data: Buffer, engine: str) -> str:
+    """Return the reason why the advisory does not match the model of the engine or the empty string."""
+    try:
+        decode(data, engine)
+    except (msgspec.ValidationError, ValidationError) as err:
+        return f'advisory fails type check ({slugify(err)})'
+    return ''
+
+
 def is_valid_(path: str, options: Mapping[str, bool]) -> bool:
     """Public API."""
     code, message = process('validate', 'commit', path, options)
@@ -425,64 +518,262 @@ def visit(tree_or_file_path):
             yield path
 
 
+def is_provider_file(path: pathlib.Path) -> bool:
+    """Detect the JSON files of provider mirrors that are no advisories (provider metadata and ROLIE documents)."""
+    if path.name.lower() in PROVIDER_FILE_NAMES:
+        return True
+    try:
+        with open(path, 'rb') as handle:
+            return ROLIE_MEMBERS.match(handle.read(ROLIE_PEEK_BYTES)) is not None
+    except OSError:
+        return False  # reported when validated
+
+
+def expand(sources: Iterable[str]) -> Iterator[str]:
+    """Yield the given file paths as is and the CSAF JSON files found below given folders in stable order.
+
+    Provider metadata and ROLIE feed, service, and category documents found below folders are skipped.
+    """
+    for source in sources:
+        thing = pathlib.Path(source)
+        if not source.strip() or not thing.is_dir():
+            yield source
+            continue
+        for path in sorted(visit(thing)):
+            if path.suffix.lower() == CSAF_FILE_SUFFIX and path.is_file() and not is_provider_file(path):
+                yield str(path)
+
+
 @no_type_check
 def slugify(error):
     """Replace newlines by space."""
     return str(error).replace('\n', '')
 
 
-def process(command: str, transaction_mode: str, path: str, options: Mapping[str, object]) -> Tuple[int, str]:
-    """Drive the verification and validation.
-    This function acts as the command line interface backend.
-    There is some duplication to support testability.
+def assess(command: str, transaction_mode: str, path: str, options: Mapping[str, object]) -> Result:
+    """Drive the verification and validation and return the structured result.
+
+    All rules are evaluated once and the result carries the findings of every failing rule.
+    Given a cache path the results of advisories validated before with the same bytes and options are reused.
+    Incremental mode also reuses the results of advisories with the same tracking id, version, and release date.
+    Bail out mode stops at the first failing rule.
+    The rules of the profiles option are evaluated (default mandatory).
     """
-    # bail_out = options.get('bail_out', False)
+    bail_out = bool(options.get('bail_out', False))
+    profiles: Tuple[str, ...] = tuple(options.get('profiles') or registry.MANDATORY)  # type: ignore[arg-type]
+    engine = str(options.get('engine') or '')
+    schema = bool(options.get('schema', False))
+    cache = str(options.get('cache') or '')
+    incremental = bool(options.get('incremental', False))
     if command != 'validate':
         log.error('Usage: csaf validate ...')
-        return 2, 'USAGE'
+        return Result(path=path, code=2, message='USAGE')
     if not path.strip():
         log.error('Usage: csaf validate path-to-file')
-        return 2, 'USAGE'
+        return Result(path=path, code=2, message='USAGE')
+    if engine and engine not in ENGINES:
+        log.error(f'Usage: csaf validate --engine [{"|".join(ENGINES)}] path-to-file')
+        return Result(path=path, code=2, message='USAGE')
+
+    if not set(profiles).issubset(registry.PROFILES):
+        log.error(f'Usage: csaf validate --rules [{",".join(registry.PROFILES)}] path-to-file')
+        return Result(path=path, code=2, message='USAGE')
 
     if transaction_mode == 'dry-run':
         log.info('Operating in dry run mode (no changes persisted).')
 
-    data = ''.join(line for line in reader(path))
-
+    with loaded(path) as data:
+        if not cache:
+            return assess_buffer(path, data, engine, schema, bail_out, profiles)
+        return assess_cached(path, data, engine, schema, cache, incremental, bail_out, profiles)
+
+
+def assess_cached(
+    path: str,
+    data: Buffer,
+    engine: str,
+    schema: bool,
+    cache: str,
+    incremental: bool,
+    bail_out: bool = False,
+    profiles: Sequence[str] = registry.MANDATORY,
+) -> Result:
+    """Reuse the cached result for the advisory data or validate and cache the result.
+
+    In incremental mode the tracking metadata identifies unchanged advisories before the content hash does.
+    """
+    import csaf.cache as results
+
+    store, profile = results.open_cache(cache), results.profile_of(engine, schema, bail_out, profiles)
+    tracked = results.tracking_key(data) if incremental else ''
+    hit = store.get(tracked, profile) if tracked else None
+    if hit is not None:
+        log.info(f'advisory version unchanged since cached validation ({tracked})')
+        return msgspec.structs.replace(hit, path=path)
+
+    key = results.digest(data)
+    hit = store.get(key, profile)
+    if hit is not None:
+        log.info(f'advisory unchanged since cached validation ({key})')
+        if tracked:
+            store.put(tracked, profile, hit)
+        return msgspec.structs.replace(hit, path=path)
+
+    result = assess_buffer(path, data, engine, schema, bail_out, profiles)
+    for known in (tracked, key):
+        if known:
+            store.put(known, profile, result)
+    return result
+
+
+def assess_buffer(
+    path: str,
+    data: Buffer,
+    engine: str = '',
+    schema: bool = False,
+    bail_out: bool = False,
+    profiles: Sequence[str] = registry.MANDATORY,
+) -> Result:
+    """Verify and validate the advisory data (text or bytes) read from path.
+
+    Given an engine the advisory is also decoded and type checked against the model of that engine.
+    Given schema the advisory is also validated against the CSAF JSON schema (before the mandatory rules).
+    Given bail_out the evaluation of the mandatory rules stops at the first failing rule.
+    The rules of the profiles are evaluated, only findings of mandatory rules fail the advisory.
+    Advisories above the warning size are decoded one section at a time (unless type or schema checked)
+    so the complete object tree is never held in memory.
+    """
     guess = peek(data)
 
     if guess == 'TOO_SHORT':
-        return 1, 'advisory is too short to be valid'
+        return Result(path=path, code=1, message='advisory is too short to be valid')
 
     if guess == 'UNKNOWN':
-        return 1, 'advisory is of unknown format'
+        return Result(path=path, code=1, message='advisory is of unknown format')
 
     if guess.startswith('JSON'):
         if guess.endswith('_MAYBE_TOO_LARGE'):
             log.warning('File of %d bytes may be above known file size limits' % len(data))
+            if not engine and not schema:
+                return assess_sections(path, data, bail_out, profiles)
         error, message, strings, doc = verify_json(data)
         if error:
             log.error(message)
-            return error, message
-        # Later post process the business rules (spec tests) here
-        # Like that:
-        if is_valid(doc) is False:  # For now, we return NotImplemented, sorry
-            messages = []
-            log.error('advisory fails mandatory rules:')
-            # Why not execute the rules multiple times (until we have traits in place to report the failing rule)?
-            if not is_valid_category(doc):
-                messages.append('invalid category')
-            if not is_valid_defined_group_ids(doc):
-                messages.append('undefined group ids')
-            if not is_valid_defined_product_ids(doc):
-                messages.append('undefined product ids')
-            if not is_valid_translator(doc):
-                messages.append('invalid translator')
-            if not is_valid_unique_group_ids(doc):
-                messages.append('non-unique group ids')
-            if not is_valid_unique_product_ids(doc):
-                messages.append('non-unique product ids')
-            return 1, ', '.join(messages)
-        return 0, ''
+            return Result(path=path, code=error, message=message)
+        if engine:
+            message = type_check(data, engine)
+            if message:
+                log.error(message)
+                return Result(path=path, code=1, message=message)
+        if schema:
+            import csaf.schema as conformance
+
+            violations = conformance.validate(doc)
+            if violations:
+                message = 'advisory fails schema validation'
+                log.error(f'{message}:')
+                for violation in violations:
+                    log.error(f'- {violation.pointers[0] or "/"}: {violation.message}')
+                return Result(path=path, code=1, message=message, findings=violations)
+        return judge(path, evaluate(doc, bail_out, profiles))
+
+    return Result(path=path, code=1, message='XML IS OUT OF SCOPE')
+
+
+def assess_sections(
+    path: str, data: Buffer, bail_out: bool = False, profiles: Sequence[str] = registry.MANDATORY
+) -> Result:
+    """Verify and validate the (oversized) advisory data decoding one section at a time."""
+    log.info('validating the advisory section by section')
+    error, message, index = verify_sections(data)
+    if error or index is None:
+        log.error(message)
+        return Result(path=path, code=error, message=message)
+    return judge(path, evaluate_index(index, bail_out, profiles))
+
 
-    return 1, 'XML IS OUT OF SCOPE'
+def judge(path: str, findings: Tuple[Finding, ...]) -> Result:
+    """Return the result for the findings (only findings of mandatory rules fail the advisory)."""
+    errors = [finding.message for finding in findings if finding.severity == registry.ERROR]
+    for finding in findings:
+        if finding.severity != registry.ERROR:
+            log.warning(f'advisory {finding.severity} for rule {finding.rule}: {finding.message}')
+    if errors:
+        log.error('advisory fails mandatory rules:')
+        return Result(path=path, code=1, message=', '.join(errors), findings=findings)
+    return Result(path=path, code=0, message='', findings=findings)
+
+
+def process(command: str, transaction_mode: str, path: str, options: Mapping[str, object]) -> Tuple[int, str]:
+    """Drive the verification and validation.
+    This function acts as the command line interface backend.
+    There is some duplication to support testability.
+    """
+    result = assess(command, transaction_mode, path, options)
+    return result.code, result.message
+
+
+def assess_guarded(command: str, transaction_mode: str, path: str, options: Mapping[str, object]) -> Result:
+    """Assess a single path but report unreadable files as failures instead of raising."""
+    try:
+        return assess(command, transaction_mode, path, options)
+    except OSError as err:
+        return Result(path=path, code=1, message=f'advisory is not readable ({slugify(err)})')
+
+
+def assess_measured(
+    command: str, transaction_mode: str, path: str, options: Mapping[str, object]
+) -> Tuple[Result, Tuple[metrics.RuleStats, ...]]:
+    """Assess a single path (in a worker process) and return the result with the rule statistics measured meanwhile."""
+    before = metrics.REGISTRY.snapshot()
+    result = assess_guarded(command, transaction_mode, path, options)
+    return result, metrics.REGISTRY.since(before)
+
+
+def _merged(measured: Tuple[Result, Tuple[metrics.RuleStats, ...]]) -> Result:
+    """Merge the rule statistics measured by a worker process and return the result."""
+    result, stats = measured
+    metrics.REGISTRY.merge(stats)
+    return result
+
+
+def collect(results: Iterable[Result], bail_out: bool = False) -> List[Result]:
+    """Collect the results in order stopping after the first failure if bail_out is given."""
+    collected = []
+    for result in results:
+        collected.append(result)
+        if bail_out and result.code:
+            break
+    return collected
+
+
+def process_batch(
+    command: str, transaction_mode: str, paths: Sequence[str], options: Mapping[str, object], jobs: int = 1
+) -> List[Result]:
+    """Drive the verification and validation of many advisories optionally fanned out across worker processes.
+
+    Returns the results in the order of the given paths.
+    A jobs value of zero uses as many worker processes as there are CPUs.
+    Bail out mode stops at the first failing advisory (in the order of the paths) and returns the results up to it,
+    pending validations of the worker processes are cancelled.
+    Given profile_rules the rule statistics measured by the worker processes are merged into the metrics registry.
+    """
+    bail_out = bool(options.get('bail_out', False))
+    profile_rules = bool(options.get('profile_rules', False))
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if jobs == 1 or len(paths) < 2:
+        results = collect((assess_guarded(command, transaction_mode, path, options) for path in paths), bail_out)
+    else:
+        workers = min(jobs, len(paths))
+        chunk_size = 1 if bail_out else max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            arguments = (repeat(command), repeat(transaction_mode), paths, repeat(options))
+            if profile_rules:
+                measured = executor.map(assess_measured, *arguments, chunksize=chunk_size)
+                results = collect((_merged(item) for item in measured), bail_out)
+            else:
+                results = collect(executor.map(assess_guarded, *arguments, chunksize=chunk_size), bail_out)
+            executor.shutdown(cancel_futures=True)
+    if len(results) < len(paths):
+        log.error(f'bailed out after {len(results)} of {len(paths)} advisories')
+    return results
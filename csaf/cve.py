@@ -0,0 +1,17 @@
+"""Common Vulnerabilities and Exposures (CVE) identifiers like CVE-2021-44228.
+
+Validated strings are memoized (the same identifiers repeat across the advisories of a corpus).
+"""
+
+import re
+from functools import lru_cache
+
+MEMO_SIZE = 1 << 14
+PATTERN = r'^CVE-[0-9]{4}-[0-9]{4,}$'
+REGEX = re.compile(PATTERN)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def is_valid(text: str) -> bool:
+    """Verify the text is a CVE id as required by the CSAF JSON schema."""
+    return REGEX.match(text) is not None
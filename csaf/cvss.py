@@ -5,14 +5,16 @@ from __future__ import annotations
 from enum import Enum
 from typing import Annotated, Optional, no_type_check
 
-from pydantic import BaseModel, Field, RootModel
+from pydantic import BaseModel, Field, RootModel, field_validator
 
+import csaf.scoring as scoring
 from csaf.vuln_types import (
     AccessComplexityType,
     AccessVectorType,
     AttackComplexityType,
     AttackVectorType,
     AuthenticationType,
+    Cia2Type,
     CiaRequirementType,
     CiaType,
     CollateralDamagePotentialType,
@@ -56,26 +58,28 @@ class Version(Enum):
     three_wun = '3.1'
 
 
+def _checked_vector(value: str, version: str) -> str:
+    """Return the vector string if it matches the schema pattern of the version (looked up in the interned vectors)."""
+    if scoring.lookup(value).matches != version:
+        raise ValueError(f"String should match pattern '{scoring.PATTERNS[version]}'")
+    return value
+
+
 class CVSS2(BaseModel):
     version: Annotated[Version, Field(description='CVSS Version')] = Version.two
     vector_string: Annotated[
         str,
         Field(
             alias='vectorString',
-            pattern=(
-                '^((AV:[NAL]|AC:[LMH]|Au:[MSN]|[CIA]:[NPC]|E:(U|POC|F|H|ND)|RL:(OF|TF|W|U|ND)|RC:(UC|UR|C|ND)|CDP:'
-                '(N|L|LM|MH|H|ND)|TD:(N|L|M|H|ND)|[CIA]R:(L|M|H|ND))/)*(AV:[NAL]|AC:[LMH]|Au:[MSN]|[CIA]:[NPC]|E:'
-                '(U|POC|F|H|ND)|RL:(OF|TF|W|U|ND)|RC:(UC|UR|C|ND)|CDP:(N|L|LM|MH|H|ND)|TD:(N|L|M|H|ND)|[CIA]R:'
-                '(L|M|H|ND))$'
-            ),
+            json_schema_extra={'pattern': scoring.PATTERNS['2.0']},
         ),
     ]
     access_vector: Annotated[Optional[AccessVectorType], Field(alias='accessVector')] = None
     access_complexity: Annotated[Optional[AccessComplexityType], Field(alias='accessComplexity')] = None
     authentication: Optional[AuthenticationType] = None
-    confidentiality_impact: Annotated[Optional[CiaType], Field(alias='confidentialityImpact')] = None
-    integrity_impact: Annotated[Optional[CiaType], Field(alias='integrityImpact')] = None
-    availability_impact: Annotated[Optional[CiaType], Field(alias='availabilityImpact')] = None
+    confidentiality_impact: Annotated[Optional[Cia2Type], Field(alias='confidentialityImpact')] = None
+    integrity_impact: Annotated[Optional[Cia2Type], Field(alias='integrityImpact')] = None
+    availability_impact: Annotated[Optional[Cia2Type], Field(alias='availabilityImpact')] = None
     base_score: Annotated[ScoreType, Field(alias='baseScore')]
     exploitability: Optional[ExploitabilityType] = None
     remediation_level: Annotated[Optional[RemediationLevelType], Field(alias='remediationLevel')] = None
@@ -93,6 +97,12 @@ class CVSS2(BaseModel):
     availability_requirement: Annotated[Optional[CiaRequirementType], Field(alias='availabilityRequirement')] = None
     environmental_score: Annotated[Optional[ScoreType], Field(alias='environmentalScore')] = None
 
+    @field_validator('vector_string')
+    @classmethod
+    @no_type_check
+    def check_vector_string(cls, v):
+        return _checked_vector(v, Version.two.value)
+
     @no_type_check
     def model_dump_json(self, *args, **kwargs):
         kwargs.setdefault('by_alias', True)
@@ -105,12 +115,7 @@ class CVSS30(BaseModel):
         str,
         Field(
             alias='vectorString',
-            pattern=(
-                '^CVSS:3[.]0/((AV:[NALP]|AC:[LH]|PR:[UNLH]|UI:[NR]|S:[UC]|[CIA]:[NLH]|E:[XUPFH]|RL:[XOTWU]|RC:[XURC]|'
-                '[CIA]R:[XLMH]|MAV:[XNALP]|MAC:[XLH]|MPR:[XUNLH]|MUI:[XNR]|MS:[XUC]|M[CIA]:[XNLH])/)*(AV:[NALP]|'
-                'AC:[LH]|PR:[UNLH]|UI:[NR]|S:[UC]|[CIA]:[NLH]|E:[XUPFH]|RL:[XOTWU]|RC:[XURC]|[CIA]R:[XLMH]|'
-                'MAV:[XNALP]|MAC:[XLH]|MPR:[XUNLH]|MUI:[XNR]|MS:[XUC]|M[CIA]:[XNLH])$'
-            ),
+            json_schema_extra={'pattern': scoring.PATTERNS['3.0']},
         ),
     ]
     attack_vector: Annotated[Optional[AttackVectorType], Field(alias='attackVector')] = None
@@ -153,6 +158,12 @@ class CVSS30(BaseModel):
     environmental_score: Annotated[Optional[ScoreType], Field(alias='environmentalScore')] = None
     environmental_severity: Annotated[Optional[SeverityType], Field(alias='environmentalSeverity')] = None
 
+    @field_validator('vector_string')
+    @classmethod
+    @no_type_check
+    def check_vector_string(cls, v):
+        return _checked_vector(v, Version.three_zero.value)
+
     @no_type_check
     def model_dump_json(self, *args, **kwargs):
         kwargs.setdefault('by_alias', True)
@@ -165,12 +176,7 @@ class CVSS31(BaseModel):
         str,
         Field(
             alias='vectorString',
-            pattern=(
-                '^CVSS:3[.]1/((AV:[NALP]|AC:[LH]|PR:[NLH]|UI:[NR]|S:[UC]|[CIA]:[NLH]|E:[XUPFH]|RL:[XOTWU]|RC:'
-                '[XURC]|[CIA]R:[XLMH]|MAV:[XNALP]|MAC:[XLH]|MPR:[XNLH]|MUI:[XNR]|MS:[XUC]|M[CIA]:[XNLH])/)*'
-                '(AV:[NALP]|AC:[LH]|PR:[NLH]|UI:[NR]|S:[UC]|[CIA]:[NLH]|E:[XUPFH]|RL:[XOTWU]|RC:[XURC]|[CIA]R:'
-                '[XLMH]|MAV:[XNALP]|MAC:[XLH]|MPR:[XNLH]|MUI:[XNR]|MS:[XUC]|M[CIA]:[XNLH])$'
-            ),
+            json_schema_extra={'pattern': scoring.PATTERNS['3.1']},
         ),
     ]
     attack_vector: Annotated[Optional[AttackVectorType], Field(alias='attackVector')] = None
@@ -213,6 +219,12 @@ class CVSS31(BaseModel):
     environmental_score: Annotated[Optional[ScoreType], Field(alias='environmentalScore')] = None
     environmental_severity: Annotated[Optional[SeverityType], Field(alias='environmentalSeverity')] = None
 
+    @field_validator('vector_string')
+    @classmethod
+    @no_type_check
+    def check_vector_string(cls, v):
+        return _checked_vector(v, Version.three_wun.value)
+
     @no_type_check
     def model_dump_json(self, *args, **kwargs):
         kwargs.setdefault('by_alias', True)
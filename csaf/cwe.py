@@ -0,0 +1,17 @@
+"""Common Weakness Enumeration (CWE) identifiers like CWE-352.
+
+Validated strings are memoized (the same identifiers repeat across the advisories of a corpus).
+"""
+
+import re
+from functools import lru_cache
+
+MEMO_SIZE = 1 << 12
+PATTERN = r'^CWE-[1-9]\d{0,5}$'
+REGEX = re.compile(PATTERN)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def is_valid(text: str) -> bool:
+    """Verify the text is a CWE id as required by the CSAF JSON schema."""
+    return REGEX.match(text) is not None
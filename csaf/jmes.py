@@ -0,0 +1,41 @@
+"""Compiled JMESPath expressions shared by the document verifiers and the rule helpers.
+
+Parsing an expression costs far more than applying it to a small document.
+The registry holds the expressions registered at import time by the modules searching them (the document
+verifiers) compiled once per process.
+Expressions built at runtime are compiled through a bounded least recently used cache.
+"""
+
+import functools
+from typing import Any, Dict
+
+import jmespath
+from jmespath.parser import ParsedResult
+
+CACHE_SIZE = 1024
+
+REGISTRY: Dict[str, ParsedResult] = {}
+
+
+def register(*expressions: str) -> None:
+    """Compile the expressions once and keep them for the lifetime of the process."""
+    for expression in expressions:
+        if expression not in REGISTRY:
+            REGISTRY[expression] = jmespath.compile(expression)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile(expression: str) -> ParsedResult:
+    """Compile expressions unknown at import time (bounded)."""
+    return jmespath.compile(expression)
+
+
+def compiled(expression: str) -> ParsedResult:
+    """Return the compiled expression from the registry or the cache."""
+    parsed = REGISTRY.get(expression)
+    return parsed if parsed is not None else _compile(expression)
+
+
+def search(expression: str, data: Any) -> Any:
+    """Drop-in replacement for jmespath.search without parsing known expressions again."""
+    return compiled(expression).search(data)
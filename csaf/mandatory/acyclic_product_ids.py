@@ -36,7 +36,56 @@ Example 42 which fails the test:
 CSAFPID-9080701 refers to itself - this is a circular definition.
 """
 
+from typing import Dict, Iterator, List, Set, Tuple
+
 ID = (6, 1, 3)
 TOPIC = 'Circular Definition of Product ID'
 
 PATHS = ('/product_tree/relationships[]/full_product_name/product_id',)
+
+
+def circular(references: Dict[str, List[str]]) -> Set[str]:
+    """Return the product ids on cycles of the graph of references between relationships.
+
+    The strongly connected components are found with Tarjan's algorithm in linear time using an explicit stack
+    (no recursion, so arbitrarily long chains of relationships are fine).
+    Product ids without an entry in references are leaves (e.g. defined in full product names or branches).
+    """
+    order: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    cyclic: Set[str] = set()
+    for root in references:
+        if root in order:
+            continue
+        order[root] = low[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        work: List[Tuple[str, Iterator[str]]] = [(root, iter(references[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in references:
+                    continue
+                if successor not in order:
+                    order[successor] = low[successor] = len(order)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(references[successor])))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], order[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    component = [stack.pop()]
+                    while component[-1] != node:
+                        component.append(stack.pop())
+                    on_stack.difference_update(component)
+                    if len(component) > 1 or node in references[node]:
+                        cyclic.update(component)
+    return cyclic
@@ -0,0 +1,41 @@
+"""6.1.10 Inconsistent CVSS
+
+It must be tested that the given CVSS properties do not contradict the CVSS vector.
+
+The relevant paths for this test are:
+
+  /vulnerabilities[]/scores[]/cvss_v2
+  /vulnerabilities[]/scores[]/cvss_v3
+
+Example 46 which fails the test:
+
+  "cvss_v3": {
+    "version": "3.1",
+    "vectorString": "CVSS:3.1/AV:L/AC:L/PR:H/UI:R/S:U/C:H/I:H/A:H",
+    "attackVector": "NETWORK",
+    "attackComplexity": "LOW",
+    "privilegesRequired": "NONE",
+    "userInteraction": "NONE",
+    "scope": "CHANGED",
+    "confidentialityImpact": "HIGH",
+    "integrityImpact": "HIGH",
+    "availabilityImpact": "LOW",
+    "baseScore": 9.6,
+    "baseSeverity": "CRITICAL"
+  }
+
+The values in CVSS vector differs from values of the properties attackVector, privilegesRequired, userInteraction,
+scope and availabilityImpact.
+
+Metrics not given in the vector are NOT_DEFINED.
+"""
+
+ID = (6, 1, 10)
+TOPIC = 'Inconsistent CVSS'
+BASE_URL = 'https://docs.oasis-open.org/csaf/csaf/v2.0/cs01/csaf-v2.0-cs01.html'
+REFERENCE = f'{BASE_URL}#6110-inconsistent-cvss'
+CONDITION_PATHS = (
+    '/vulnerabilities[]/scores[]/cvss_v2',
+    '/vulnerabilities[]/scores[]/cvss_v3',
+)
+PATHS = CONDITION_PATHS
@@ -70,3 +70,4 @@ PATHS = {
     ),
     'under_investigation': ('/vulnerabilities[]/product_status/under_investigation[]',),
 }
+GROUP_OF = {path.rsplit('/', 1)[-1].rstrip('[]'): group for group, paths in PATHS.items() for path in paths}
@@ -0,0 +1,215 @@
+"""Single pass harvest of identifiers, references, and status memberships from a CSAF document.
+
+The mandatory rules mostly ask the same questions of the same parts of a document (which product ids and
+group ids are defined where and which are referenced where).
+Walking the document once and answering all rules from the resulting index keeps the cost linear in the
+size of the document instead of proportional to the number of rules times the size of the document.
+
+All locations are recorded as JSON pointers (RFC 6901) into the document, e.g.:
+
+  /product_tree/full_product_names/0/product_id
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+PRODUCT_STATUS_CATEGORIES = (
+    'first_affected',
+    'first_fixed',
+    'fixed',
+    'known_affected',
+    'known_not_affected',
+    'last_affected',
+    'recommended',
+    'under_investigation',
+)
+
+BRANCHES_POINTER = '/product_tree/branches'
+CVSS_MEMBERS = ('cvss_v2', 'cvss_v3')
+
+Located = Tuple[str, str]  # JSON pointer and value
+Event = Tuple[str, Any]  # JSON pointer and value of a section (like /document or /vulnerabilities/0)
+
+
+def as_list(thing: Any) -> List[Any]:
+    """Return the thing if it is a list else an empty list (tolerate schema violations when walking documents)."""
+    return thing if isinstance(thing, list) else []
+
+
+def as_object(thing: Any) -> Dict[str, Any]:
+    """Return the thing if it is an object else an empty object (tolerate schema violations when walking documents)."""
+    return thing if isinstance(thing, dict) else {}
+
+
+class Index:
+    """Identifiers and references of one document harvested in a single walk."""
+
+    __slots__ = (
+        'document',
+        'category',
+        'publisher_category',
+        'source_lang',
+        'product_ids',
+        'group_ids',
+        'product_refs',
+        'group_refs',
+        'relationships',
+        'statuses',
+        'status_offsets',
+        'purls',
+        'cvss',
+        'product_index',
+    )
+
+    def __init__(self, document: Dict[str, Any]) -> None:
+        self.document = document  # for rules (like plugins) asking questions the index does not answer
+        self.category: Any = None
+        self.publisher_category: Any = None
+        self.source_lang: Any = None
+        self.product_ids: List[Located] = []  # definitions from full product name elements
+        self.group_ids: List[Located] = []  # definitions from product groups
+        self.product_refs: List[Located] = []  # references to product ids outside of full product name elements
+        self.group_refs: List[Located] = []  # references to group ids
+        self.relationships: List[Tuple[str, str, str, str]] = []  # pointer, product id, reference, relates to
+        self.statuses: List[Dict[str, List[Located]]] = []  # per vulnerability the members per status category
+        self.status_offsets: List[int] = []  # per vulnerability the position of the status members in product_refs
+        self.purls: List[Located] = []  # package urls of product identification helpers
+        self.cvss: List[Tuple[str, str, Dict[str, Any]]] = []  # pointer, member (cvss_v2 or cvss_v3), and object
+        self.product_index: Any = None  # interned ids and bitsets (see csaf.mandatory.products) built on first use
+
+
+def _harvest_full_product_name(index: Index, full_product_name: Any, pointer: str) -> None:
+    """Record the product id defined by a full product name element and the package url identifying it."""
+    full_product_name = as_object(full_product_name)
+    product_id = full_product_name.get('product_id')
+    if isinstance(product_id, str):
+        index.product_ids.append((f'{pointer}/product_id', product_id))
+    purl = as_object(full_product_name.get('product_identification_helper')).get('purl')
+    if isinstance(purl, str):
+        index.purls.append((f'{pointer}/product_identification_helper/purl', purl))
+
+
+def _harvest_ids(located: List[Located], ids: Any, pointer: str) -> None:
+    """Record the string entries of a list of ids."""
+    for pos, an_id in enumerate(as_list(ids)):
+        if isinstance(an_id, str):
+            located.append((f'{pointer}/{pos}', an_id))
+
+
+def branch_products(branches: Any, pointer: str = BRANCHES_POINTER) -> Iterator[Tuple[str, Any]]:
+    """Yield pointer and value of every product in /product_tree/branches[](/branches[])* in document order.
+
+    The tree is walked depth first with an explicit stack, so the depth is not limited by the recursion limit.
+    """
+    stack = [(f'{pointer}/{pos}', branch) for pos, branch in reversed(list(enumerate(as_list(branches))))]
+    while stack:
+        here, branch = stack.pop()
+        branch = as_object(branch)
+        if 'product' in branch:
+            yield f'{here}/product', branch['product']
+        children = as_list(branch.get('branches'))
+        stack.extend((f'{here}/branches/{pos}', child) for pos, child in reversed(list(enumerate(children))))
+
+
+def _harvest_branches(index: Index, branches: Any, pointer: str) -> None:
+    """Record the products defined anywhere in the branches."""
+    for here, product in branch_products(branches, pointer):
+        _harvest_full_product_name(index, product, here)
+
+
+def _harvest_product_tree(index: Index, product_tree: Dict[str, Any]) -> None:
+    """Record definitions and references within the product tree."""
+    base = '/product_tree'
+    _harvest_branches(index, product_tree.get('branches'), BRANCHES_POINTER)
+
+    for pos, full_product_name in enumerate(as_list(product_tree.get('full_product_names'))):
+        _harvest_full_product_name(index, full_product_name, f'{base}/full_product_names/{pos}')
+
+    for pos, group in enumerate(as_list(product_tree.get('product_groups'))):
+        here = f'{base}/product_groups/{pos}'
+        group = as_object(group)
+        group_id = group.get('group_id')
+        if isinstance(group_id, str):
+            index.group_ids.append((f'{here}/group_id', group_id))
+        _harvest_ids(index.product_refs, group.get('product_ids'), f'{here}/product_ids')
+
+    for pos, relationship in enumerate(as_list(product_tree.get('relationships'))):
+        here = f'{base}/relationships/{pos}'
+        relationship = as_object(relationship)
+        _harvest_full_product_name(index, relationship.get('full_product_name'), f'{here}/full_product_name')
+        for key in ('product_reference', 'relates_to_product_reference'):
+            reference = relationship.get(key)
+            if isinstance(reference, str):
+                index.product_refs.append((f'{here}/{key}', reference))
+        product_id = as_object(relationship.get('full_product_name')).get('product_id')
+        product_reference = relationship.get('product_reference')
+        relates_to_product_reference = relationship.get('relates_to_product_reference')
+        if isinstance(product_id, str) and isinstance(product_reference, str):
+            if isinstance(relates_to_product_reference, str):
+                index.relationships.append((here, product_id, product_reference, relates_to_product_reference))
+
+
+def _harvest_vulnerability(index: Index, vulnerability: Dict[str, Any], pointer: str) -> None:
+    """Record the references and status memberships of one vulnerability."""
+    product_status = as_object(vulnerability.get('product_status'))
+    statuses: Dict[str, List[Located]] = {}
+    index.status_offsets.append(len(index.product_refs))  # the members follow in the order of the categories
+    for category in PRODUCT_STATUS_CATEGORIES:
+        members: List[Located] = []
+        _harvest_ids(members, product_status.get(category), f'{pointer}/product_status/{category}')
+        statuses[category] = members
+        index.product_refs.extend(members)
+    index.statuses.append(statuses)
+
+    for member in ('remediations', 'threats'):
+        for pos, item in enumerate(as_list(vulnerability.get(member))):
+            here = f'{pointer}/{member}/{pos}'
+            item = as_object(item)
+            _harvest_ids(index.product_refs, item.get('product_ids'), f'{here}/product_ids')
+            _harvest_ids(index.group_refs, item.get('group_ids'), f'{here}/group_ids')
+
+    for pos, score in enumerate(as_list(vulnerability.get('scores'))):
+        here = f'{pointer}/scores/{pos}'
+        score = as_object(score)
+        _harvest_ids(index.product_refs, score.get('products'), f'{here}/products')
+        for member in CVSS_MEMBERS:
+            if isinstance(score.get(member), dict):
+                index.cvss.append((f'{here}/{member}', member, score[member]))
+
+
+def _harvest_meta(index: Index, meta: Dict[str, Any]) -> None:
+    """Record the document level values the rules ask for."""
+    index.category = meta.get('category')
+    index.publisher_category = as_object(meta.get('publisher')).get('category')
+    index.source_lang = meta.get('source_lang')
+
+
+def harvest(document: Dict[str, Any]) -> Index:
+    """Walk the document once and return the index of identifiers, references, and status memberships."""
+    index = Index(document)
+    _harvest_meta(index, as_object(document.get('document')))
+
+    _harvest_product_tree(index, as_object(document.get('product_tree')))
+
+    for pos, vulnerability in enumerate(as_list(document.get('vulnerabilities'))):
+        _harvest_vulnerability(index, as_object(vulnerability), f'/vulnerabilities/{pos}')
+
+    return index
+
+
+def harvest_events(events: Iterable[Event]) -> Index:
+    """Return the index of a document given as sequence of sections (so they can be dropped once harvested).
+
+    The events are the /document section, the members of the product tree (like /product_tree/branches),
+    and the vulnerabilities (like /vulnerabilities/0) in document order.
+    Only the document meta data is kept (as the document of the index).
+    """
+    index = Index({})
+    for pointer, value in events:
+        if pointer == '/document':
+            index.document = {'document': value}
+            _harvest_meta(index, as_object(value))
+        elif pointer.startswith('/product_tree/'):
+            _harvest_product_tree(index, {pointer.rsplit('/', 1)[1]: value})
+        elif pointer.startswith('/vulnerabilities/'):
+            _harvest_vulnerability(index, as_object(value), pointer)
+    return index
@@ -0,0 +1,125 @@
+"""Product and group ids of an index interned to dense integers with the product status memberships as bitsets.
+
+Every distinct product id (and group id) gets the next integer on first sight, definitions first.
+A set of ids is a Python int with bit n set for the id interned as n, so unions, intersections, and differences
+of whole sets (like the products of contradicting status groups or the references not defined) are single big
+integer operations instead of per string hashing.
+The product index of a document is built once on first use and shared by the rules.
+"""
+
+from array import array
+from collections import Counter, deque
+from itertools import repeat
+from operator import itemgetter
+from typing import Dict, Iterable, List, Set, Tuple
+
+from csaf.mandatory.index import PRODUCT_STATUS_CATEGORIES, Index, Located
+
+DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def bits(codes: Iterable[int], size: int) -> int:
+    """Return the bitset of the codes less than size.
+
+    The codes are scattered into a flag per code and the flags are read as binary digits (setting the bits of
+    a big int one at a time would be quadratic and a loop in Python per code is the dominating cost).
+    """
+    flags = bytearray(size)
+    deque(map(flags.__setitem__, codes, repeat(1)), maxlen=0)
+    return int(flags.translate(DIGITS)[::-1] or b'0', 2)
+
+
+def members(bitset: int) -> Set[int]:
+    """Return the codes in the bitset."""
+    found: Set[int] = set()
+    for pos, byte in enumerate(bitset.to_bytes((bitset.bit_length() + 7) >> 3, 'little')):
+        if byte:
+            found.update((pos << 3) + bit for bit in range(8) if byte >> bit & 1)
+    return found
+
+
+def repeated(codes: Iterable[int], size: int) -> int:
+    """Return the bitset of the codes occurring more than once."""
+    return bits((code for code, count in Counter(codes).items() if count > 1), size)
+
+
+class Interned:
+    """Dense integer codes of strings in order of first sight."""
+
+    __slots__ = ('codes', 'names')
+
+    def __init__(self) -> None:
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def encode(self, located: Iterable[Located]) -> 'array[int]':
+        """Return the codes of the located values interning values not seen before (in order of first sight)."""
+        values = list(map(itemgetter(1), located))
+        unseen = set(values).difference(self.codes)
+        if unseen:
+            for value in dict.fromkeys(values):
+                if value in unseen:
+                    self.codes[value] = len(self.names)
+                    self.names.append(value)
+        return array('l', list(map(self.codes.__getitem__, values)))
+
+
+class ProductIndex:
+    """The product and group ids of an index as integer codes (parallel to the located lists) and bitsets."""
+
+    __slots__ = (
+        'products',
+        'groups',
+        'product_ids',
+        'group_ids',
+        'product_refs',
+        'group_refs',
+        'defined_products',
+        'defined_groups',
+        'statuses',
+    )
+
+    def __init__(self, index: Index) -> None:
+        self.products = Interned()
+        self.groups = Interned()
+        self.product_ids = self.products.encode(index.product_ids)
+        self.group_ids = self.groups.encode(index.group_ids)
+        self.product_refs = self.products.encode(index.product_refs)
+        self.group_refs = self.groups.encode(index.group_refs)
+        size = len(self.products)
+        self.defined_products = bits(self.product_ids, size)
+        self.defined_groups = bits(self.group_ids, len(self.groups))
+        self.statuses: List[Dict[str, int]] = []  # per vulnerability the bitset per status category
+        for status, offset in zip(index.statuses, index.status_offsets):
+            bitsets = {}
+            for category in PRODUCT_STATUS_CATEGORIES:  # the codes of the members are a slice of the references
+                count = len(status.get(category, ()))
+                bitsets[category] = bits(self.product_refs[offset : offset + count], size) if count else 0
+                offset += count
+            self.statuses.append(bitsets)
+
+    def undefined_products(self) -> int:
+        """Return the bitset of the product ids referenced but not defined."""
+        return bits(self.product_refs, len(self.products)) & ~self.defined_products
+
+    def undefined_groups(self) -> int:
+        """Return the bitset of the group ids referenced but not defined."""
+        return bits(self.group_refs, len(self.groups)) & ~self.defined_groups
+
+
+def product_index(index: Index) -> ProductIndex:
+    """Return the product index of the index (built on first use)."""
+    if index.product_index is None:
+        index.product_index = ProductIndex(index)
+    return index.product_index  # type: ignore[no-any-return]
+
+
+def located_in(located: List[Located], codes: 'array[int]', bitset: int) -> Tuple[str, ...]:
+    """Return the pointers of the located values with codes in the bitset."""
+    if not bitset:
+        return ()
+    selected = members(bitset)
+    return tuple(pointer for (pointer, _), code in zip(located, codes) if code in selected)
@@ -1,50 +1,220 @@
-from typing import Dict, List, Tuple, no_type_check
-
-import jmespath
-
-# import csaf.mandatory.acyclic_product_ids as acy_product_ids
-# import csaf.mandatory.consistent_product_status as con_pro_sta
+from operator import attrgetter
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Tuple, no_type_check
+
+import csaf.jmes as jmes
+import csaf.metrics as metrics
+import csaf.purl as purl
+import csaf.scoring as scoring
+import csaf.mandatory.acyclic_product_ids as acy_pro_ids
+import csaf.mandatory.consistent_cvss as con_cvs
+import csaf.mandatory.consistent_product_status as con_pro_sta
 import csaf.mandatory.defined_group_ids as def_gro_ids
 import csaf.mandatory.defined_product_ids as def_pro_ids
 import csaf.mandatory.translator_and_source_lang as tra_and_sou_lan
 import csaf.mandatory.unique_group_ids as uni_gro_ids
 import csaf.mandatory.unique_product_ids as uni_pro_ids
+import csaf.mandatory.valid_cvss_computation as val_cvs_com
+import csaf.mandatory.valid_purl as val_pur
 import csaf.mandatory.valid_category_name as val_cat_nam
+from csaf.mandatory.index import Index, harvest
+from csaf.mandatory.products import located_in, members, product_index, repeated
+from csaf.registry import ERROR, MANDATORY, PROFILES, REGISTRY, Offenders, register
+from csaf.result import Finding
 
 
-@no_type_check
-def guess_max_depth(map_or_seq):
-    """HACK A DID ACK - please delete me when cleaning up."""
-    if isinstance(map_or_seq, dict):
-        return 1 + max(map(guess_max_depth, map_or_seq.values()), default=0)
-    elif isinstance(map_or_seq, list):
-        return 1 + max(map(guess_max_depth, map_or_seq[0].values()), default=0)
-    return 0
+RULESET_REVISION = 1  # Increment whenever a rule changes its outcome for the same document
 
+# The rules are registered in the order of this module: cheapest first (constant, then linear,
+# then graph and per vulnerability rules) which is the order of evaluation until measured
 
-@no_type_check
-def is_valid(document: dict) -> bool:
-    """Complete validation of all mandatory rules.
 
-    This is a spike - we throw it away when all rules are in and back comes something maintainable.
+@register(val_cat_nam, 'invalid category')
+def _offending_category(index: Index) -> Offenders:
+    """Verify category value (6.1.26)."""
+    return () if val_cat_nam.is_valid(index.category) else (val_cat_nam.CONDITION_PATH,)
+
+
+@register(tra_and_sou_lan, 'invalid translator')
+def _offending_translator(index: Index) -> Offenders:
+    """Verify source_lang value is present for translator (6.1.15)."""
+    if index.publisher_category != tra_and_sou_lan.TRIGGER_VALUE or index.source_lang:
+        return ()
+    return (tra_and_sou_lan.CONDITION_PATH,)
+
+
+@register(uni_pro_ids, 'non-unique product ids')
+def _offending_unique_product_ids(index: Index) -> Offenders:
+    """Verify no product id is defined more than once (6.1.2)."""
+    products = product_index(index)
+    return located_in(index.product_ids, products.product_ids, repeated(products.product_ids, len(products.products)))
+
+
+@register(uni_gro_ids, 'non-unique group ids')
+def _offending_unique_group_ids(index: Index) -> Offenders:
+    """Verify no group id is defined more than once (6.1.5)."""
+    products = product_index(index)
+    return located_in(index.group_ids, products.group_ids, repeated(products.group_ids, len(products.groups)))
+
+
+@register(def_pro_ids, 'undefined product ids')
+def _offending_defined_product_ids(index: Index) -> Offenders:
+    """Verify all referenced product ids are defined (6.1.1)."""
+    products = product_index(index)
+    return located_in(index.product_refs, products.product_refs, products.undefined_products())
+
+
+@register(def_gro_ids, 'undefined group ids')
+def _offending_defined_group_ids(index: Index) -> Offenders:
+    """Verify all referenced group ids are defined (6.1.4)."""
+    products = product_index(index)
+    return located_in(index.group_refs, products.group_refs, products.undefined_groups())
+
+
+@register(val_pur, 'invalid purl')
+def _offending_purls(index: Index) -> Offenders:
+    """Verify all package urls of product identification helpers are valid (6.1.13)."""
+    return tuple(pointer for pointer, text in index.purls if not purl.is_valid(text))
+
+
+@register(acy_pro_ids, 'circular product ids')
+def _offending_circular_product_ids(index: Index) -> Offenders:
+    """Verify no product id defined in relationships ends up in a circle (6.1.3).
+
+    Only product ids defined in relationships and referenced by relationships can be part of a circle.
     """
-    if not is_valid_category(document):
-        return False
+    defined = {product_id for _, product_id, _, _ in index.relationships}
+    candidates = defined.intersection(ref for _, _, *refs in index.relationships for ref in refs)
+    if not candidates:
+        return ()
+    references: Dict[str, List[str]] = {}
+    for _, product_id, product_reference, relates_to in index.relationships:
+        if product_id in candidates:
+            targets = references.setdefault(product_id, [])
+            targets.extend(ref for ref in (product_reference, relates_to) if ref in candidates)
+    cyclic = acy_pro_ids.circular(references)
+    return tuple(
+        f'{here}/full_product_name/product_id' for here, product_id, _, _ in index.relationships if product_id in cyclic
+    )
 
-    if jmespath.search(tra_and_sou_lan.TRIGGER_JMES_PATH, document) == tra_and_sou_lan.TRIGGER_VALUE:
-        if not is_valid_translator(document):
-            return False
 
-    if not is_valid_unique_product_ids(document):
-        return False
+@register(con_pro_sta, 'contradicting product status')
+def _offending_product_status(index: Index) -> Offenders:
+    """Verify the contradiction groups of product status are pairwise disjoint per vulnerability (6.1.6).
 
-    if not is_valid_unique_group_ids(document):
-        return False
+    The members of every group are the union of the bitsets of its categories and the contradicting
+    product ids are the union of the pairwise intersections of the groups.
+    """
+    products = product_index(index)
+    offenders: List[str] = []
+    for statuses, bitsets in zip(index.statuses, products.statuses):
+        groups: Dict[str, int] = {}
+        for category, group in con_pro_sta.GROUP_OF.items():
+            groups[group] = groups.get(group, 0) | bitsets[category]
+        masks = list(groups.values())
+        contradicting = 0
+        for pos, mask in enumerate(masks):
+            for other in masks[pos + 1 :]:
+                contradicting |= mask & other
+        if contradicting:
+            selected = members(contradicting)
+            offenders.extend(
+                pointer
+                for category in con_pro_sta.GROUP_OF
+                for pointer, product_id in statuses.get(category, ())
+                if products.products.codes[product_id] in selected
+            )
+    return tuple(offenders)
+
+
+def _interned_cvss(index: Index) -> List[Tuple[str, str, Dict[str, Any], scoring.Vector]]:
+    """Return pointer, member, object, and interned vector of the CVSS objects with a vector valid for the member.
+
+    Invalid vectors are left to the schema (6.1.8).
+    """
+    interned = []
+    for pointer, member, cvss in index.cvss:
+        text = cvss.get('vectorString')
+        if not isinstance(text, str):
+            continue
+        vector = scoring.lookup(text)
+        if vector.parsed is not None and (vector.parsed[0] == scoring.V2) == (member == 'cvss_v2'):
+            interned.append((pointer, member, cvss, vector))
+    return interned
+
+
+@register(con_cvs, 'inconsistent cvss')
+def _offending_cvss_properties(index: Index) -> Offenders:
+    """Verify the properties of the CVSS objects do not contradict their vectors (6.1.10)."""
+    offenders: List[str] = []
+    for pointer, _, cvss, vector in _interned_cvss(index):
+        offenders.extend(
+            f'{pointer}/{name}'
+            for name, value in scoring.properties(vector.parsed).items()  # type: ignore[arg-type]
+            if cvss.get(name) not in (None, value)
+        )
+    return tuple(offenders)
+
+
+@register(val_cvs_com, 'invalid cvss computation')
+def _offending_cvss_computation(index: Index) -> Offenders:
+    """Verify the scores and severities of the CVSS objects are the ones computed from their vectors (6.1.9)."""
+    offenders: List[str] = []
+    for pointer, member, cvss, vector in _interned_cvss(index):
+        for name in val_cvs_com.SCORES:
+            computed = getattr(vector.scores, name)
+            declared = cvss.get(f'{name}Score')
+            if isinstance(declared, (int, float)) and not isinstance(declared, bool) and declared != computed:
+                offenders.append(f'{pointer}/{name}Score')
+            if member == 'cvss_v3' and cvss.get(f'{name}Severity') not in (None, scoring.severity(computed)):
+                offenders.append(f'{pointer}/{name}Severity')
+    return tuple(offenders)
+
+
+def ruleset_version() -> str:
+    """Return the version of the rule set (revision and the sections of the rules of all profiles)."""
+    return f'{RULESET_REVISION}:' + ','.join(rule.rule for rule in REGISTRY.rules(PROFILES))
+
+
+def evaluate(
+    document: Dict[str, Any], bail_out: bool = False, profiles: Iterable[str] = MANDATORY
+) -> Tuple[Finding, ...]:
+    """Evaluate the rules of the profiles in a single pass and return the findings of the failing rules.
+
+    The document is walked only once and all rules are evaluated against the resulting index (see evaluate_index).
+    """
+    return evaluate_index(harvest(document), bail_out, profiles)
 
-    if not is_valid_defined_product_ids(document):
-        return False
 
-    if not is_valid_defined_group_ids(document):
+def evaluate_index(index: Index, bail_out: bool = False, profiles: Iterable[str] = MANDATORY) -> Tuple[Finding, ...]:
+    """Evaluate the rules of the profiles against the index of a document and return the findings.
+
+    The wall time and outcome of every rule evaluation is recorded in the metrics registry.
+    Given bail_out the evaluation stops at the first failing mandatory rule
+    and the rules are scheduled by measured cost and failure rate (cheap and frequently failing first).
+    """
+    findings = []
+    selected = REGISTRY.rules(profiles)
+    scheduled = metrics.REGISTRY.schedule(selected, attrgetter('rule')) if bail_out else selected
+    for rule in scheduled:
+        start = perf_counter()
+        pointers = rule.check(index)
+        metrics.REGISTRY.record(rule.rule, perf_counter() - start, bool(pointers))
+        if pointers:
+            findings.append(
+                Finding(
+                    rule=rule.rule, topic=rule.topic, message=rule.message, pointers=pointers, severity=rule.severity
+                )
+            )
+            if bail_out and rule.severity == ERROR:
+                break
+    return tuple(findings)
+
+
+@no_type_check
+def is_valid(document: dict) -> bool:
+    """Complete validation of all mandatory rules."""
+    if evaluate(document):
         return False
 
     return NotImplemented
@@ -52,95 +222,78 @@ def is_valid(document: dict) -> bool:
 
 @no_type_check
 def is_valid_unique_product_ids(document: dict) -> bool:
-    """Temporary implementation of rule for unique product ids."""
-    prod_ids = []
-    for path in uni_pro_ids.CONDITION_JMES_PATHS:
-        pids = jmespath.search(path, document)
-        if pids is not None:
-            prod_ids.extend(pids)
-    probe = jmespath.search('product_tree.branches[]', document)
-    trials = guess_max_depth(probe) + 1
-    ipath = 'product_tree.branches[].product.product_id'
-    inject = 'branches[].product.'
-    for trial in range(trials):
-        harvest = jmespath.search(ipath, document)
-        if harvest:
-            prod_ids.extend(harvest)
-        ipath = ipath.replace('product.', inject)
-    if len(prod_ids) > len(set(prod_ids)):
-        return False
-
-    return True
+    """Verify rule for unique product ids."""
+    return not _offending_unique_product_ids(harvest(document))
 
 
 @no_type_check
 def is_valid_unique_group_ids(document: dict) -> bool:
-    """Temporary implementation of rule for unique group ids."""
-    group_ids = jmespath.search(uni_gro_ids.CONDITION_JMES_PATH, document)
-    if group_ids is not None:
-        if len(group_ids) > len(set(group_ids)):
-            return False
-
-    return True
+    """Verify rule for unique group ids."""
+    return not _offending_unique_group_ids(harvest(document))
 
 
 @no_type_check
 def is_valid_defined_product_ids(document: dict) -> bool:
-    """Temporary implementation of rule for defined product ids."""
-    defined_prod_ids = jmespath.search(def_pro_ids.TRIGGER_JMES_PATH, document)
-    # TODO(sthagen) too shallow tree visiting # print("DEBUG>>>", defined_prod_ids)
-    if defined_prod_ids is None:
-        defined_prod_ids = []
-    known_prod_ids = set(defined_prod_ids)
-    for path in def_pro_ids.CONDITION_JMES_PATHS:
-        claim_prod_ids = jmespath.search(path, document)
-        if claim_prod_ids is not None:
-            if any(claim_prod_id not in known_prod_ids for claim_prod_id in claim_prod_ids):
-                return False
-
-    return True
+    """Verify rule for defined product ids."""
+    return not _offending_defined_product_ids(harvest(document))
 
 
 @no_type_check
 def is_valid_defined_group_ids(document: dict) -> bool:
-    """Temporary implementation of rule for defined group ids."""
-    defined_group_ids = jmespath.search(def_gro_ids.TRIGGER_JMES_PATH, document)
-    if defined_group_ids is None:
-        defined_group_ids = []
-    known_group_ids = set(defined_group_ids)
-    for path in def_gro_ids.CONDITION_JMES_PATHS:
-        claim_group_ids = jmespath.search(path, document)
-        if claim_group_ids is not None:
-            if any(claim_group_id not in known_group_ids for cl_seq in claim_group_ids for claim_group_id in cl_seq):
-                return False
+    """Verify rule for defined group ids."""
+    return not _offending_defined_group_ids(harvest(document))
+
+
+@no_type_check
+def is_valid_acyclic_product_ids(document: dict) -> bool:
+    """Verify rule for acyclic product ids."""
+    return not _offending_circular_product_ids(harvest(document))
 
-    return True
+
+@no_type_check
+def is_valid_consistent_product_status(document: dict) -> bool:
+    """Verify rule for consistent product status."""
+    return not _offending_product_status(harvest(document))
 
 
 @no_type_check
 def exists(document: dict, claims: Dict[str, List[str]]) -> Tuple[Tuple[str, str, bool]]:
     """Verify the existence and return tuple of triplets with claim, path and result."""
-    return tuple(
-        (claim, path, bool(jmespath.search(path, document))) for claim, paths in claims.items() for path in paths
-    )
+    return tuple((claim, path, bool(jmes.search(path, document))) for claim, paths in claims.items() for path in paths)
 
 
 @no_type_check
 def must_skip(document: dict, path: str, skip_these: Tuple[str, ...]) -> Tuple[str, str, bool]:
     """Verify any skips and return tuple of triplets with claim, path and result."""
-    value = jmespath.search(path, document)
+    value = jmes.search(path, document)
     return value, path, any(value == skip for skip in skip_these)
 
 
 @no_type_check
 def is_valid_category(document: dict) -> bool:
     """Verify category value."""
-    return val_cat_nam.is_valid(jmespath.search(val_cat_nam.CONDITION_JMES_PATH, document))
+    return not _offending_category(harvest(document))
 
 
 @no_type_check
 def is_valid_translator(document: dict) -> bool:
     """Verify source_lang value is present for translator."""
-    if jmespath.search(tra_and_sou_lan.TRIGGER_JMES_PATH, document) != tra_and_sou_lan.TRIGGER_VALUE:
-        return False
-    return bool(jmespath.search(tra_and_sou_lan.CONDITION_JMES_PATH, document))
+    return not _offending_translator(harvest(document))
+
+
+@no_type_check
+def is_valid_purls(document: dict) -> bool:
+    """Verify rule for valid package urls."""
+    return not _offending_purls(harvest(document))
+
+
+@no_type_check
+def is_valid_consistent_cvss(document: dict) -> bool:
+    """Verify rule for cvss properties consistent with the vectors."""
+    return not _offending_cvss_properties(harvest(document))
+
+
+@no_type_check
+def is_valid_cvss_computation(document: dict) -> bool:
+    """Verify rule for cvss scores and severities computed from the vectors."""
+    return not _offending_cvss_computation(harvest(document))
@@ -0,0 +1,47 @@
+"""6.1.9 Invalid CVSS computation
+
+It must be tested that the given CVSS object has the values computed correctly according to the definition.
+
+The vectorString should take precedence.
+
+The relevant paths for this test are:
+
+  /vulnerabilities[]/scores[]/cvss_v2/baseScore
+  /vulnerabilities[]/scores[]/cvss_v2/temporalScore
+  /vulnerabilities[]/scores[]/cvss_v2/environmentalScore
+  /vulnerabilities[]/scores[]/cvss_v3/baseScore
+  /vulnerabilities[]/scores[]/cvss_v3/baseSeverity
+  /vulnerabilities[]/scores[]/cvss_v3/temporalScore
+  /vulnerabilities[]/scores[]/cvss_v3/temporalSeverity
+  /vulnerabilities[]/scores[]/cvss_v3/environmentalScore
+  /vulnerabilities[]/scores[]/cvss_v3/environmentalSeverity
+
+Example 45 which fails the test:
+
+  "cvss_v3": {
+    "version": "3.1",
+    "vectorString": "CVSS:3.1/AV:L/AC:L/PR:H/UI:R/S:U/C:H/I:H/A:H",
+    "baseScore": 10.0,
+    "baseSeverity": "LOW"
+  }
+
+Neither the baseScore nor the baseSeverity has the correct value according to the specification.
+"""
+
+ID = (6, 1, 9)
+TOPIC = 'Invalid CVSS computation'
+BASE_URL = 'https://docs.oasis-open.org/csaf/csaf/v2.0/cs01/csaf-v2.0-cs01.html'
+REFERENCE = f'{BASE_URL}#619-invalid-cvss-computation'
+CONDITION_PATHS = (
+    '/vulnerabilities[]/scores[]/cvss_v2/baseScore',
+    '/vulnerabilities[]/scores[]/cvss_v2/temporalScore',
+    '/vulnerabilities[]/scores[]/cvss_v2/environmentalScore',
+    '/vulnerabilities[]/scores[]/cvss_v3/baseScore',
+    '/vulnerabilities[]/scores[]/cvss_v3/baseSeverity',
+    '/vulnerabilities[]/scores[]/cvss_v3/temporalScore',
+    '/vulnerabilities[]/scores[]/cvss_v3/temporalSeverity',
+    '/vulnerabilities[]/scores[]/cvss_v3/environmentalScore',
+    '/vulnerabilities[]/scores[]/cvss_v3/environmentalSeverity',
+)
+PATHS = CONDITION_PATHS
+SCORES = ('base', 'temporal', 'environmental')  # the properties are <score>Score and (for cvss_v3) <score>Severity
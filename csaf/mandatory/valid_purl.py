@@ -0,0 +1,37 @@
+"""6.1.13 PURL
+
+It must be tested that given PURL is valid.
+
+The relevant paths for this test are:
+
+  /product_tree/branches[](/branches[])*/product/product_identification_helper/purl
+  /product_tree/full_product_names[]/product_identification_helper/purl
+  /product_tree/relationships[]/full_product_name/product_identification_helper/purl
+
+Example 59 which fails the test:
+
+  "product_tree": {
+    "full_product_names": [
+      {
+        "name": "Product A",
+        "product_id": "CSAFPID-9080700",
+        "product_identification_helper": {
+          "purl": "pkg:maven/@1.3.4"
+        }
+      }
+    ]
+  }
+
+Any valid purl has a name component.
+"""
+
+ID = (6, 1, 13)
+TOPIC = 'PURL'
+BASE_URL = 'https://docs.oasis-open.org/csaf/csaf/v2.0/cs01/csaf-v2.0-cs01.html'
+REFERENCE = f'{BASE_URL}#6113-purl'
+CONDITION_PATHS = (
+    '/product_tree/branches[](/branches[])*/product/product_identification_helper/purl',
+    '/product_tree/full_product_names[]/product_identification_helper/purl',
+    '/product_tree/relationships[]/full_product_name/product_identification_helper/purl',
+)
+PATHS = CONDITION_PATHS
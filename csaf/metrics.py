@@ -0,0 +1,102 @@
+"""Per rule timings and failure counts measured while evaluating rules (one registry per process)."""
+
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+import msgspec
+
+T = TypeVar('T')
+
+
+class RuleStats(msgspec.Struct):
+    """Accumulated wall time in seconds, evaluations, and failures of one rule."""
+
+    rule: str
+    runs: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+
+    def failure_rate(self) -> float:
+        """Return the estimated probability of the rule failing (Laplace smoothed so unseen failures count)."""
+        return (self.failures + 1) / (self.runs + 2)
+
+    def mean_seconds(self) -> float:
+        """Return the mean wall time of an evaluation."""
+        return self.seconds / self.runs if self.runs else 0.0
+
+    def expected_cost(self) -> float:
+        """Return the expected time spent per failure detected (the ordering key for bailing out early).
+
+        Running the rules in ascending order of this key minimizes the expected time until the first failure.
+        Rules never measured have zero cost, so they run first and get measured.
+        """
+        return self.mean_seconds() / self.failure_rate()
+
+
+class Metrics:
+    """Registry of the rule statistics."""
+
+    def __init__(self) -> None:
+        self.stats: Dict[str, RuleStats] = {}
+
+    def record(self, rule: str, seconds: float, failed: bool) -> None:
+        """Account one evaluation of the rule."""
+        stats = self.stats.get(rule)
+        if stats is None:
+            stats = self.stats[rule] = RuleStats(rule=rule)
+        stats.runs += 1
+        stats.failures += failed
+        stats.seconds += seconds
+
+    def merge(self, others: Iterable[RuleStats]) -> None:
+        """Add the statistics measured elsewhere (for example by worker processes)."""
+        for other in others:
+            stats = self.stats.get(other.rule)
+            if stats is None:
+                stats = self.stats[other.rule] = RuleStats(rule=other.rule)
+            stats.runs += other.runs
+            stats.failures += other.failures
+            stats.seconds += other.seconds
+
+    def snapshot(self) -> Tuple[RuleStats, ...]:
+        """Return a copy of the statistics."""
+        return tuple(msgspec.structs.replace(stats) for stats in self.stats.values())
+
+    def since(self, before: Iterable[RuleStats]) -> Tuple[RuleStats, ...]:
+        """Return the statistics accumulated after the snapshot before was taken."""
+        earlier = {stats.rule: stats for stats in before}
+        zero = RuleStats(rule='')
+        delta = []
+        for stats in self.stats.values():
+            past = earlier.get(stats.rule, zero)
+            if stats.runs > past.runs:
+                delta.append(
+                    RuleStats(
+                        rule=stats.rule,
+                        runs=stats.runs - past.runs,
+                        failures=stats.failures - past.failures,
+                        seconds=stats.seconds - past.seconds,
+                    )
+                )
+        return tuple(delta)
+
+    def reset(self) -> None:
+        """Forget all statistics."""
+        self.stats.clear()
+
+    def schedule(self, items: Sequence[T], rule_of: Callable[[T], str]) -> List[T]:
+        """Return the items ordered by the expected cost of their rules (stable for equal costs)."""
+        zero = RuleStats(rule='')
+        return sorted(items, key=lambda item: self.stats.get(rule_of(item), zero).expected_cost())
+
+    def as_table(self) -> str:
+        """Render the statistics as table with the most expensive rules first."""
+        rows = sorted(self.stats.values(), key=lambda stats: stats.seconds, reverse=True)
+        lines = [f'{"rule":<8}  {"runs":>8}  {"failures":>8}  {"total ms":>10}  {"mean us":>10}']
+        lines.extend(
+            f'{s.rule:<8}  {s.runs:>8}  {s.failures:>8}  {s.seconds * 1e3:>10.3f}  {s.mean_seconds() * 1e6:>10.1f}'
+            for s in rows
+        )
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Metrics()
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
-import re
 from collections.abc import Sequence
 from enum import Enum
 from typing import Annotated, List, Optional, no_type_check
 
 from pydantic import BaseModel, Field, RootModel, field_validator, model_validator
 
+import csaf.purl as purl
+from csaf.cpe import MIN_LENGTH as CPE_MIN_LENGTH
+from csaf.cpe import PATTERN as CPE_PATTERN
 from csaf.definitions import AnyUrl, Products, ReferenceTokenForProductGroupInstance, ReferenceTokenForProductInstance
+from csaf.purl import MIN_LENGTH as PURL_MIN_LENGTH
+from csaf.purl import PATTERN as PURL_PATTERN
 
 
 class FileHash(BaseModel):
@@ -141,14 +145,8 @@ class HelperToIdentifyTheProduct(BaseModel):
                 'The Common Platform Enumeration (CPE) attribute refers to a method for naming platforms external'
                 ' to this specification.'
             ),
-            min_length=5,
-            pattern=(
-                '^(cpe:2\\.3:[aho\\*\\-](:(((\\?*|\\*?)([a-zA-Z0-9\\-\\._]|'
-                '(\\\\[\\\\\\*\\?!"#\\$%&\'\\(\\)\\+,/:;<=>@\\[\\]\\^`\\{\\|\\}~]))+(\\?*|\\*?))|[\\*\\-])){5}'
-                '(:(([a-zA-Z]{2,3}(-([a-zA-Z]{2}|[0-9]{3}))?)|[\\*\\-]))(:(((\\?*|\\*?)([a-zA-Z0-9\\-\\._]|'
-                '(\\\\[\\\\\\*\\?!"#\\$%&\'\\(\\)\\+,/:;<=>@\\[\\]\\^`\\{\\|\\}~]))+(\\?*|\\*?))|[\\*\\-])){4})|'
-                '([c][pP][eE]:/[AHOaho]?(:[A-Za-z0-9\\._\\-~%]*){0,6})$'
-            ),
+            min_length=CPE_MIN_LENGTH,
+            pattern=CPE_PATTERN,
             title='Common Platform Enumeration representation',
         ),
     ] = None
@@ -167,8 +165,7 @@ class HelperToIdentifyTheProduct(BaseModel):
                 'The package URL (purl) attribute refers to a method for reliably identifying and'
                 ' locating software packages external to this specification.'
             ),
-            # min_length=7,
-            # regex='^pkg:[A-Za-z\\.\\-\\+][A-Za-z0-9\\.\\-\\+]*/.+',
+            json_schema_extra={'minLength': PURL_MIN_LENGTH, 'pattern': PURL_PATTERN},  # checked by check_purl
             title='package URL representation',
         ),
     ] = None
@@ -216,13 +213,13 @@ class HelperToIdentifyTheProduct(BaseModel):
             raise ValueError('optional element present but empty')
         return v
 
+    @field_validator('purl', mode='before')
     @classmethod
     @no_type_check
-    @field_validator('purl')
     def check_purl(cls, v):
-        if not v or len(v) < 7:
+        if not v or len(str(v)) < purl.MIN_LENGTH:
             raise ValueError('optional purl element present but too short')
-        if not re.match('^pkg:[A-Za-z\\.\\-\\+][A-Za-z0-9\\.\\-\\+]*/.+', v):
+        if not purl.matches(str(v)):
             raise ValueError('optional purl element present but is no purl (regex does not match)')
         return v
 
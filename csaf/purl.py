@@ -0,0 +1,27 @@
+"""Package URLs (purl) like pkg:pypi/csaf@2023.11.27 (scheme:type/namespace/name@version?qualifiers#subpath).
+
+Validated strings are memoized (the same packages repeat across the products of an advisory and a corpus).
+"""
+
+import re
+from functools import lru_cache
+
+MEMO_SIZE = 1 << 14
+MIN_LENGTH = 7
+PATTERN = r'^pkg:[A-Za-z\.\-\+][A-Za-z0-9\.\-\+]*/.+'
+REGEX = re.compile(PATTERN)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def matches(text: str) -> bool:
+    """Verify the text matches the purl pattern of the CSAF JSON schema."""
+    return len(text) >= MIN_LENGTH and REGEX.match(text) is not None
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def is_valid(text: str) -> bool:
+    """Verify the text is a purl with a name component (an @ in the namespace or name must be percent-encoded)."""
+    if not matches(text):
+        return False
+    path = text.split('#', 1)[0].split('?', 1)[0].split('/', 1)[1].strip('/')
+    return bool(path.rsplit('@', 1)[0].rsplit('/', 1)[-1])
@@ -0,0 +1,125 @@
+"""Registry of the rules (tests of section 6) evaluated against the index of a document.
+
+Every rule is a check function registered together with the metadata of its rule module (ID, TOPIC, and PATHS):
+
+  @register(val_cat_nam, 'invalid category')
+  def _offending_category(index: Index) -> Offenders:
+      ...
+
+The section of the rule ID selects the profile (6.1 mandatory, 6.2 optional, 6.3 informative) and the severity
+of the findings.
+In house rules are discovered from the entry point group csaf.rules (the entry point names a callable accepting
+the registry), e.g. in the pyproject.toml of a plugin distribution:
+
+  [project.entry-points."csaf.rules"]
+  acme = "acme_csaf.rules:register_rules"
+"""
+
+from importlib.metadata import EntryPoint, entry_points
+from types import ModuleType
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import msgspec
+
+from csaf import log
+from csaf.mandatory.index import Index
+from csaf.result import SEVERITIES, rule_id
+
+ENTRY_POINT_GROUP = 'csaf.rules'
+PROFILE_SECTIONS = {'mandatory': (6, 1), 'optional': (6, 2), 'informative': (6, 3)}
+PROFILES = tuple(PROFILE_SECTIONS)
+MANDATORY = ('mandatory',)
+ERROR = SEVERITIES[0]  # The severity of mandatory rule findings (only these fail an advisory)
+
+Offenders = Tuple[str, ...]  # JSON pointers to the offending locations (empty if the rule holds)
+Check = Callable[[Index], Offenders]
+
+
+class Rule(msgspec.Struct, frozen=True):
+    """A check function with the metadata of its rule."""
+
+    rule: str
+    topic: str
+    message: str
+    profile: str
+    severity: str
+    check: Check
+    paths: Tuple[str, ...] = ()
+
+
+def section_profile(identifier: Sequence[int]) -> str:
+    """Return the profile of the rule with the section numbers identifier (like 6.1.1 is mandatory)."""
+    for profile, section in PROFILE_SECTIONS.items():
+        if tuple(identifier[:2]) == section:
+            return profile
+    raise ValueError(f'rule {rule_id(tuple(identifier))} is not a test of section 6.1, 6.2, or 6.3')
+
+
+class Registry:
+    """The rules in order of registration (rules registered again under the same ID replace the earlier ones)."""
+
+    def __init__(self) -> None:
+        self.known: Dict[str, Rule] = {}
+        self.discovered = False
+
+    def add(self, module: ModuleType, message: str, check: Check) -> Rule:
+        """Register the check function of the rule module (with ID, TOPIC, and optional PATHS)."""
+        profile = section_profile(module.ID)
+        rule = Rule(
+            rule=rule_id(module.ID),
+            topic=module.TOPIC,
+            message=message,
+            profile=profile,
+            severity=SEVERITIES[PROFILES.index(profile)],
+            check=check,
+            paths=tuple(getattr(module, 'PATHS', ())),
+        )
+        self.known[rule.rule] = rule
+        return rule
+
+    def discover(self) -> None:
+        """Let the plugins of the entry point group register their rules (once, failing plugins are skipped)."""
+        if self.discovered:
+            return
+        self.discovered = True
+        for entry_point in _entry_points():
+            try:
+                entry_point.load()(self)
+            except Exception as err:  # noqa
+                log.warning(f'skipping rule plugin {entry_point.name} ({err})')
+
+    def rules(self, profiles: Iterable[str] = MANDATORY) -> Tuple[Rule, ...]:
+        """Return the rules of the profiles (after discovering the plugins) in order of registration."""
+        self.discover()
+        selected = set(profiles)
+        return tuple(rule for rule in self.known.values() if rule.profile in selected)
+
+
+def _entry_points() -> List[EntryPoint]:
+    """Return the entry points of the rule plugins installed."""
+    try:
+        return list(entry_points(group=ENTRY_POINT_GROUP))  # type: ignore[call-arg,unused-ignore]
+    except TypeError:  # python 3.9
+        return list(entry_points().get(ENTRY_POINT_GROUP, ()))  # type: ignore[attr-defined,unused-ignore]
+
+
+REGISTRY = Registry()
+
+
+def register(module: ModuleType, message: str) -> Callable[[Check], Check]:
+    """Decorate a check function to register it for the rule module in the registry."""
+
+    def decorate(check: Check) -> Check:
+        REGISTRY.add(module, message, check)
+        return check
+
+    return decorate
+
+
+def parse_profiles(text: str) -> Tuple[str, ...]:
+    """Return the profiles named in the comma separated text (raises ValueError for unknown names)."""
+    profiles = tuple(dict.fromkeys(name.strip().lower() for name in text.split(',') if name.strip()))
+    unknown = [name for name in profiles if name not in PROFILE_SECTIONS]
+    if unknown or not profiles:
+        raise ValueError(f'unknown rule profiles ({", ".join(unknown) or "none given"})')
+    return profiles
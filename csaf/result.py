@@ -0,0 +1,101 @@
+"""Structured results of the verification and validation of advisories."""
+
+from typing import Dict, List, Sequence, Tuple
+
+import msgspec
+
+import csaf
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_VERSION = '2.1.0'
+INFORMATION_URI = 'https://codes.dilettant.life/docs/csaf'
+GENERAL_RULE = 'general'
+GENERAL_TOPIC = 'Well-formed CSAF document'
+SEVERITIES = ('error', 'warning', 'note')  # The SARIF levels of mandatory, optional, and informative tests
+
+
+class Finding(msgspec.Struct, frozen=True):
+    """A failing rule with the JSON pointers to the offending locations in the document."""
+
+    rule: str
+    topic: str
+    message: str
+    pointers: Tuple[str, ...] = ()
+    severity: str = 'error'
+
+
+class Result(msgspec.Struct):
+    """The outcome for one advisory with the findings of all failing rules."""
+
+    path: str
+    code: int
+    message: str
+    findings: Tuple[Finding, ...] = ()
+
+
+def rule_id(identifier: Tuple[int, ...]) -> str:
+    """Render the section numbers of a rule as dotted text like 6.1.1."""
+    return '.'.join(str(part) for part in identifier)
+
+
+def as_table(results: Sequence[Result], failures_only: bool = False) -> Tuple[int, str]:
+    """Render the per file results as table and return the worst code together with the text."""
+    rows = [result for result in results if result.code or not failures_only]
+    width = max((len(result.path) for result in rows), default=4)
+    lines = [f'{"path":<{width}}  code  message'] if rows else []
+    lines.extend(f'{r.path:<{width}}  {r.code:>4}  {r.message if r.message else "OK"}' for r in rows)
+    failed = sum(1 for result in results if result.code)
+    lines.append(f'validated {len(results)} advisories: {len(results) - failed} passed, {failed} failed')
+    return worst(results), '\n'.join(lines) + '\n'
+
+
+def as_json(results: Sequence[Result]) -> str:
+    """Render the results as indented JSON text."""
+    return msgspec.json.format(msgspec.json.encode(results), indent=2).decode() + '\n'
+
+
+def as_sarif(results: Sequence[Result]) -> str:
+    """Render the results as Static Analysis Results Interchange Format (SARIF) log."""
+    rules: Dict[str, str] = {}
+    sarif_results: List[Dict[str, object]] = []
+    for result in results:
+        artifact = {'artifactLocation': {'uri': result.path}}
+        findings = result.findings
+        if result.code and not findings:
+            findings = (Finding(rule=GENERAL_RULE, topic=GENERAL_TOPIC, message=result.message),)
+        for finding in findings:
+            rules.setdefault(finding.rule, finding.topic)
+            location: Dict[str, object] = {'physicalLocation': artifact}
+            if finding.pointers:
+                location['logicalLocations'] = [{'fullyQualifiedName': pointer} for pointer in finding.pointers]
+            sarif_results.append(
+                {
+                    'ruleId': finding.rule,
+                    'level': finding.severity,
+                    'message': {'text': finding.message},
+                    'locations': [location],
+                }
+            )
+    log = {
+        '$schema': SARIF_SCHEMA,
+        'version': SARIF_VERSION,
+        'runs': [
+            {
+                'tool': {
+                    'driver': {
+                        'name': csaf.APP_ALIAS,
+                        'version': csaf.__version__,
+                        'informationUri': INFORMATION_URI,
+                        'rules': [{'id': rule, 'shortDescription': {'text': topic}} for rule, topic in rules.items()],
+                    }
+                },
+                'results': sarif_results,
+            }
+        ],
+    }
+    return msgspec.json.format(msgspec.json.encode(log), indent=2).decode() + '\n'
+
+
+def worst(results: Sequence[Result]) -> int:
+    """Return the highest code of all results (zero if all passed or none given)."""
+    return max((result.code for result in results), default=0)
@@ -0,0 +1,68 @@
+"""Validation against the bundled CSAF 2.0 JSON schema (resolving the CVSS schemas locally).
+
+Building the registry and the validator is far more expensive than validating a typical document,
+so both are built once per process and shared by all validations.
+The registry only knows the schemas in schema_proxy and never retrieves remote references.
+"""
+
+import functools
+import json
+import pathlib
+from typing import Any, Dict, List, Tuple
+
+from jsonschema import Draft202012Validator  # type: ignore
+from referencing import Registry, Resource
+
+from csaf.result import Finding
+
+SCHEMA_PROXY = pathlib.Path(__file__).parent / 'schema_proxy'
+CSAF_SCHEMA_NAME = 'csaf_2_0.json'
+CSAF_SCHEMA_ID = 'https://docs.oasis-open.org/csaf/csaf/v2.0/csaf_json_schema.json'
+CVSS_SCHEMA_IDS = {
+    'cvss-v2.0.json': 'https://www.first.org/cvss/cvss-v2.0.json',
+    'cvss-v3.0.json': 'https://www.first.org/cvss/cvss-v3.0.json',
+    'cvss-v3.1.json': 'https://www.first.org/cvss/cvss-v3.1.json',
+}
+SCHEMA_RULE = 'schema'
+SCHEMA_TOPIC = 'Conformance with the CSAF JSON schema'
+
+
+def load(name: str) -> Dict[str, Any]:
+    """Load a bundled schema by file name."""
+    return json.loads((SCHEMA_PROXY / name).read_bytes())  # type: ignore[no-any-return]
+
+
+@functools.lru_cache(maxsize=1)
+def registry() -> Registry[Any]:
+    """Return the registry of the bundled schemas (built once per process)."""
+    resources: List[Tuple[str, Resource[Any]]] = [
+        (uri, Resource.from_contents(load(name))) for name, uri in CVSS_SCHEMA_IDS.items()
+    ]
+    resources.append((CSAF_SCHEMA_ID, Resource.from_contents(load(CSAF_SCHEMA_NAME))))
+    return Registry().with_resources(resources)  # without a retrieve function unknown references fail
+
+
+@functools.lru_cache(maxsize=1)
+def validator() -> Draft202012Validator:
+    """Return the validator for CSAF 2.0 documents (built once per process)."""
+    schema = registry().contents(CSAF_SCHEMA_ID)
+    return Draft202012Validator(schema, registry=registry())
+
+
+def pointer(path: Any) -> str:
+    """Render the path of a validation error as JSON pointer (RFC 6901)."""
+    return ''.join('/' + str(part).replace('~', '~0').replace('/', '~1') for part in path)
+
+
+def order(path: Any) -> Tuple[Tuple[bool, Any], ...]:
+    """Return the sort key of the path of a validation error (array indices compare as numbers, /2 before /10)."""
+    return tuple((isinstance(part, str), part) for part in path)
+
+
+def validate(document: Any) -> Tuple[Finding, ...]:
+    """Validate the document against the schema and return one finding per violation in document order."""
+    errors = sorted(validator().iter_errors(document), key=lambda error: order(error.absolute_path))
+    return tuple(
+        Finding(rule=SCHEMA_RULE, topic=SCHEMA_TOPIC, message=error.message, pointers=(pointer(error.absolute_path),))
+        for error in errors
+    )
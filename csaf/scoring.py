@@ -0,0 +1,405 @@
+"""Table driven parsing and scoring of CVSS v2.0, v3.0, and v3.1 vectors (the computations of the specifications).
+
+A vector is parsed into its version and one small integer code per metric of that version (the position of the
+metric value in the table of the metric), e.g.:
+
+  parse('CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H') == ('3.1', (0, 0, 0, 0, 1, 0, 0, 0, 0, ...))
+
+Metrics not given in the vector have code 0 (not defined) and modified metrics fall back to their base metrics.
+The base score of every combination of base metric codes is computed once per version into a dense lookup table,
+the temporal and environmental scores use the weight tables of the metrics.
+Batches are scored column wise (one array of codes per metric) and every distinct row is scored only once.
+
+The same few hundred vectors recur across the advisories of a corpus, so lookup interns every vector string
+process wide (bounded LRU) with the schema pattern it matches, the parsed metric codes, and the scores.
+The hits and misses are counted by lookup.cache_info().
+"""
+
+import math
+import re
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import msgspec
+
+V2 = '2.0'
+V3_PREFIX = 'CVSS:'
+VERSIONS = (V2, '3.0', '3.1')
+
+MEMO_SIZE = 1 << 12
+PATTERNS = {  # vectorString patterns of the CSAF JSON schema per version
+    V2: (
+        r'^((AV:[NAL]|AC:[LMH]|Au:[MSN]|[CIA]:[NPC]|E:(U|POC|F|H|ND)|RL:(OF|TF|W|U|ND)|RC:(UC|UR|C|ND)'
+        r'|CDP:(N|L|LM|MH|H|ND)|TD:(N|L|M|H|ND)|[CIA]R:(L|M|H|ND))/)*(AV:[NAL]|AC:[LMH]|Au:[MSN]|[CIA]:[NPC]'
+        r'|E:(U|POC|F|H|ND)|RL:(OF|TF|W|U|ND)|RC:(UC|UR|C|ND)|CDP:(N|L|LM|MH|H|ND)|TD:(N|L|M|H|ND)|[CIA]R:(L|M|H|ND))$'
+    ),
+    '3.0': (
+        r'^CVSS:3[.]0/((AV:[NALP]|AC:[LH]|PR:[UNLH]|UI:[NR]|S:[UC]|[CIA]:[NLH]|E:[XUPFH]|RL:[XOTWU]|RC:[XURC]'
+        r'|[CIA]R:[XLMH]|MAV:[XNALP]|MAC:[XLH]|MPR:[XUNLH]|MUI:[XNR]|MS:[XUC]|M[CIA]:[XNLH])/)*(AV:[NALP]|AC:[LH]'
+        r'|PR:[UNLH]|UI:[NR]|S:[UC]|[CIA]:[NLH]|E:[XUPFH]|RL:[XOTWU]|RC:[XURC]|[CIA]R:[XLMH]|MAV:[XNALP]|MAC:[XLH]'
+        r'|MPR:[XUNLH]|MUI:[XNR]|MS:[XUC]|M[CIA]:[XNLH])$'
+    ),
+    '3.1': (
+        r'^CVSS:3[.]1/((AV:[NALP]|AC:[LH]|PR:[NLH]|UI:[NR]|S:[UC]|[CIA]:[NLH]|E:[XUPFH]|RL:[XOTWU]|RC:[XURC]'
+        r'|[CIA]R:[XLMH]|MAV:[XNALP]|MAC:[XLH]|MPR:[XNLH]|MUI:[XNR]|MS:[XUC]|M[CIA]:[XNLH])/)*(AV:[NALP]|AC:[LH]'
+        r'|PR:[NLH]|UI:[NR]|S:[UC]|[CIA]:[NLH]|E:[XUPFH]|RL:[XOTWU]|RC:[XURC]|[CIA]R:[XLMH]|MAV:[XNALP]|MAC:[XLH]'
+        r'|MPR:[XNLH]|MUI:[XNR]|MS:[XUC]|M[CIA]:[XNLH])$'
+    ),
+}
+REGEXES = {version: re.compile(pattern) for version, pattern in PATTERNS.items()}
+
+Codes = Tuple[int, ...]
+Parsed = Tuple[str, Codes]  # version and the code per metric of the version
+
+
+class Metric(msgspec.Struct, frozen=True):
+    """A metric with its vector values, the matching property values, and the weights (all in code order)."""
+
+    key: str
+    name: str
+    values: Tuple[str, ...]
+    names: Tuple[str, ...]
+    weights: Tuple[float, ...] = ()
+
+
+class Scores(msgspec.Struct, frozen=True):
+    """The scores computed from a vector."""
+
+    base: float
+    temporal: float
+    environmental: float
+
+
+class Vector(msgspec.Struct, frozen=True):
+    """A vector string interned with the version of the schema pattern it matches, its metric codes, and scores."""
+
+    matches: str = ''  # empty if no schema pattern matches
+    parsed: Optional[Parsed] = None  # None if the vector is invalid
+    scores: Optional[Scores] = None
+
+
+def _modified(metric: Metric) -> Metric:
+    """Return the modified (environmental) variant of the base metric (code 0 falls back to the base metric)."""
+    return Metric(
+        key=f'M{metric.key}',
+        name=f'modified{metric.name[0].upper()}{metric.name[1:]}',
+        values=('X',) + metric.values,
+        names=('NOT_DEFINED',) + metric.names,
+    )
+
+
+CIA_V2 = (('N', 'P', 'C'), ('NONE', 'PARTIAL', 'COMPLETE'), (0.0, 0.275, 0.660))
+REQUIREMENT_V2 = (('ND', 'L', 'M', 'H'), ('NOT_DEFINED', 'LOW', 'MEDIUM', 'HIGH'), (1.0, 0.5, 1.0, 1.51))
+METRICS_V2 = (
+    Metric('AV', 'accessVector', ('L', 'A', 'N'), ('LOCAL', 'ADJACENT_NETWORK', 'NETWORK'), (0.395, 0.646, 1.0)),
+    Metric('AC', 'accessComplexity', ('H', 'M', 'L'), ('HIGH', 'MEDIUM', 'LOW'), (0.35, 0.61, 0.71)),
+    Metric('Au', 'authentication', ('M', 'S', 'N'), ('MULTIPLE', 'SINGLE', 'NONE'), (0.45, 0.56, 0.704)),
+    Metric('C', 'confidentialityImpact', *CIA_V2),
+    Metric('I', 'integrityImpact', *CIA_V2),
+    Metric('A', 'availabilityImpact', *CIA_V2),
+    Metric(
+        'E',
+        'exploitability',
+        ('ND', 'U', 'POC', 'F', 'H'),
+        ('NOT_DEFINED', 'UNPROVEN', 'PROOF_OF_CONCEPT', 'FUNCTIONAL', 'HIGH'),
+        (1.0, 0.85, 0.9, 0.95, 1.0),
+    ),
+    Metric(
+        'RL',
+        'remediationLevel',
+        ('ND', 'OF', 'TF', 'W', 'U'),
+        ('NOT_DEFINED', 'OFFICIAL_FIX', 'TEMPORARY_FIX', 'WORKAROUND', 'UNAVAILABLE'),
+        (1.0, 0.87, 0.9, 0.95, 1.0),
+    ),
+    Metric(
+        'RC',
+        'reportConfidence',
+        ('ND', 'UC', 'UR', 'C'),
+        ('NOT_DEFINED', 'UNCONFIRMED', 'UNCORROBORATED', 'CONFIRMED'),
+        (1.0, 0.9, 0.95, 1.0),
+    ),
+    Metric(
+        'CDP',
+        'collateralDamagePotential',
+        ('ND', 'N', 'L', 'LM', 'MH', 'H'),
+        ('NOT_DEFINED', 'NONE', 'LOW', 'LOW_MEDIUM', 'MEDIUM_HIGH', 'HIGH'),
+        (0.0, 0.0, 0.1, 0.3, 0.4, 0.5),
+    ),
+    Metric(
+        'TD',
+        'targetDistribution',
+        ('ND', 'N', 'L', 'M', 'H'),
+        ('NOT_DEFINED', 'NONE', 'LOW', 'MEDIUM', 'HIGH'),
+        (1.0, 0.0, 0.25, 0.75, 1.0),
+    ),
+    Metric('CR', 'confidentialityRequirement', *REQUIREMENT_V2),
+    Metric('IR', 'integrityRequirement', *REQUIREMENT_V2),
+    Metric('AR', 'availabilityRequirement', *REQUIREMENT_V2),
+)
+
+CIA_V3 = (('H', 'L', 'N'), ('HIGH', 'LOW', 'NONE'), (0.56, 0.22, 0.0))
+REQUIREMENT_V3 = (('X', 'H', 'M', 'L'), ('NOT_DEFINED', 'HIGH', 'MEDIUM', 'LOW'), (1.0, 1.5, 1.0, 0.5))
+BASE_V3 = (
+    Metric(
+        'AV',
+        'attackVector',
+        ('N', 'A', 'L', 'P'),
+        ('NETWORK', 'ADJACENT_NETWORK', 'LOCAL', 'PHYSICAL'),
+        (0.85, 0.62, 0.55, 0.2),
+    ),
+    Metric('AC', 'attackComplexity', ('L', 'H'), ('LOW', 'HIGH'), (0.77, 0.44)),
+    Metric('PR', 'privilegesRequired', ('N', 'L', 'H'), ('NONE', 'LOW', 'HIGH'), (0.85, 0.62, 0.27)),
+    Metric('UI', 'userInteraction', ('N', 'R'), ('NONE', 'REQUIRED'), (0.85, 0.62)),
+    Metric('S', 'scope', ('U', 'C'), ('UNCHANGED', 'CHANGED'), (0.0, 1.0)),
+    Metric('C', 'confidentialityImpact', *CIA_V3),
+    Metric('I', 'integrityImpact', *CIA_V3),
+    Metric('A', 'availabilityImpact', *CIA_V3),
+)
+METRICS_V3 = (
+    BASE_V3
+    + (
+        Metric(
+            'E',
+            'exploitCodeMaturity',
+            ('X', 'H', 'F', 'P', 'U'),
+            ('NOT_DEFINED', 'HIGH', 'FUNCTIONAL', 'PROOF_OF_CONCEPT', 'UNPROVEN'),
+            (1.0, 1.0, 0.97, 0.94, 0.91),
+        ),
+        Metric(
+            'RL',
+            'remediationLevel',
+            ('X', 'U', 'W', 'T', 'O'),
+            ('NOT_DEFINED', 'UNAVAILABLE', 'WORKAROUND', 'TEMPORARY_FIX', 'OFFICIAL_FIX'),
+            (1.0, 1.0, 0.97, 0.96, 0.95),
+        ),
+        Metric(
+            'RC',
+            'reportConfidence',
+            ('X', 'C', 'R', 'U'),
+            ('NOT_DEFINED', 'CONFIRMED', 'REASONABLE', 'UNKNOWN'),
+            (1.0, 1.0, 0.96, 0.92),
+        ),
+        Metric('CR', 'confidentialityRequirement', *REQUIREMENT_V3),
+        Metric('IR', 'integrityRequirement', *REQUIREMENT_V3),
+        Metric('AR', 'availabilityRequirement', *REQUIREMENT_V3),
+    )
+    + tuple(_modified(metric) for metric in BASE_V3)
+)
+
+PR_CHANGED_V3 = (0.85, 0.68, 0.5)  # weights of privileges required if the scope changed
+
+METRICS = {V2: METRICS_V2, '3.0': METRICS_V3, '3.1': METRICS_V3}
+BASE_COUNT = {V2: 6, '3.0': len(BASE_V3), '3.1': len(BASE_V3)}  # the leading metrics required in every vector
+POSITIONS = {version: {metric.key: pos for pos, metric in enumerate(metrics)} for version, metrics in METRICS.items()}
+
+SEVERITIES = ((0.0, 'NONE'), (3.9, 'LOW'), (6.9, 'MEDIUM'), (8.9, 'HIGH'), (10.0, 'CRITICAL'))  # upper bounds
+
+
+def parse(vector: str) -> Parsed:
+    """Return the version and the metric codes of the vector (raises ValueError if the vector is invalid)."""
+    if vector.startswith(V3_PREFIX):
+        prefix, _, body = vector.partition('/')
+        version = prefix[len(V3_PREFIX) :]
+        if version == V2 or version not in METRICS:
+            raise ValueError(f'unknown CVSS version ({prefix})')
+    else:
+        version, body = V2, vector
+    metrics, positions = METRICS[version], POSITIONS[version]
+    codes = [-1] * len(metrics)
+    for part in body.split('/'):
+        key, colon, value = part.partition(':')
+        pos = positions.get(key, -1)
+        if pos < 0 or not colon:
+            raise ValueError(f'unknown CVSS {version} metric ({part})')
+        if codes[pos] >= 0:
+            raise ValueError(f'repeated CVSS {version} metric ({key})')
+        if value not in metrics[pos].values:
+            raise ValueError(f'invalid value of CVSS {version} metric ({part})')
+        codes[pos] = metrics[pos].values.index(value)
+    missing = [metric.key for metric, code in zip(metrics, codes[: BASE_COUNT[version]]) if code < 0]
+    if missing:
+        raise ValueError(f'missing CVSS {version} base metrics ({", ".join(missing)})')
+    return version, tuple(max(code, 0) for code in codes)
+
+
+def properties(parsed: Parsed) -> Dict[str, str]:
+    """Return the properties of a CVSS object expanded from the parsed vector (including the version)."""
+    version, codes = parsed
+    expanded = {'version': version}
+    expanded.update((metric.name, metric.names[code]) for metric, code in zip(METRICS[version], codes))
+    return expanded
+
+
+def severity(score: float) -> str:
+    """Return the qualitative severity rating of a CVSS v3 score."""
+    for upper, rating in SEVERITIES:
+        if score <= upper:
+            return rating
+    return SEVERITIES[-1][1]
+
+
+def _round_v2(value: float) -> float:
+    """Round to one decimal (half up) as CVSS v2 requires."""
+    return math.floor(value * 10 + 0.5) / 10
+
+
+def _roundup_v30(value: float) -> float:
+    """Return the smallest number with one decimal not less than the value (CVSS v3.0)."""
+    return math.ceil(value * 10) / 10
+
+
+def _roundup_v31(value: float) -> float:
+    """Return the smallest number with one decimal not less than the value avoiding floating point artefacts."""
+    integral = round(value * 100000)
+    if integral % 10000 == 0:
+        return integral / 100000
+    return (math.floor(integral / 10000) + 1) / 10
+
+
+def _weights(metrics: Sequence[Metric], codes: Codes) -> List[float]:
+    """Return the weight of every base, temporal, and requirement metric (modified metrics have none)."""
+    return [metric.weights[code] if metric.weights else 0.0 for metric, code in zip(metrics, codes)]
+
+
+def _v2_base(av: float, ac: float, au: float, impact: float) -> float:
+    """Return the CVSS v2 base equation for the impact."""
+    exploitability = 20 * av * ac * au
+    return _round_v2((0.6 * impact + 0.4 * exploitability - 1.5) * (0.0 if impact == 0 else 1.176))
+
+
+def _base_v2(codes: Codes) -> float:
+    """Compute the CVSS v2 base score."""
+    av, ac, au, c, i, a = _weights(METRICS_V2, codes)[:6]
+    return _v2_base(av, ac, au, 10.41 * (1 - (1 - c) * (1 - i) * (1 - a)))
+
+
+def _v3_subscores(
+    version: str, av: float, ac: float, pr: int, ui: float, changed: bool, iss: float, modified: bool = False
+) -> Tuple[float, float]:
+    """Return the impact and exploitability sub scores for the impact sub score iss (or their modified variants)."""
+    if not changed:
+        impact = 6.42 * iss
+    elif modified and version == '3.1':
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss * 0.9731 - 0.02) ** 13
+    else:
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+    privileges = (PR_CHANGED_V3 if changed else BASE_V3[2].weights)[pr]
+    return impact, 8.22 * av * ac * privileges * ui
+
+
+def _base_v3(version: str, codes: Codes) -> float:
+    """Compute the CVSS v3 base score."""
+    av, ac, _, ui, _, c, i, a = _weights(BASE_V3, codes)
+    changed = codes[4] == 1
+    impact, exploitability = _v3_subscores(version, av, ac, codes[2], ui, changed, 1 - (1 - c) * (1 - i) * (1 - a))
+    if impact <= 0:
+        return 0.0
+    roundup = _roundup_v30 if version == '3.0' else _roundup_v31
+    return roundup(min((1.08 if changed else 1.0) * (impact + exploitability), 10))
+
+
+@lru_cache(maxsize=None)
+def base_table(version: str) -> 'array[float]':
+    """Return the base scores of all combinations of base metric codes (indexed like the digits of a number)."""
+    metrics = METRICS[version][: BASE_COUNT[version]]
+    table = array('d')
+    combinations: List[Codes] = [()]
+    for metric in metrics:
+        combinations = [codes + (code,) for codes in combinations for code in range(len(metric.values))]
+    for codes in combinations:
+        table.append(_base_v2(codes) if version == V2 else _base_v3(version, codes))
+    return table
+
+
+def _base_offset(version: str, codes: Codes) -> int:
+    """Return the position of the base metric codes in the base table."""
+    offset = 0
+    for metric, code in zip(METRICS[version][: BASE_COUNT[version]], codes):
+        offset = offset * len(metric.values) + code
+    return offset
+
+
+def _score_v2(codes: Codes) -> Scores:
+    """Compute the CVSS v2 scores."""
+    av, ac, au, c, i, a, e, rl, rc, cdp, td, cr, ir, ar = _weights(METRICS_V2, codes)
+    base = base_table(V2)[_base_offset(V2, codes)]
+    temporal = _round_v2(base * e * rl * rc)
+    adjusted_impact = min(10.0, 10.41 * (1 - (1 - c * cr) * (1 - i * ir) * (1 - a * ar)))
+    adjusted_temporal = _round_v2(_v2_base(av, ac, au, adjusted_impact) * e * rl * rc)
+    environmental = _round_v2((adjusted_temporal + (10 - adjusted_temporal) * cdp) * td)
+    return Scores(base=base, temporal=temporal, environmental=environmental)
+
+
+def _score_v3(version: str, codes: Codes) -> Scores:
+    """Compute the CVSS v3 scores."""
+    weights = _weights(METRICS_V3, codes)
+    e, rl, rc, cr, ir, ar = weights[8:14]
+    roundup = _roundup_v30 if version == '3.0' else _roundup_v31
+    base = base_table(version)[_base_offset(version, codes)]
+    temporal = roundup(base * e * rl * rc)
+
+    effective = tuple(code - 1 if code else fallback for fallback, code in zip(codes, codes[14:]))  # modified else base
+    av, ac, _, ui, _, c, i, a = _weights(BASE_V3, effective)
+    changed = effective[4] == 1
+    miss = min(1 - (1 - cr * c) * (1 - ir * i) * (1 - ar * a), 0.915)
+    impact, exploitability = _v3_subscores(version, av, ac, effective[2], ui, changed, miss, modified=True)
+    if impact <= 0:
+        environmental = 0.0
+    else:
+        environmental = roundup(roundup(min((1.08 if changed else 1.0) * (impact + exploitability), 10)) * e * rl * rc)
+    return Scores(base=base, temporal=temporal, environmental=environmental)
+
+
+def compute(parsed: Parsed) -> Scores:
+    """Return the base, temporal, and environmental scores of the parsed vector."""
+    version, codes = parsed
+    return _score_v2(codes) if version == V2 else _score_v3(version, codes)
+
+
+def columns(version: str, rows: Sequence[Codes]) -> List['array[int]']:
+    """Return the codes of the rows (parsed vectors of the version) as one array per metric."""
+    return [array('B', (row[pos] for row in rows)) for pos in range(len(METRICS[version]))]
+
+
+def score_columns(version: str, codes: Sequence['array[int]']) -> Tuple['array[float]', 'array[float]', 'array[float]']:
+    """Return the base, temporal, and environmental scores of the rows of the metric code columns.
+
+    Every distinct row is computed once (the same vectors recur throughout a corpus of advisories).
+    """
+    base, temporal, environmental = array('d'), array('d'), array('d')
+    seen: Dict[Codes, Scores] = {}
+    for row in zip(*codes):
+        scores = seen.get(row)
+        if scores is None:
+            scores = seen[row] = compute((version, row))
+        base.append(scores.base)
+        temporal.append(scores.temporal)
+        environmental.append(scores.environmental)
+    return base, temporal, environmental
+
+
+def compute_many(parsed: Sequence[Parsed]) -> List[Scores]:
+    """Return the scores of the parsed vectors (in the given order, computed column wise per version)."""
+    scored: List[Scores] = [Scores(0.0, 0.0, 0.0)] * len(parsed)
+    for version in VERSIONS:
+        where = [pos for pos, (of, _) in enumerate(parsed) if of == version]
+        if not where:
+            continue
+        base, temporal, environmental = score_columns(version, columns(version, [parsed[pos][1] for pos in where]))
+        for at, pos in enumerate(where):
+            scored[pos] = Scores(base=base[at], temporal=temporal[at], environmental=environmental[at])
+    return scored
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def lookup(text: str) -> Vector:
+    """Return the interned vector of the text (parsed and scored once per process while recurring)."""
+    version = text[len(V3_PREFIX) : len(V3_PREFIX) + 3] if text.startswith(V3_PREFIX) else V2
+    regex = REGEXES.get(version)
+    matches = version if regex is not None and regex.match(text) else ''
+    try:
+        parsed = parse(text)
+    except ValueError:
+        return Vector(matches=matches)
+    return Vector(matches=matches, parsed=parsed, scores=compute(parsed))
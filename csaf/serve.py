@@ -0,0 +1,247 @@
+"""Long running validation service answering POST /validate over HTTP and Unix domain sockets.
+
+The service keeps worker processes with the models, schemas, and compiled expressions loaded
+so that a request only pays for the validation of the submitted advisory.
+
+Requests:
+
+  POST /validate?engine=msgspec&schema=1&rules=mandatory,optional  (body is the advisory, parameters are optional)
+  GET /health
+
+The response to a validation request is the result as JSON (status 200 also for failing advisories).
+Requests the workers fail to answer (like after a worker crashed) get status 500 with a JSON error body.
+"""
+
+import asyncio
+import os
+import signal
+import stat
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import msgspec
+
+import csaf
+from csaf import log
+from csaf.registry import parse_profiles
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8455
+MAX_BODY_BYTES = 64 << 20
+MAX_HEADER_LINES = 100
+READ_TIMEOUT_SECONDS = 30.0
+SUBMISSION_NAME = 'submission.json'
+TRUTHY = ('1', 'true', 'yes', 'on')
+
+Response = Tuple[HTTPStatus, bytes]
+
+
+class BadRequest(Exception):
+    """The request can not be answered (carries the status to respond with)."""
+
+    def __init__(self, status: HTTPStatus, detail: str = '') -> None:
+        super().__init__(detail or status.phrase)
+        self.status = status
+
+
+def warm_up() -> None:
+    """Load the models, rules, schema validator, and decoders in a worker process once."""
+    import csaf.csaf  # noqa
+    import csaf.schema as conformance
+    import csaf.stream  # noqa
+    import csaf.structs  # noqa
+
+    conformance.validator()
+
+
+def validate_submission(
+    data: bytes,
+    engine: str = '',
+    schema: bool = False,
+    name: str = SUBMISSION_NAME,
+    profiles: Tuple[str, ...] = ('mandatory',),
+) -> bytes:
+    """Validate the advisory data and return the result as JSON (runs in the worker processes)."""
+    from csaf.csaf import assess_buffer
+
+    return msgspec.json.encode(assess_buffer(name, data, engine, schema, profiles=profiles))
+
+
+def error_body(status: HTTPStatus, detail: str) -> bytes:
+    """Return the JSON body of an error response."""
+    return msgspec.json.encode({'status': status.value, 'error': detail})
+
+
+async def read_chunked(reader: asyncio.StreamReader) -> bytes:
+    """Read a body sent with chunked transfer encoding (chunk extensions and trailers are ignored)."""
+    chunks = []
+    size = 0
+    while True:
+        try:
+            length = int((await reader.readline()).split(b';', 1)[0].strip(), 16)
+        except ValueError:
+            raise BadRequest(HTTPStatus.BAD_REQUEST, 'invalid chunk size')
+        if length < 0:
+            raise BadRequest(HTTPStatus.BAD_REQUEST, 'invalid chunk size')
+        size += length
+        if size > MAX_BODY_BYTES:
+            raise BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f'advisory exceeds {MAX_BODY_BYTES} bytes')
+        if not length:
+            break
+        chunks.append(await reader.readexactly(length))
+        if await reader.readexactly(2) != b'\r\n':
+            raise BadRequest(HTTPStatus.BAD_REQUEST, 'malformed chunk')
+    for _ in range(MAX_HEADER_LINES):
+        if not (await reader.readline()).rstrip(b'\r\n'):
+            return b''.join(chunks)
+    raise BadRequest(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    """Read method, target, headers (lower case names), and body of one request."""
+    request_line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+    parts = request_line.split()
+    if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+        raise BadRequest(HTTPStatus.BAD_REQUEST, 'malformed request line')
+    method, target, _ = parts
+    headers: Dict[str, str] = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise BadRequest(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+    encoding = headers.get('transfer-encoding', '').lower()
+    if encoding:
+        if encoding != 'chunked':
+            raise BadRequest(HTTPStatus.NOT_IMPLEMENTED, f'unsupported transfer encoding ({encoding})')
+        return method, target, headers, await read_chunked(reader)
+    try:
+        length = int(headers.get('content-length', '0'))
+    except ValueError:
+        raise BadRequest(HTTPStatus.BAD_REQUEST, 'invalid content length')
+    if length < 0:
+        raise BadRequest(HTTPStatus.BAD_REQUEST, 'invalid content length')
+    if length > MAX_BODY_BYTES:
+        raise BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f'advisory exceeds {MAX_BODY_BYTES} bytes')
+    body = await reader.readexactly(length) if length else b''
+    return method, target, headers, body
+
+
+class Service:
+    """Dispatch requests to the validation worker pool (replaced by a fresh one from factory if it breaks)."""
+
+    def __init__(self, executor: Executor, factory: Optional[Callable[[], Executor]] = None) -> None:
+        self.executor = executor
+        self.factory = factory
+
+    async def respond(self, method: str, target: str, body: bytes) -> Response:
+        """Answer one request."""
+        url = urlsplit(target)
+        if url.path == '/health':
+            if method != 'GET':
+                raise BadRequest(HTTPStatus.METHOD_NOT_ALLOWED)
+            return HTTPStatus.OK, msgspec.json.encode({'status': 'ok', 'version': csaf.__version__})
+        if url.path != '/validate':
+            raise BadRequest(HTTPStatus.NOT_FOUND)
+        if method != 'POST':
+            raise BadRequest(HTTPStatus.METHOD_NOT_ALLOWED)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        engine = query.get('engine', '')
+        if engine not in ('', 'msgspec', 'pydantic'):
+            raise BadRequest(HTTPStatus.BAD_REQUEST, f'unknown engine ({engine})')
+        schema = query.get('schema', '').lower() in TRUTHY
+        name = query.get('name', SUBMISSION_NAME)
+        try:
+            profiles = parse_profiles(query.get('rules', 'mandatory'))
+        except ValueError as err:
+            raise BadRequest(HTTPStatus.BAD_REQUEST, str(err))
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            result = await loop.run_in_executor(executor, validate_submission, body, engine, schema, name, profiles)
+        except BrokenProcessPool:
+            if self.factory is not None and self.executor is executor:
+                log.error('validation worker pool broken - replacing it')
+                executor.shutdown(wait=False)
+                self.executor = self.factory()
+            raise
+        return HTTPStatus.OK, result
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection (one request per connection)."""
+        try:
+            try:
+                method, target, _, body = await asyncio.wait_for(read_request(reader), READ_TIMEOUT_SECONDS)
+                status, payload = await self.respond(method, target, body)
+            except BadRequest as err:
+                status, payload = err.status, error_body(err.status, str(err))
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                status = HTTPStatus.BAD_REQUEST
+                payload = error_body(status, 'incomplete request')
+            except Exception as err:  # noqa (like a broken worker pool or a failing validation)
+                log.error(f'request failed with {type(err).__name__}: {err}')
+                status = HTTPStatus.INTERNAL_SERVER_ERROR
+                payload = error_body(status, 'validation failed')
+            head = (
+                f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                'Content-Type: application/json\r\n'
+                f'Content-Length: {len(payload)}\r\n'
+                'Connection: close\r\n\r\n'
+            )
+            writer.write(head.encode('latin-1') + payload)
+            await writer.drain()
+        except ConnectionError:
+            log.warning('client went away before the response was written')
+        finally:
+            writer.close()
+
+
+async def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: str = '',
+    jobs: int = 1,
+    started: Optional['asyncio.Future[Tuple[asyncio.AbstractServer, ...]]'] = None,
+) -> None:
+    """Serve validation requests on the TCP address and (if given) the Unix domain socket until cancelled."""
+    workers = jobs if jobs > 0 else (os.cpu_count() or 1)
+
+    def factory() -> Executor:
+        return ProcessPoolExecutor(max_workers=workers, initializer=warm_up)
+
+    service = Service(factory(), factory)
+    try:
+        loop = asyncio.get_running_loop()
+        spawns = (loop.run_in_executor(service.executor, os.getpid) for _ in range(workers))
+        await asyncio.gather(*spawns)  # spawn all now
+        servers = [await asyncio.start_server(service.handle, host, port)]
+        if unix_socket:
+            if os.path.exists(unix_socket) and stat.S_ISSOCK(os.stat(unix_socket).st_mode):
+                os.unlink(unix_socket)  # left over by a service that was killed
+            servers.append(await asyncio.start_unix_server(service.handle, unix_socket))
+        task = asyncio.current_task()
+        if task is not None:
+            loop.add_signal_handler(signal.SIGTERM, task.cancel)
+        for server in servers:
+            for sock in server.sockets:
+                log.info(f'serving validation requests on {sock.getsockname()} with {workers} workers')
+        if started is not None:
+            started.set_result(tuple(servers))
+        try:
+            await asyncio.gather(*(server.serve_forever() for server in servers))
+        except asyncio.CancelledError:
+            log.info('validation service stopped')
+        finally:
+            loop.remove_signal_handler(signal.SIGTERM)
+            for server in servers:
+                server.close()
+            if unix_socket and os.path.exists(unix_socket):
+                os.unlink(unix_socket)
+    finally:
+        service.executor.shutdown()
@@ -0,0 +1,128 @@
+"""Section by section decoding of oversized advisories from a buffer (like a memory map of the file).
+
+The top level is decoded into raw views of the sections (no copies of the buffer), then the sections
+are decoded one at a time: the document meta data, every member of the product tree, and every vulnerability.
+Of the product tree members and the vulnerabilities only the members defining or referencing products and
+groups are decoded (names, hashes, notes, references, and the like are skipped without materializing them).
+So the peak memory is the index plus the largest section instead of the complete object tree of the advisory.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, TypeVar
+
+import msgspec
+
+from csaf.mandatory.index import Event
+
+PRODUCT_TREE_MEMBERS = ('branches', 'full_product_names', 'product_groups', 'relationships')  # in harvest order
+
+T = TypeVar('T')
+
+
+class Sections(msgspec.Struct):
+    """Top level sections of an advisory (the members other than the document meta data stay undecoded)."""
+
+    document: Any = None
+    product_tree: msgspec.Raw = msgspec.field(default_factory=msgspec.Raw)
+    vulnerabilities: msgspec.Raw = msgspec.field(default_factory=msgspec.Raw)
+
+
+class ProductTreeSections(msgspec.Struct):
+    """Members of the product tree (undecoded)."""
+
+    branches: msgspec.Raw = msgspec.field(default_factory=msgspec.Raw)
+    full_product_names: msgspec.Raw = msgspec.field(default_factory=msgspec.Raw)
+    product_groups: msgspec.Raw = msgspec.field(default_factory=msgspec.Raw)
+    relationships: msgspec.Raw = msgspec.field(default_factory=msgspec.Raw)
+
+
+class HelperRefs(msgspec.Struct, omit_defaults=True):
+    """Members of a product identification helper the index records."""
+
+    purl: Any = None
+
+
+class FullProductNameRefs(msgspec.Struct, omit_defaults=True):
+    """Members of a full product name element the index records."""
+
+    product_id: Any = None
+    product_identification_helper: Optional[HelperRefs] = None
+
+
+class BranchRefs(msgspec.Struct, omit_defaults=True):
+    """Members of a branch defining products."""
+
+    product: Optional[FullProductNameRefs] = None
+    branches: Optional[List['BranchRefs']] = None
+
+
+class ProductGroupRefs(msgspec.Struct, omit_defaults=True):
+    """Members of a product group defining the group and referencing products."""
+
+    group_id: Any = None
+    product_ids: Any = None
+
+
+class RelationshipRefs(msgspec.Struct, omit_defaults=True):
+    """Members of a relationship defining and referencing products."""
+
+    full_product_name: Optional[FullProductNameRefs] = None
+    product_reference: Any = None
+    relates_to_product_reference: Any = None
+
+
+class VulnerabilityRefs(msgspec.Struct):
+    """Members of a vulnerability referencing products or groups."""
+
+    product_status: Any = None
+    remediations: Any = None
+    scores: Any = None
+    threats: Any = None
+
+
+SECTIONS_DECODER = msgspec.json.Decoder(Sections)
+PRODUCT_TREE_DECODER = msgspec.json.Decoder(ProductTreeSections)
+VULNERABILITIES_DECODER = msgspec.json.Decoder(List[msgspec.Raw])
+VULNERABILITY_DECODER = msgspec.json.Decoder(VulnerabilityRefs)
+PRODUCT_TREE_MEMBER_DECODERS: Dict[str, 'msgspec.json.Decoder[Any]'] = {
+    'branches': msgspec.json.Decoder(List[BranchRefs]),
+    'full_product_names': msgspec.json.Decoder(List[FullProductNameRefs]),
+    'product_groups': msgspec.json.Decoder(List[ProductGroupRefs]),
+    'relationships': msgspec.json.Decoder(List[RelationshipRefs]),
+}
+VALUE_DECODER = msgspec.json.Decoder()
+
+
+def _decode(raw: msgspec.Raw, decoder: 'msgspec.json.Decoder[T]') -> Optional[T]:
+    """Return the decoded section or None if missing or not of the expected shape (tolerate schema violations)."""
+    if not raw:
+        return None
+    try:
+        return decoder.decode(raw)
+    except msgspec.ValidationError:
+        return None
+
+
+def events(data: Any) -> Iterator[Event]:
+    """Yield the sections of the advisory data one at a time as pairs of JSON pointer and value.
+
+    The document meta data comes first, then the product tree members, and then the vulnerabilities.
+    Raises msgspec.DecodeError if the data is no JSON object.
+    """
+    sections = SECTIONS_DECODER.decode(data)
+    yield '/document', sections.document
+
+    tree = _decode(sections.product_tree, PRODUCT_TREE_DECODER)
+    if tree is not None:
+        for member in PRODUCT_TREE_MEMBERS:
+            raw = getattr(tree, member)
+            if raw:
+                refs = _decode(raw, PRODUCT_TREE_MEMBER_DECODERS[member])
+                # members not of the expected shape are decoded in full so the index tolerates them like harvest
+                yield f'/product_tree/{member}', (
+                    VALUE_DECODER.decode(raw) if refs is None else msgspec.to_builtins(refs)
+                )
+
+    vulnerabilities = _decode(sections.vulnerabilities, VULNERABILITIES_DECODER)
+    for pos, raw in enumerate(vulnerabilities if vulnerabilities is not None else ()):
+        refs = _decode(raw, VULNERABILITY_DECODER)
+        yield f'/vulnerabilities/{pos}', {} if refs is None else msgspec.structs.asdict(refs)
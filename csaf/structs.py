@@ -0,0 +1,447 @@
+"""Typed msgspec Struct model of CSAF 2.0 for decoding and type checking advisories in one pass.
+
+The structs mirror the fields and constraints of the pydantic models (csaf.csaf.CSAF and friends)
+but decoding into them is a single pass in C without building intermediate dicts and model instances.
+Enumerations are modelled as literal strings and URLs as non-empty strings (the URL syntax is not checked).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from typing import Annotated, List, Literal, Optional, Union
+
+import msgspec
+from msgspec import Meta
+
+import csaf.cpe as cpe
+import csaf.cve as cve
+import csaf.cwe as cwe
+import csaf.scoring as scoring
+
+Text = Annotated[str, Meta(min_length=1)]
+Url = Annotated[str, Meta(min_length=1)]
+ScoreType = Annotated[float, Meta(ge=0.0, le=10.0)]
+Lang = Annotated[
+    str,
+    Meta(
+        pattern=r'^(([A-Za-z]{2,3}(-[A-Za-z]{3}(-[A-Za-z]{3}){0,2})?|[A-Za-z]{4,8})(-[A-Za-z]{4})?(-([A-Za-z]{2}|[0-9]{3}))?'
+        r'(-([A-Za-z0-9]{5,8}|[0-9][A-Za-z0-9]{3}))*(-[A-WY-Za-wy-z0-9](-[A-Za-z0-9]{2,8})+)*(-[Xx](-[A-Za-z0-9]{1,8})+)?'
+        r'|[Xx](-[A-Za-z0-9]{1,8})+|[Ii]-[Dd][Ee][Ff][Aa][Uu][Ll][Tt]|[Ii]-[Mm][Ii][Nn][Gg][Oo])$'
+    ),
+]
+Version = Annotated[
+    str,
+    Meta(
+        pattern=r'^(0|[1-9][0-9]*)$|^((0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)'
+        r'(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?'
+        r'(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?)$'
+    ),
+]
+Cpe = Annotated[str, Meta(min_length=cpe.MIN_LENGTH, pattern=cpe.PATTERN)]
+HashValue = Annotated[str, Meta(min_length=32, pattern=r'^[0-9a-fA-F]{32,}$')]
+CveId = Annotated[str, Meta(pattern=cve.PATTERN)]
+CweId = Annotated[str, Meta(pattern=cwe.PATTERN)]
+Products = Annotated[List[Text], Meta(min_length=1)]
+ProductGroupIds = Annotated[List[Text], Meta(min_length=1)]
+CVSS2_VECTOR = Annotated[str, Meta(pattern=scoring.PATTERNS['2.0'])]
+CVSS30_VECTOR = Annotated[str, Meta(pattern=scoring.PATTERNS['3.0'])]
+CVSS31_VECTOR = Annotated[str, Meta(pattern=scoring.PATTERNS['3.1'])]
+
+PublisherCategory = Literal['coordinator', 'discoverer', 'other', 'translator', 'user', 'vendor']
+DocumentStatus = Literal['draft', 'final', 'interim']
+Label = Literal['AMBER', 'GREEN', 'RED', 'WHITE']
+NoteCategory = Literal['description', 'details', 'faq', 'general', 'legal_disclaimer', 'other', 'summary']
+ReferenceCategory = Literal['external', 'self']
+BranchCategory = Literal[
+    'architecture',
+    'host_name',
+    'language',
+    'legacy',
+    'patch_level',
+    'product_family',
+    'product_name',
+    'product_version',
+    'service_pack',
+    'specification',
+    'vendor',
+]
+RelationshipCategory = Literal[
+    'default_component_of', 'external_component_of', 'installed_on', 'installed_with', 'optional_component_of'
+]
+PartyCategory = Literal['coordinator', 'discoverer', 'other', 'user', 'vendor']
+PartyStatus = Literal['completed', 'contact_attempted', 'disputed', 'in_progress', 'not_contacted', 'open']
+RemediationCategory = Literal['mitigation', 'no_fix_planned', 'none_available', 'vendor_fix', 'workaround']
+RestartRequiredCategory = Literal[
+    'connected', 'dependencies', 'machine', 'none', 'parent', 'service', 'system', 'vulnerable_component', 'zone'
+]
+ThreatCategory = Literal['exploit_status', 'impact', 'target_set']
+
+AccessVector = Literal['NETWORK', 'ADJACENT_NETWORK', 'LOCAL']
+AccessComplexity = Literal['HIGH', 'MEDIUM', 'LOW']
+Authentication = Literal['MULTIPLE', 'SINGLE', 'NONE']
+Cia2 = Literal['NONE', 'PARTIAL', 'COMPLETE']
+Cia = Literal['NONE', 'LOW', 'HIGH']
+Exploitability = Literal['UNPROVEN', 'PROOF_OF_CONCEPT', 'FUNCTIONAL', 'HIGH', 'NOT_DEFINED']
+RemediationLevel = Literal['OFFICIAL_FIX', 'TEMPORARY_FIX', 'WORKAROUND', 'UNAVAILABLE', 'NOT_DEFINED']
+ReportConfidence = Literal['UNCONFIRMED', 'UNCORROBORATED', 'CONFIRMED', 'NOT_DEFINED']
+CollateralDamagePotential = Literal['NONE', 'LOW', 'LOW_MEDIUM', 'MEDIUM_HIGH', 'HIGH', 'NOT_DEFINED']
+TargetDistribution = Literal['NONE', 'LOW', 'MEDIUM', 'HIGH', 'NOT_DEFINED']
+CiaRequirement = Literal['LOW', 'MEDIUM', 'HIGH', 'NOT_DEFINED']
+AttackVector = Literal['NETWORK', 'ADJACENT_NETWORK', 'LOCAL', 'PHYSICAL']
+ModifiedAttackVector = Literal['NETWORK', 'ADJACENT_NETWORK', 'LOCAL', 'PHYSICAL', 'NOT_DEFINED']
+AttackComplexity = Literal['HIGH', 'LOW']
+ModifiedAttackComplexity = Literal['HIGH', 'LOW', 'NOT_DEFINED']
+PrivilegesRequired = Literal['HIGH', 'LOW', 'NONE']
+ModifiedPrivilegesRequired = Literal['HIGH', 'LOW', 'NONE', 'NOT_DEFINED']
+UserInteraction = Literal['NONE', 'REQUIRED']
+ModifiedUserInteraction = Literal['NONE', 'REQUIRED', 'NOT_DEFINED']
+Scope = Literal['UNCHANGED', 'CHANGED']
+ModifiedScope = Literal['UNCHANGED', 'CHANGED', 'NOT_DEFINED']
+ModifiedCia = Literal['NONE', 'LOW', 'HIGH', 'NOT_DEFINED']
+ExploitCodeMaturity = Literal['UNPROVEN', 'PROOF_OF_CONCEPT', 'FUNCTIONAL', 'HIGH', 'NOT_DEFINED']
+Confidence = Literal['UNKNOWN', 'REASONABLE', 'CONFIRMED', 'NOT_DEFINED']
+Severity = Literal['NONE', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+
+
+class Base(msgspec.Struct, omit_defaults=True):
+    """Common configuration (subclasses declare keyword only fields to keep the order of the pydantic models)."""
+
+
+class Acknowledgment(Base, kw_only=True):
+    names: Optional[Annotated[List[Text], Meta(min_length=1)]] = None
+    organization: Optional[Text] = None
+    summary: Optional[Text] = None
+    urls: Optional[Annotated[List[Url], Meta(min_length=1)]] = None
+
+
+Acknowledgments = Annotated[List[Acknowledgment], Meta(min_length=1)]
+
+
+class Note(Base, kw_only=True):
+    audience: Optional[Text] = None
+    category: NoteCategory
+    text: Text
+    title: Optional[Text] = None
+
+
+Notes = Annotated[List[Note], Meta(min_length=1)]
+
+
+class Reference(Base, kw_only=True):
+    category: ReferenceCategory = 'external'
+    summary: Text
+    url: Url
+
+
+References = Annotated[List[Reference], Meta(min_length=1)]
+
+
+class AggregateSeverity(Base, kw_only=True):
+    namespace: Optional[Url] = None
+    text: Text
+
+
+class TrafficLightProtocol(Base, kw_only=True):
+    label: Label
+    url: Url = 'https://www.first.org/tlp/'
+
+
+class Distribution(Base, kw_only=True):
+    text: Optional[Text] = None
+    tlp: Optional[TrafficLightProtocol] = None
+
+
+class Publisher(Base, kw_only=True):
+    category: PublisherCategory
+    contact_details: Optional[Text] = None
+    issuing_authority: Optional[Text] = None
+    name: Text
+    namespace: Url
+
+
+class Engine(Base, kw_only=True):
+    name: Text
+    version: Optional[Text] = None
+
+
+class Generator(Base, kw_only=True):
+    date: Optional[dt.datetime] = None
+    engine: Engine
+
+
+class Revision(Base, kw_only=True):
+    date: dt.datetime
+    number: Version
+    summary: Text
+
+
+class Tracking(Base, kw_only=True):
+    aliases: Optional[Annotated[List[Text], Meta(min_length=1)]] = None
+    current_release_date: dt.datetime
+    generator: Optional[Generator] = None
+    id: Text
+    initial_release_date: dt.datetime
+    revision_history: Annotated[List[Revision], Meta(min_length=1)]
+    status: DocumentStatus
+    version: Version
+
+
+class Document(Base, kw_only=True):
+    acknowledgments: Optional[Acknowledgments] = None
+    aggregate_severity: Optional[AggregateSeverity] = None
+    category: Text
+    csaf_version: Literal['2.0']
+    distribution: Optional[Distribution] = None
+    lang: Optional[Lang] = None
+    notes: Optional[Notes] = None
+    publisher: Publisher
+    references: Optional[References] = None
+    source_lang: Optional[Lang] = None
+    title: Text
+    tracking: Tracking
+
+
+class FileHash(Base, kw_only=True):
+    algorithm: Text
+    value: HashValue
+
+
+class CryptographicHashes(Base, kw_only=True):
+    file_hashes: List[FileHash]
+    filename: str
+
+
+class GenericUri(Base, kw_only=True):
+    namespace: Url
+    uri: Url
+
+
+class HelperToIdentifyTheProduct(Base, kw_only=True):
+    cpe: Optional[Cpe] = None
+    hashes: Optional[List[CryptographicHashes]] = None
+    purl: Optional[Url] = None
+    sbom_urls: Optional[List[Url]] = None
+    serial_numbers: Optional[List[Text]] = None
+    skus: Optional[List[Text]] = None
+    x_generic_uris: Optional[List[GenericUri]] = None
+
+
+class FullProductName(Base, kw_only=True):
+    name: Text
+    product_id: Text
+    product_identification_helper: Optional[HelperToIdentifyTheProduct] = None
+
+
+class Branch(Base, kw_only=True):
+    branches: Optional[Annotated[List[Branch], Meta(min_length=1)]] = None
+    category: BranchCategory
+    name: Text
+    product: Optional[FullProductName] = None
+
+
+class ProductGroup(Base, kw_only=True):
+    group_id: Text
+    product_ids: List[Text]
+    summary: Optional[Text] = None
+
+
+class Relationship(Base, kw_only=True):
+    category: RelationshipCategory
+    full_product_name: FullProductName
+    product_reference: Text
+    relates_to_product_reference: Text
+
+
+class ProductTree(Base, kw_only=True):
+    branches: Optional[Annotated[List[Branch], Meta(min_length=1)]] = None
+    full_product_names: Optional[Annotated[List[FullProductName], Meta(min_length=1)]] = None
+    product_groups: Optional[Annotated[List[ProductGroup], Meta(min_length=1)]] = None
+    relationships: Optional[Annotated[List[Relationship], Meta(min_length=1)]] = None
+
+
+class ProductStatus(Base, kw_only=True):
+    first_affected: Optional[Products] = None
+    first_fixed: Optional[Products] = None
+    fixed: Optional[Products] = None
+    known_affected: Optional[Products] = None
+    known_not_affected: Optional[Products] = None
+    last_affected: Optional[Products] = None
+    recommended: Optional[Products] = None
+    under_investigation: Optional[Products] = None
+
+
+class CVSS2(Base, kw_only=True, rename='camel'):
+    version: Literal['2.0'] = '2.0'
+    vector_string: CVSS2_VECTOR
+    access_vector: Optional[AccessVector] = None
+    access_complexity: Optional[AccessComplexity] = None
+    authentication: Optional[Authentication] = None
+    confidentiality_impact: Optional[Cia2] = None
+    integrity_impact: Optional[Cia2] = None
+    availability_impact: Optional[Cia2] = None
+    base_score: ScoreType
+    exploitability: Optional[Exploitability] = None
+    remediation_level: Optional[RemediationLevel] = None
+    report_confidence: Optional[ReportConfidence] = None
+    temporal_score: Optional[ScoreType] = None
+    collateral_damage_potential: Optional[CollateralDamagePotential] = None
+    target_distribution: Optional[TargetDistribution] = None
+    confidentiality_requirement: Optional[CiaRequirement] = None
+    integrity_requirement: Optional[CiaRequirement] = None
+    availability_requirement: Optional[CiaRequirement] = None
+    environmental_score: Optional[ScoreType] = None
+
+
+class CVSS3(Base, kw_only=True, rename='camel', tag_field='version'):
+    """Fields shared by CVSS 3.0 and 3.1 (the version member selects the concrete struct)."""
+
+    attack_vector: Optional[AttackVector] = None
+    attack_complexity: Optional[AttackComplexity] = None
+    privileges_required: Optional[PrivilegesRequired] = None
+    user_interaction: Optional[UserInteraction] = None
+    scope: Optional[Scope] = None
+    confidentiality_impact: Optional[Cia] = None
+    integrity_impact: Optional[Cia] = None
+    availability_impact: Optional[Cia] = None
+    base_score: ScoreType
+    base_severity: Severity
+    exploit_code_maturity: Optional[ExploitCodeMaturity] = None
+    remediation_level: Optional[RemediationLevel] = None
+    report_confidence: Optional[Confidence] = None
+    temporal_score: Optional[ScoreType] = None
+    temporal_severity: Optional[Severity] = None
+    confidentiality_requirement: Optional[CiaRequirement] = None
+    integrity_requirement: Optional[CiaRequirement] = None
+    availability_requirement: Optional[CiaRequirement] = None
+    modified_attack_vector: Optional[ModifiedAttackVector] = None
+    modified_attack_complexity: Optional[ModifiedAttackComplexity] = None
+    modified_privileges_required: Optional[ModifiedPrivilegesRequired] = None
+    modified_user_interaction: Optional[ModifiedUserInteraction] = None
+    modified_scope: Optional[ModifiedScope] = None
+    modified_confidentiality_impact: Optional[ModifiedCia] = None
+    modified_integrity_impact: Optional[ModifiedCia] = None
+    modified_availability_impact: Optional[ModifiedCia] = None
+    environmental_score: Optional[ScoreType] = None
+    environmental_severity: Optional[Severity] = None
+
+
+class CVSS30(CVSS3, kw_only=True, tag='3.0'):
+    vector_string: CVSS30_VECTOR
+
+
+class CVSS31(CVSS3, kw_only=True, tag='3.1'):
+    vector_string: CVSS31_VECTOR
+
+
+class Cwe(Base, kw_only=True):
+    id: CweId
+    name: Text
+
+
+class Id(Base, kw_only=True):
+    system_name: Text
+    text: Text
+
+
+class Involvement(Base, kw_only=True):
+    date: Optional[dt.datetime] = None
+    party: PartyCategory
+    status: PartyStatus
+    summary: Optional[Text] = None
+
+
+class RestartRequired(Base, kw_only=True):
+    category: RestartRequiredCategory
+    details: Optional[Text] = None
+
+
+class Remediation(Base, kw_only=True):
+    category: RemediationCategory
+    date: Optional[dt.datetime] = None
+    details: Text
+    entitlements: Optional[Annotated[List[Text], Meta(min_length=1)]] = None
+    group_ids: Optional[ProductGroupIds] = None
+    product_ids: Optional[Products] = None
+    restart_required: Optional[RestartRequired] = None
+    url: Optional[Url] = None
+
+
+class Score(Base, kw_only=True):
+    cvss_v2: Optional[CVSS2] = None
+    cvss_v3: Optional[Union[CVSS30, CVSS31]] = None
+    products: Products
+
+
+class Threat(Base, kw_only=True):
+    category: ThreatCategory
+    date: Optional[dt.datetime] = None
+    details: Text
+    group_ids: Optional[ProductGroupIds] = None
+    product_ids: Optional[Products] = None
+
+
+class Vulnerability(Base, kw_only=True):
+    acknowledgments: Optional[Acknowledgments] = None
+    cve: Optional[CveId] = None
+    cwe: Optional[Cwe] = None
+    discovery_date: Optional[dt.datetime] = None
+    id: Optional[Id] = None
+    involvements: Optional[Annotated[List[Involvement], Meta(min_length=1)]] = None
+    notes: Optional[Notes] = None
+    product_status: Optional[ProductStatus] = None
+    references: Optional[References] = None
+    release_date: Optional[dt.datetime] = None
+    remediations: Optional[Annotated[List[Remediation], Meta(min_length=1)]] = None
+    scores: Optional[Annotated[List[Score], Meta(min_length=1)]] = None
+    threats: Optional[Annotated[List[Threat], Meta(min_length=1)]] = None
+    title: Optional[Text] = None
+
+
+class CSAF(Base, kw_only=True):
+    """Representation of security advisory information as a JSON document."""
+
+    document: Document
+    product_tree: Optional[ProductTree] = None
+    vulnerabilities: Optional[Annotated[List[Vulnerability], Meta(min_length=1)]] = None
+
+
+DECODER = msgspec.json.Decoder(CSAF)
+
+
+class TrackingRevision(msgspec.Struct):
+    """Partial view of a revision (the members deciding whether an advisory changed)."""
+
+    date: str = ''
+    number: str = ''
+
+
+class TrackingMeta(msgspec.Struct):
+    """Partial view of the tracking member of the document."""
+
+    id: str = ''
+    version: str = ''
+    current_release_date: str = ''
+    status: str = ''
+    revision_history: List[TrackingRevision] = msgspec.field(default_factory=list)
+
+
+class TrackingPublisher(msgspec.Struct):
+    """Partial view of the publisher member of the document."""
+
+    namespace: str = ''
+
+
+class TrackingDocument(msgspec.Struct):
+    """Partial view of the document member."""
+
+    publisher: TrackingPublisher = msgspec.field(default_factory=TrackingPublisher)
+    tracking: TrackingMeta = msgspec.field(default_factory=TrackingMeta)
+
+
+class Tracked(msgspec.Struct):
+    """Partial view of an advisory with only the identity and the version (all other members are skipped)."""
+
+    document: TrackingDocument = msgspec.field(default_factory=TrackingDocument)
+
+
+TRACKING_DECODER = msgspec.json.Decoder(Tracked)
@@ -0,0 +1,147 @@
+"""Constant time queries of product status, remediations, threats, and scores per product and vulnerability.
+
+  vex = Vex(advisory)  # a CSAF model, the msgspec struct, or the decoded JSON of an advisory
+  vex.status('CSAFPID-9080700', 'CVE-2021-44228')  # ('known_affected',)
+  vex.affected('CVE-2021-44228')  # the product ids of the affected categories
+
+All answers are computed when building the query object (the group ids of remediations and threats are expanded
+to their product ids), so every query is a single dictionary lookup independent of the size of the advisory.
+Vulnerabilities are keyed by their CVE id, or else by the text of their id.
+Members of the advisory not matching the schema are skipped.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import msgspec
+from pydantic import BaseModel
+
+import csaf.mandatory.consistent_product_status as con_pro_sta
+from csaf.mandatory.index import PRODUCT_STATUS_CATEGORIES, as_list, as_object
+
+AFFECTED = tuple(category for category, group in con_pro_sta.GROUP_OF.items() if group == 'affected')
+
+Pair = Tuple[str, str]  # vulnerability key and product id (or status category)
+Items = Tuple[Dict[str, Any], ...]
+
+
+def _strings(thing: Any) -> Tuple[str, ...]:
+    """Return the distinct strings of the list in order."""
+    return tuple(dict.fromkeys(item for item in as_list(thing) if isinstance(item, str)))
+
+
+def as_dict(advisory: Any) -> Dict[str, Any]:
+    """Return the advisory as decoded JSON given a pydantic model, a msgspec struct, or the decoded JSON."""
+    if isinstance(advisory, dict):
+        return advisory
+    if isinstance(advisory, BaseModel):
+        return advisory.model_dump(mode='json', by_alias=True, exclude_none=True)
+    return as_object(msgspec.to_builtins(advisory))
+
+
+def vulnerability_key(vulnerability: Dict[str, Any]) -> str:
+    """Return the key of the vulnerability (the CVE id or else the text of the id) or the empty string."""
+    for key in (vulnerability.get('cve'), as_object(vulnerability.get('id')).get('text')):
+        if isinstance(key, str):
+            return key
+    return ''
+
+
+class Vex:
+    """Query object answering status, remediation, threat, and score lookups per product and vulnerability."""
+
+    __slots__ = (
+        'keys',
+        'groups',
+        '_status',
+        '_members',
+        '_affected',
+        '_affecting',
+        '_remediations',
+        '_threats',
+        '_scores',
+    )
+
+    def __init__(self, advisory: Any) -> None:
+        data = as_dict(advisory)
+        self.groups: Dict[str, Tuple[str, ...]] = {}  # product ids per group id
+        for group in as_list(as_object(data.get('product_tree')).get('product_groups')):
+            group = as_object(group)
+            if isinstance(group.get('group_id'), str):
+                self.groups[group['group_id']] = _strings(group.get('product_ids'))
+
+        status: Dict[Pair, List[str]] = {}
+        members: Dict[Pair, List[str]] = {}
+        affecting: Dict[str, List[str]] = {}
+        remediations: Dict[Pair, List[Dict[str, Any]]] = {}
+        threats: Dict[Pair, List[Dict[str, Any]]] = {}
+        scores: Dict[Pair, List[Dict[str, Any]]] = {}
+        keys: List[str] = []
+        for vulnerability in as_list(data.get('vulnerabilities')):
+            vulnerability = as_object(vulnerability)
+            product_status = as_object(vulnerability.get('product_status'))
+            key = vulnerability_key(vulnerability)
+            if not key:
+                continue  # not addressable
+            keys.append(key)
+            for category in PRODUCT_STATUS_CATEGORIES:
+                for product_id in _strings(product_status.get(category)):
+                    status.setdefault((key, product_id), []).append(category)
+                    members.setdefault((key, category), []).append(product_id)
+                    if category in AFFECTED:
+                        affecting.setdefault(product_id, []).append(key)
+            for member, found in (('remediations', remediations), ('threats', threats)):
+                for item in as_list(vulnerability.get(member)):
+                    item = as_object(item)
+                    for product_id in self.expand(item.get('product_ids'), item.get('group_ids')):
+                        found.setdefault((key, product_id), []).append(item)
+            for score in as_list(vulnerability.get('scores')):
+                score = as_object(score)
+                for product_id in _strings(score.get('products')):
+                    scores.setdefault((key, product_id), []).append(score)
+
+        self.keys = tuple(dict.fromkeys(keys))
+        self._status = {pair: tuple(dict.fromkeys(categories)) for pair, categories in status.items()}
+        self._members = {pair: tuple(dict.fromkeys(product_ids)) for pair, product_ids in members.items()}
+        self._affected = {
+            key: tuple(dict.fromkeys(pid for category in AFFECTED for pid in self._members.get((key, category), ())))
+            for key in self.keys
+        }
+        self._affecting = {product_id: tuple(dict.fromkeys(found)) for product_id, found in affecting.items()}
+        self._remediations = {pair: tuple(items) for pair, items in remediations.items()}
+        self._threats = {pair: tuple(items) for pair, items in threats.items()}
+        self._scores = {pair: tuple(items) for pair, items in scores.items()}
+
+    def expand(self, product_ids: Any, group_ids: Any) -> Tuple[str, ...]:
+        """Return the distinct product ids given directly or as members of the groups (unknown groups are empty)."""
+        expanded = list(_strings(product_ids))
+        for group_id in _strings(group_ids):
+            expanded.extend(self.groups.get(group_id, ()))
+        return tuple(dict.fromkeys(expanded))
+
+    def status(self, product_id: str, cve: str) -> Tuple[str, ...]:
+        """Return the product status categories of the product for the vulnerability (empty if not mentioned)."""
+        return self._status.get((cve, product_id), ())
+
+    def products(self, cve: str, category: str) -> Tuple[str, ...]:
+        """Return the product ids in the product status category of the vulnerability."""
+        return self._members.get((cve, category), ())
+
+    def affected(self, cve: str) -> Tuple[str, ...]:
+        """Return the product ids in the first, known, or last affected status of the vulnerability."""
+        return self._affected.get(cve, ())
+
+    def affecting(self, product_id: str) -> Tuple[str, ...]:
+        """Return the keys of the vulnerabilities affecting the product."""
+        return self._affecting.get(product_id, ())
+
+    def remediations(self, product_id: str, cve: str) -> Items:
+        """Return the remediations of the vulnerability applying to the product (directly or via groups)."""
+        return self._remediations.get((cve, product_id), ())
+
+    def threats(self, product_id: str, cve: str) -> Items:
+        """Return the threats of the vulnerability applying to the product (directly or via groups)."""
+        return self._threats.get((cve, product_id), ())
+
+    def scores(self, product_id: str, cve: str) -> Items:
+        """Return the scores of the vulnerability applying to the product."""
+        return self._scores.get((cve, product_id), ())
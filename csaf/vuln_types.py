@@ -26,6 +26,12 @@ class AuthenticationType(Enum):
     none = 'NONE'
 
 
+class Cia2Type(Enum):
+    none = 'NONE'
+    partial = 'PARTIAL'
+    complete = 'COMPLETE'
+
+
 class CiaType(Enum):
     none = 'NONE'
     low = 'LOW'
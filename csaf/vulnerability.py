@@ -8,7 +8,9 @@ from typing import Annotated, List, Optional, Union, no_type_check
 
 from pydantic import AnyUrl, BaseModel, Field, RootModel, field_validator
 
+from csaf.cve import PATTERN as CVE_PATTERN
 from csaf.cvss import CVSS2, CVSS30, CVSS31
+from csaf.cwe import PATTERN as CWE_PATTERN
 from csaf.definitions import Acknowledgments, Id, Notes, ProductGroupIds, Products, References
 from csaf.product import ProductStatus
 
@@ -23,7 +25,7 @@ class Cwe(BaseModel):
         Field(
             description='Holds the ID for the weakness associated.',
             examples=['CWE-22', 'CWE-352', 'CWE-79'],
-            pattern='^CWE-[1-9]\\d{0,5}$',
+            pattern=CWE_PATTERN,
             title='Weakness ID',
         ),
     ]
@@ -409,7 +411,7 @@ class Vulnerability(BaseModel):
         Field(
             description='Holds the MITRE standard Common Vulnerabilities and Exposures (CVE) tracking number for'
             ' the vulnerability.',
-            pattern='^CVE-[0-9]{4}-[0-9]{4,}$',
+            pattern=CVE_PATTERN,
             title='CVE',
         ),
     ] = None
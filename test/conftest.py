@@ -146,7 +146,8 @@ SPAM = {
 
 SPAM_JSON = msgspec.json.encode(SPAM)
 
-CSAF_EXAMPLE_COM_123_PATH = pathlib.Path('test', 'fixtures', 'example-com', 'example-com-123.json')
+FIXTURES = pathlib.Path('test', 'fixtures')
+CSAF_EXAMPLE_COM_123_PATH = FIXTURES / 'example-com' / 'example-com-123.json'
 with open(CSAF_EXAMPLE_COM_123_PATH, 'rb') as handle:
     CSAF_WITH_DOCUMENTS = msgspec.json.decode(handle.read())
 
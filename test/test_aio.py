@@ -0,0 +1,77 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+import csaf
+import csaf.aio as aio
+import csaf.cache as cache
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH
+
+
+def _vex(path):
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['document']['category'] = 'veX'
+    path.write_text(json.dumps(doc))
+    return path
+
+
+def test_package_exposes_async_api():
+    assert csaf.avalidate is aio.avalidate
+    assert csaf.avalidate_many is aio.avalidate_many
+
+
+@pytest.mark.asyncio
+async def test_avalidate_path_and_bytes(tmp_path):
+    result = await csaf.avalidate(CSAF_EXAMPLE_COM_123_PATH)
+    assert (result.path, result.code) == (str(CSAF_EXAMPLE_COM_123_PATH), 0)
+
+    result = await csaf.avalidate(_vex(tmp_path / 'vex.json').read_bytes(), name='vex.json')
+    assert (result.path, result.code) == ('vex.json', 1)
+    assert result.findings[0].rule == '6.1.26'
+
+
+@pytest.mark.asyncio
+async def test_avalidate_reports_unreadable_paths(tmp_path):
+    result = await csaf.avalidate(str(tmp_path / 'missing.json'))
+    assert result.code == 1
+
+
+@pytest.mark.asyncio
+async def test_avalidate_many_bounds_pending_validations(tmp_path, monkeypatch):
+    running, peak = 0, 0
+    lock = threading.Lock()
+    assess_path = aio._assess_path
+
+    def counting(path, options):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        try:
+            return assess_path(path, options)
+        finally:
+            with lock:
+                running -= 1
+
+    monkeypatch.setattr(aio, '_assess_path', counting)
+    paths = [CSAF_EXAMPLE_COM_123_PATH] * 6 + [_vex(tmp_path / 'vex.json')]
+    results = [result async for result in csaf.avalidate_many(paths, concurrency=2)]
+    assert 1 <= peak <= 2
+    assert sorted(result.code for result in results) == [0] * 6 + [1]
+
+
+@pytest.mark.asyncio
+async def test_avalidate_many_names_bytes_by_position_and_uses_cache(tmp_path):
+    store_path = str(tmp_path / 'cache.sqlite')
+    data = CSAF_EXAMPLE_COM_123_PATH.read_bytes()
+    try:
+        results = [result async for result in csaf.avalidate_many([data, data], {'schema': True}, concurrency=1)]
+        assert [result.path for result in results] == ['<memory>#0', '<memory>#1']
+        cached = await asyncio.gather(
+            *(csaf.avalidate(CSAF_EXAMPLE_COM_123_PATH, {'cache': store_path}) for _ in range(3))
+        )
+        assert {result.code for result in cached} == {0}
+    finally:
+        cache.close()
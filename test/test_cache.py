@@ -0,0 +1,153 @@
+import datetime as dt
+import json
+import shutil
+import sqlite3
+
+import pytest
+
+import csaf.cache as cache
+import csaf.csaf as api
+import csaf.metrics as metrics
+from csaf.result import Finding, Result
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH, FIXTURES
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    yield str(tmp_path / 'cache.sqlite')
+    cache.close()
+
+
+def test_digest_text_and_bytes_agree():
+    assert cache.digest('{}') == cache.digest(b'{}') == cache.digest(memoryview(b'{}'))
+    assert len(cache.digest(b'')) == 64
+
+
+def test_profile_of_distinguishes_options():
+    assert cache.profile_of() != cache.profile_of('msgspec') != cache.profile_of('msgspec', True)
+
+
+def test_put_get_roundtrip_without_path(store_path):
+    store = cache.open_cache(store_path)
+    assert store is cache.open_cache(store_path)
+    finding = Finding(rule='6.1.1', topic='Missing Definition of Product ID', message='undefined', pointers=('/x',))
+    store.put('abc', 'p', Result(path='a.json', code=1, message='undefined', findings=(finding,)))
+    assert store.get('abc', 'p') == Result(path='', code=1, message='undefined', findings=(finding,))
+    assert store.get('abc', 'other') is None
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_open_drops_entries_of_other_versions(store_path, monkeypatch):
+    cache.open_cache(store_path).put('abc', 'p', Result(path='', code=0, message=''))
+    cache.close()
+    monkeypatch.setattr(cache, 'ruleset_version', lambda: 'future')
+    assert cache.open_cache(store_path).get('abc', 'p') is None
+    with sqlite3.connect(store_path) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM results').fetchone() == (0,)
+    connection.close()
+
+
+def test_assess_reuses_cached_results_for_unchanged_bytes(store_path, tmp_path):
+    copy = tmp_path / 'copy.json'
+    shutil.copy(CSAF_EXAMPLE_COM_123_PATH, copy)
+    options = {'cache': store_path}
+    first = api.assess('validate', 'commit', str(CSAF_EXAMPLE_COM_123_PATH), options)
+    second = api.assess('validate', 'commit', str(copy), options)
+    assert first.code == second.code == 0
+    assert second.path == str(copy)
+    store = cache.open_cache(store_path)
+    assert (store.hits, store.misses) == (1, 1)
+
+    doc = json.loads(copy.read_text())
+    doc['document']['category'] = 'veX'
+    copy.write_text(json.dumps(doc))
+    changed = api.assess('validate', 'commit', str(copy), options)
+    assert changed.code == 1
+    assert changed.findings[0].rule == '6.1.26'
+    assert api.assess('validate', 'commit', str(copy), options) == changed
+    assert (store.hits, store.misses) == (2, 2)
+
+
+def test_process_batch_with_cache_in_workers(store_path):
+    paths = [str(path) for path in sorted(FIXTURES.rglob('*.json'))]
+    options = {'cache': store_path}
+    cold = api.process_batch('validate', 'commit', paths, options, jobs=2)
+    warm = api.process_batch('validate', 'commit', paths, options, jobs=1)
+    assert cold == warm
+    store = cache.open_cache(store_path)
+    assert store.hits == len(paths)
+
+
+def test_cache_lookups_are_reported_with_the_rule_metrics(store_path):
+    before = metrics.REGISTRY.snapshot()
+    paths = [str(CSAF_EXAMPLE_COM_123_PATH)] * 3
+    api.process_batch('validate', 'commit', paths, {'cache': store_path, 'profile_rules': True}, jobs=2)
+    api.process_batch('validate', 'commit', paths[:1], {'cache': store_path}, jobs=1)
+    stats = {stats.rule: stats for stats in metrics.REGISTRY.since(before)}
+    assert stats[cache.METRICS_RULE].runs == 4
+    assert 1 <= stats[cache.METRICS_RULE].failures <= 3  # the workers may miss concurrently
+    assert 'cache ' in metrics.REGISTRY.as_table()
+
+
+def _final(**tracking):
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['document']['tracking']['status'] = 'final'
+    doc['document']['tracking'].update(tracking)
+    return doc
+
+
+def test_tracking_key_of_consistent_metadata():
+    key = cache.tracking_key(json.dumps(_final()).encode())
+    assert key == 'tracking:https://example.com|example-com-123|2021.12.12|2021-12-12T11:00:00.000Z'
+
+
+@pytest.mark.parametrize(
+    'tracking',
+    [
+        {'status': 'draft'},
+        {'version': '2021.12.13'},
+        {'current_release_date': '2021-12-11T11:00:00.000Z'},
+        {'current_release_date': 'yesterday'},
+        {'revision_history': []},
+        {'id': ''},
+    ],
+)
+def test_tracking_key_falls_back_for_inconsistent_metadata(tracking):
+    assert cache.tracking_key(json.dumps(_final(**tracking))) == ''
+
+
+def test_moment_of_utc_designator():
+    utc = dt.datetime(2022, 3, 17, 13, 3, 42, 105000, tzinfo=dt.timezone.utc)
+    assert cache._moment('2022-03-17T13:03:42.105Z') == utc
+    assert cache._moment('2022-03-17T13:03:42.105z') == utc
+    assert cache._moment('2022-03-17T14:03:42.105+01:00') == utc
+    assert cache._moment('2022-03-17T13:03:42.105') == utc
+    assert cache._moment('Z') is None
+    assert cache._moment('') is None
+
+
+def test_tracking_key_of_garbage():
+    assert cache.tracking_key(b'{"document": []}') == ''
+    assert cache.tracking_key(b'not json') == ''
+
+
+def test_assess_incremental_skips_republished_advisories(store_path, tmp_path):
+    path = tmp_path / 'advisory.json'
+    path.write_text(json.dumps(_final()))
+    options = {'cache': store_path, 'incremental': True}
+    assert api.assess('validate', 'commit', str(path), options).code == 0
+    store = cache.open_cache(store_path)
+    assert (store.hits, store.misses) == (0, 2)
+
+    republished = _final()
+    republished['document']['title'] = 'Same advisory, republished with other bytes'
+    path.write_text(json.dumps(republished, indent=2))
+    assert api.assess('validate', 'commit', str(path), options).code == 0
+    assert (store.hits, store.misses) == (1, 2)
+
+    revised = _final(version='2', current_release_date='2021-12-13T11:00:00.000Z')
+    revised['document']['tracking']['revision_history'].append({'date': '2021-12-13T11:00:00.000Z', 'number': '2'})
+    revised['document']['category'] = 'veX'
+    path.write_text(json.dumps(revised))
+    assert api.assess('validate', 'commit', str(path), options).code == 1
+    assert (store.hits, store.misses) == (1, 4)
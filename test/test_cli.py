@@ -1,11 +1,33 @@
+import subprocess
+import sys
+
 import click
 import pytest  # type: ignore
+from typer.testing import CliRunner
 
 import csaf.cli as cli
 
+OPTIONAL_ENGINE_MODULES = ('csaf.cache', 'csaf.schema', 'csaf.stream', 'csaf.structs', 'jsonschema', 'sqlite3')
+HEAVY_MODULES = ('csaf.csaf', 'jmespath', 'jsonschema', 'langcodes', 'lazr.uri', 'pydantic', 'scooby')
+
+
+def _import_times(statement):
+    """Return the cumulative import time in microseconds per module name reported by -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            _, cumulative, name = line.split('|')
+            times[name.strip()] = int(cumulative)
+    return times
+
 
 def test_main_no_args(capsys):
-    assert cli.validate(source=[''], inp='', conf='') == 2
+    with pytest.raises(click.exceptions.Exit) as err:
+        cli.validate(source=[''], inp='', conf='')
+    assert err.value.exit_code == 2
     out, err = capsys.readouterr()
     assert not out
     assert not err
@@ -33,3 +55,95 @@ def test_version_ok(capsys):
     out, err = capsys.readouterr()
     assert 'version' in out.lower()
     assert not err
+
+
+def test_validate_exit_codes_of_single_files_and_empty_folders(tmp_path):
+    with pytest.raises(click.exceptions.Exit) as err:
+        cli.validate(source=[str(tmp_path)], inp='', conf='', jobs=1)
+    assert err.value.exit_code == 2
+    failing = tmp_path / 'failing.json'
+    failing.write_text('{"document": {}}')
+    for source in ([str(failing)], [str(tmp_path)]):
+        with pytest.raises(click.exceptions.Exit) as err:
+            cli.validate(source=source, inp='', conf='', jobs=1)
+        assert err.value.exit_code == 1, source
+    assert CliRunner().invoke(cli.app, ['validate', str(failing)]).exit_code == 1
+
+
+def test_validate_bail_out_does_not_stick_across_calls(capsys):
+    with pytest.raises(click.exceptions.Exit):
+        cli.validate(source=['test/fixtures'], inp='', conf='', quiet=False, bail_out=True, jobs=1)
+    capsys.readouterr()
+    with pytest.raises(click.exceptions.Exit):
+        cli.validate(source=['test/fixtures'], inp='', conf='', quiet=False, jobs=1)
+    out, _ = capsys.readouterr()
+    assert out.endswith('validated 5 advisories: 3 passed, 2 failed\n')
+
+
+def test_validate_batch_folder(capsys):
+    with pytest.raises(click.exceptions.Exit) as err:
+        cli.validate(source=['test/fixtures'], inp='', conf='', quiet=False, jobs=2)
+    assert err.value.exit_code == 1
+    out, _ = capsys.readouterr()
+    assert 'test/fixtures/minimal_whatever.json' in out
+    assert out.endswith('validated 5 advisories: 3 passed, 2 failed\n')
+
+
+def test_validate_single_file_json(capsys):
+    with pytest.raises(click.exceptions.Exit) as err:
+        cli.validate(
+            source=['test/fixtures/minimal_whatever.json'], inp='', conf='', jobs=1, report_format=cli.ReportFormat.json
+        )
+    assert err.value.exit_code == 0
+    out, _ = capsys.readouterr()
+    assert '"path": "test/fixtures/minimal_whatever.json"' in out
+
+
+def test_cli_import_defers_heavy_modules():
+    times = _import_times('import csaf.cli')
+    assert 'csaf.cli' in times
+    assert not set(times).intersection(HEAVY_MODULES), f'cumulative import time {times["csaf.cli"]} us'
+
+
+def test_package_loads_validation_api_on_first_access():
+    times = _import_times('import csaf; csaf.is_valid')
+    assert 'csaf.csaf' in times
+    assert 'csaf.csaf' not in _import_times('import csaf')
+
+
+def test_validation_api_loads_optional_engines_on_first_use():
+    assert not set(_import_times('import csaf.csaf')).intersection(OPTIONAL_ENGINE_MODULES)
+    assert 'csaf.structs' in _import_times('import csaf.csaf as api; api.type_check(b"{}", "msgspec")')
+
+
+def test_validate_batch_folder_bails_out_on_first_failure(capsys):
+    with pytest.raises(click.exceptions.Exit) as err:
+        cli.validate(source=['test/fixtures'], inp='', conf='', quiet=False, bail_out=True, jobs=1)
+    assert err.value.exit_code == 1
+    out, _ = capsys.readouterr()
+    assert out.endswith('1 failed\n')
+    assert 'validated 5 advisories' not in out
+
+
+def test_validate_profile_rules_reports_on_stderr(capsys, monkeypatch):
+    import csaf.metrics as metrics
+
+    monkeypatch.setattr(metrics, 'REGISTRY', metrics.Metrics())
+    with pytest.raises(click.exceptions.Exit) as err:
+        cli.validate(
+            source=['test/fixtures/example-com/example-com-123.json'], inp='', conf='', profile_rules=True, jobs=1
+        )
+    assert err.value.exit_code == 0
+    _, err = capsys.readouterr()
+    assert err.splitlines()[0].startswith('rule')
+    assert '6.1.26' in err
+
+
+def test_validate_rejects_unknown_rule_profiles():
+    with pytest.raises(click.exceptions.Exit) as err:
+        cli.validate(source=['test/fixtures/minimal_whatever.json'], inp='', conf='', rules='recommended')
+    assert err.value.exit_code == 2
+    assert (
+        CliRunner().invoke(cli.app, ['validate', 'test/fixtures/minimal_whatever.json', '--rules', 'foo']).exit_code
+        == 2
+    )
@@ -1,6 +1,9 @@
 import json
+import shutil
 
 import csaf.csaf as api
+import csaf.metrics as metrics
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH, FIXTURES
 
 VECTOR_STRING = 'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H'
 DATA = {
@@ -221,3 +224,84 @@ def test_csaf_minimal():
     assert len(json_rep_of_vs) == 1
     assert VECTOR_STRING in json_rep_of_vs[0]
     assert '"vectorString":' in json_rep_of_vs[0]
+
+
+def test_expand_folder_yields_json_files_only():
+    paths = tuple(api.expand([str(FIXTURES)]))
+    assert len(paths) == 5
+    assert all(path.endswith('.json') for path in paths)
+    assert paths == tuple(sorted(paths))
+
+
+def test_expand_skips_provider_files_below_folders(tmp_path):
+    shutil.copy(CSAF_EXAMPLE_COM_123_PATH, tmp_path / 'example-com-123.json')
+    (tmp_path / 'provider-metadata.json').write_text('{"canonical_url": "https://example.com/.well-known/csaf"}')
+    (tmp_path / 'service.json').write_text('{\n  "service": {"workspace": []}\n}')
+    (tmp_path / 'example-com-feed-tlp-white.json').write_text('{"feed": {"id": "example-com-feed"}}')
+    (tmp_path / 'category-products.json').write_text(' { "categories" : {}}')
+    assert tuple(api.expand([str(tmp_path)])) == (str(tmp_path / 'example-com-123.json'),)
+    assert tuple(api.expand([str(tmp_path / 'service.json')])) == (str(tmp_path / 'service.json'),)
+
+
+def test_expand_keeps_files_and_unknowns():
+    sources = ['', 'non-existing-thing', str(FIXTURES / 'empty.xml')]
+    assert tuple(api.expand(sources)) == tuple(sources)
+
+
+def test_process_batch_matches_sequential():
+    paths = tuple(api.expand([str(FIXTURES)])) + ('non-existing-thing',)
+    sequential = api.process_batch('validate', 'commit', paths, {}, jobs=1)
+    parallel = api.process_batch('validate', 'commit', paths, {}, jobs=2)
+    assert parallel == sequential
+    assert [result.path for result in parallel] == list(paths)
+    assert sequential[-1].code == 1
+    assert sequential[-1].message.startswith('advisory is not readable')
+
+
+def test_assess_reports_findings_once():
+    result = api.assess('validate', 'commit', str(FIXTURES / 'minimal_whatever.json'), {})
+    assert result.code == 0
+    assert result.findings == ()
+
+
+def test_peek_bytes_and_text_agree():
+    data = (FIXTURES / 'minimal_whatever.json').read_bytes()
+    assert api.peek(data) == api.peek(data.decode()) == 'JSON'
+    assert api.peek(b' ' * 8 + b'<xml>' + b' ' * api.CSAF_MIN_BYTES) == 'XML'
+    assert api.peek(b'{}') == 'TOO_SHORT'
+
+
+def test_loaded_memory_maps_large_files(tmp_path, monkeypatch):
+    path = FIXTURES / 'minimal_whatever.json'
+    with api.loaded(str(path)) as data:
+        assert isinstance(data, bytes)
+    monkeypatch.setattr(api, 'CSAF_MMAP_MIN_BYTES', 1)
+    with api.loaded(str(path)) as data:
+        assert not isinstance(data, bytes)
+        assert data[:1] == b'{'
+        assert api.assess_buffer(str(path), data).code == 0
+    empty = tmp_path / 'empty.json'
+    empty.write_bytes(b'')
+    with api.loaded(str(empty)) as data:
+        assert data == b''
+
+
+def test_process_batch_bails_out_at_first_failing_advisory():
+    paths = tuple(api.expand([str(FIXTURES)]))
+    full = api.process_batch('validate', 'commit', paths, {}, jobs=1)
+    first_failure = next(pos for pos, result in enumerate(full) if result.code)
+    options = {'bail_out': True}
+    for jobs in (1, 2):
+        bailed = api.process_batch('validate', 'commit', paths, options, jobs=jobs)
+        assert [(r.path, r.code) for r in bailed] == [(r.path, r.code) for r in full[: first_failure + 1]]
+
+
+def test_process_batch_merges_rule_statistics_of_workers(monkeypatch):
+    paths = tuple(api.expand([str(FIXTURES)]))
+    counts = []
+    for jobs in (1, 2):
+        monkeypatch.setattr(metrics, 'REGISTRY', metrics.Metrics())
+        api.process_batch('validate', 'commit', paths, {'profile_rules': True}, jobs=jobs)
+        counts.append({rule: (stats.runs, stats.failures) for rule, stats in metrics.REGISTRY.stats.items()})
+    assert counts[0] == counts[1]
+    assert counts[0]['6.1.26'][0] > 1
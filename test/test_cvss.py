@@ -388,3 +388,15 @@ def test_cvss31_minimal():
         },
     }
     assert c31.model_json_schema(by_alias=True) == expected_schema
+
+
+def test_cvss_vector_string_checked_against_version_pattern():
+    data = {'version': '3.1', 'vectorString': conftest.CVSS30_VECTOR_STRING_LOG4J, 'baseScore': 10.0}
+    data['baseSeverity'] = 'CRITICAL'
+    with pytest.raises(ValidationError, match='String should match pattern') as err:
+        _ = CVSS31.model_validate(data)
+    assert 'vectorString' in str(err.value)
+    data['vectorString'] = conftest.CVSS31_VECTOR_STRING_LOG4J
+    assert CVSS31.model_validate(data).vector_string == conftest.CVSS31_VECTOR_STRING_LOG4J
+    with pytest.raises(ValidationError, match='String should match pattern'):
+        _ = CVSS2.model_validate({'vectorString': 'AV:N/AC:M/Au:N/C:C/I:C/A:X', 'baseScore': 9.3})
@@ -0,0 +1,84 @@
+import pytest
+from pydantic import ValidationError
+
+import csaf.cpe as cpe
+import csaf.cve as cve
+import csaf.cwe as cwe
+import csaf.purl as purl
+from csaf.mandatory import rules
+from csaf.product import HelperToIdentifyTheProduct
+from csaf.vulnerability import Cwe, Vulnerability
+
+
+@pytest.mark.parametrize(
+    'module, valid, invalid',
+    [
+        (cve, ('CVE-2021-44228', 'CVE-2022-1234567'), ('CVE-22-1', 'cve-2021-44228', 'CVE-2021-123')),
+        (cwe, ('CWE-22', 'CWE-352', 'CWE-999999'), ('CWE-0', 'CWE-1234567', 'CWE 79')),
+        (
+            cpe,
+            ('cpe:/a:csaf-tools:cvrf-csaf-converter:1.0.0-alpha', 'cpe:2.3:a:vendor:product:1.0:*:*:*:*:*:*:*'),
+            ('cpe', 'cpe:2.3:a:vendor', 'pkg:pypi/csaf'),
+        ),
+        (
+            purl,
+            ('pkg:pypi/csaf@2023.11.27', 'pkg:npm/%40angular/animation@12.3.1', 'pkg:maven/org.apache/log4j?x=1#y'),
+            ('pkg:maven/@1.3.4', 'pkg:x', 'https://example.com/csaf'),
+        ),
+    ],
+)
+def test_is_valid(module, valid, invalid):
+    assert all(module.is_valid(text) for text in valid)
+    assert not any(module.is_valid(text) for text in invalid)
+
+
+def test_validations_are_memoized():
+    cve.is_valid.cache_clear()
+    for _ in range(3):
+        assert cve.is_valid('CVE-2021-44228')
+    info = cve.is_valid.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (2, 1, cve.MEMO_SIZE)
+
+
+def test_models_check_the_patterns():
+    assert Vulnerability(cve='CVE-2021-44228').cve == 'CVE-2021-44228'
+    assert HelperToIdentifyTheProduct(purl='pkg:maven/@1.3.4', cpe='cpe:/a:example:product')
+    for model, members in (
+        (Vulnerability, {'cve': 'CVE-22-1'}),
+        (Cwe, {'id': 'CWE-0', 'name': 'Zero'}),
+        (HelperToIdentifyTheProduct, {'cpe': 'cpe:2.3:a:vendor'}),
+        (HelperToIdentifyTheProduct, {'purl': 'https://example.com/csaf'}),
+    ):
+        with pytest.raises(ValidationError, match='pattern|regex does not match'):
+            model(**members)
+
+
+def test_model_json_schemas_carry_the_patterns():
+    assert Vulnerability.model_json_schema()['properties']['cve']['anyOf'][0]['pattern'] == cve.PATTERN
+    assert Cwe.model_json_schema()['properties']['id']['pattern'] == cwe.PATTERN
+    helper = HelperToIdentifyTheProduct.model_json_schema()['properties']
+    assert (helper['cpe']['anyOf'][0]['pattern'], helper['cpe']['anyOf'][0]['minLength']) == (cpe.PATTERN, 5)
+    assert (helper['purl']['pattern'], helper['purl']['minLength']) == (purl.PATTERN, purl.MIN_LENGTH)
+
+
+def test_rule_reports_invalid_purls_everywhere_in_the_product_tree():
+    helper = {'purl': 'pkg:maven/@1.3.4'}
+    doc = {
+        'product_tree': {
+            'branches': [{'product': {'name': 'A', 'product_id': 'A', 'product_identification_helper': helper}}],
+            'full_product_names': [
+                {'name': 'B', 'product_id': 'B', 'product_identification_helper': {'purl': 'pkg:pypi/csaf'}},
+                {'name': 'C', 'product_id': 'C', 'product_identification_helper': helper},
+            ],
+        }
+    }
+    assert rules.is_valid_purls(doc) is False
+    assert [finding.pointers for finding in rules.evaluate(doc) if finding.rule == '6.1.13'] == [
+        (
+            '/product_tree/branches/0/product/product_identification_helper/purl',
+            '/product_tree/full_product_names/1/product_identification_helper/purl',
+        )
+    ]
+    doc['product_tree']['branches'] = []
+    doc['product_tree']['full_product_names'].pop()
+    assert rules.is_valid_purls(doc) is True
@@ -0,0 +1,28 @@
+import jmespath
+
+import csaf.csaf  # noqa: F401 registers the document verifier expressions
+import csaf.jmes as jmes
+import csaf.mandatory.translator_and_source_lang as tra_and_sou_lan
+
+DOC = {'document': {'publisher': {'category': 'translator'}, 'source_lang': 'de'}}
+
+
+def test_registry_holds_the_searched_expressions_only():
+    assert 'publisher.namespace' in jmes.REGISTRY
+    assert 'tracking.revision_history' in jmes.REGISTRY
+    assert tra_and_sou_lan.TRIGGER_JMES_PATH not in jmes.REGISTRY
+
+
+def test_compiled_known_expression_is_shared():
+    assert jmes.compiled('publisher.namespace') is jmes.REGISTRY['publisher.namespace']
+
+
+def test_compiled_dynamic_expression_is_cached():
+    expression = 'document.publisher.category || document.source_lang'
+    assert expression not in jmes.REGISTRY
+    assert jmes.compiled(expression) is jmes.compiled(expression)
+
+
+def test_search_matches_jmespath():
+    for expression in (tra_and_sou_lan.TRIGGER_JMES_PATH, tra_and_sou_lan.CONDITION_JMES_PATH, 'document.nope'):
+        assert jmes.search(expression, DOC) == jmespath.search(expression, DOC)
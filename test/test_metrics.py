@@ -0,0 +1,40 @@
+import csaf.metrics as metrics
+
+
+def _registry():
+    registry = metrics.Metrics()
+    registry.record('6.1.1', 0.004, False)
+    registry.record('6.1.1', 0.006, True)
+    registry.record('6.1.26', 0.001, True)
+    return registry
+
+
+def test_record_accumulates_per_rule():
+    stats = _registry().stats['6.1.1']
+    assert (stats.runs, stats.failures) == (2, 1)
+    assert abs(stats.mean_seconds() - 0.005) < 1e-12
+    assert stats.failure_rate() == 0.5
+
+
+def test_schedule_orders_by_expected_cost_and_unmeasured_first():
+    registry = _registry()
+    assert registry.schedule(['6.1.1', '6.1.26', '6.1.2'], str) == ['6.1.2', '6.1.26', '6.1.1']
+
+
+def test_since_and_merge_transfer_statistics():
+    registry = _registry()
+    before = registry.snapshot()
+    registry.record('6.1.26', 0.002, False)
+    registry.record('6.1.2', 0.003, False)
+    delta = registry.since(before)
+    assert sorted((stats.rule, stats.runs) for stats in delta) == [('6.1.2', 1), ('6.1.26', 1)]
+    other = metrics.Metrics()
+    other.merge(before)
+    other.merge(delta)
+    assert {rule: stats.runs for rule, stats in other.stats.items()} == {'6.1.1': 2, '6.1.26': 2, '6.1.2': 1}
+
+
+def test_as_table_lists_most_expensive_rules_first():
+    lines = _registry().as_table().splitlines()
+    assert lines[0].split() == ['rule', 'runs', 'failures', 'total', 'ms', 'mean', 'us']
+    assert [line.split()[0] for line in lines[1:]] == ['6.1.1', '6.1.26']
@@ -0,0 +1,84 @@
+from csaf.mandatory import products
+from csaf.mandatory.index import harvest
+from csaf.mandatory.products import Interned, ProductIndex, bits, located_in, members, product_index, repeated
+
+DOC = {
+    'product_tree': {
+        'full_product_names': [
+            {'name': 'A', 'product_id': 'CSAFPID-1'},
+            {'name': 'B', 'product_id': 'CSAFPID-2'},
+            {'name': 'A again', 'product_id': 'CSAFPID-1'},
+        ],
+        'product_groups': [{'group_id': 'CSAFGID-1', 'product_ids': ['CSAFPID-1', 'CSAFPID-3']}],
+    },
+    'vulnerabilities': [
+        {
+            'product_status': {'known_affected': ['CSAFPID-1'], 'fixed': ['CSAFPID-2', 'CSAFPID-3']},
+            'remediations': [{'category': 'none_available', 'details': 'x', 'group_ids': ['CSAFGID-9']}],
+        }
+    ],
+}
+
+
+def test_bits_and_members_round_trip():
+    codes = {0, 7, 8, 63, 64, 50_000}
+    bitset = bits(codes, 50_001)
+    assert bitset == sum(1 << code for code in codes)
+    assert members(bitset) == codes
+    assert members(0) == set()
+
+
+def test_repeated():
+    assert members(repeated([3, 1, 3, 2, 3, 1], 4)) == {1, 3}
+    assert repeated([0, 1, 2], 3) == 0
+
+
+def test_interned_codes_in_order_of_first_sight():
+    interned = Interned()
+    assert list(interned.encode([('/a', 'x'), ('/b', 'y'), ('/c', 'x')])) == [0, 1, 0]
+    assert list(interned.encode([('/d', 'z'), ('/e', 'y')])) == [2, 1]
+    assert (len(interned), interned.names, interned.codes['z']) == (3, ['x', 'y', 'z'], 2)
+
+
+def test_product_index_interns_definitions_first():
+    index = harvest(DOC)
+    interned = ProductIndex(index)
+    assert interned.products.names == ['CSAFPID-1', 'CSAFPID-2', 'CSAFPID-3']
+    assert list(interned.product_ids) == [0, 1, 0]
+    assert interned.defined_products == 0b011
+    assert interned.undefined_products() == 0b100
+    assert interned.undefined_groups() == 0b10
+    assert interned.statuses[0]['known_affected'] == 0b001
+    assert interned.statuses[0]['fixed'] == 0b110
+    assert interned.statuses[0]['under_investigation'] == 0
+    assert located_in(index.product_refs, interned.product_refs, interned.undefined_products()) == (
+        '/product_tree/product_groups/0/product_ids/1',
+        '/vulnerabilities/0/product_status/fixed/1',
+    )
+    assert located_in(index.product_refs, interned.product_refs, 0) == ()
+
+
+def test_product_index_built_once_per_index(monkeypatch):
+    index = harvest(DOC)
+    built = []
+    original = products.ProductIndex
+    monkeypatch.setattr(products, 'ProductIndex', lambda index: built.append(index) or original(index))
+    assert product_index(index) is product_index(index)
+    assert built == [index]
+
+
+def test_product_index_scales_to_many_products():
+    count = 50_000
+    ids = [f'CSAFPID-{n}' for n in range(count)]
+    doc = {
+        'product_tree': {'full_product_names': [{'name': 'P', 'product_id': an_id} for an_id in ids]},
+        'vulnerabilities': [
+            {'product_status': {'known_affected': ids[::2], 'known_not_affected': ids[1::2], 'fixed': ids[-1:]}}
+            for _ in range(3)
+        ],
+    }
+    interned = product_index(harvest(doc))
+    assert interned.undefined_products() == 0
+    statuses = interned.statuses[2]
+    assert statuses['known_affected'] & statuses['known_not_affected'] == 0
+    assert members(statuses['known_not_affected'] & statuses['fixed']) == {count - 1}
@@ -0,0 +1,94 @@
+import json
+import types
+
+import pytest
+
+import csaf.csaf as api
+import csaf.registry as registry
+from csaf.mandatory import rules
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH
+
+
+OPTIONAL = types.SimpleNamespace(ID=(6, 2, 99), TOPIC='Missing Title Suffix', PATHS=('/document/title',))
+
+
+def _missing_suffix(index):
+    title = index.document.get('document', {}).get('title', '')
+    return () if title.endswith('!') else ('/document/title',)
+
+
+@pytest.fixture
+def known(monkeypatch):
+    monkeypatch.setattr(registry.REGISTRY, 'known', dict(registry.REGISTRY.known))
+    return registry.REGISTRY.known
+
+
+def test_mandatory_rules_registered_cheapest_first():
+    assert [rule.rule for rule in registry.REGISTRY.rules()] == [
+        '6.1.26',
+        '6.1.15',
+        '6.1.2',
+        '6.1.5',
+        '6.1.1',
+        '6.1.4',
+        '6.1.13',
+        '6.1.3',
+        '6.1.6',
+        '6.1.10',
+        '6.1.9',
+    ]
+    assert {rule.severity for rule in registry.REGISTRY.rules()} == {'error'}
+    assert registry.REGISTRY.rules(('informative',)) == ()
+
+
+def test_add_derives_profile_and_severity_from_section(known):
+    rule = registry.REGISTRY.add(OPTIONAL, 'title lacks suffix', _missing_suffix)
+    assert (rule.rule, rule.profile, rule.severity, rule.paths) == ('6.2.99', 'optional', 'warning', OPTIONAL.PATHS)
+    assert registry.REGISTRY.rules(('optional',)) == (rule,)
+    with pytest.raises(ValueError, match='7.1.1'):
+        registry.section_profile((7, 1, 1))
+
+
+def test_evaluate_optional_findings_do_not_fail_advisories(known):
+    registry.REGISTRY.add(OPTIONAL, 'title lacks suffix', _missing_suffix)
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    assert rules.evaluate(doc) == ()
+    findings = rules.evaluate(doc, profiles=registry.PROFILES)
+    assert [(finding.rule, finding.severity) for finding in findings] == [('6.2.99', 'warning')]
+
+    result = api.assess('validate', 'commit', str(CSAF_EXAMPLE_COM_123_PATH), {'profiles': ('mandatory', 'optional')})
+    assert (result.code, result.message, result.findings) == (0, '', findings)
+    assert api.assess('validate', 'commit', str(CSAF_EXAMPLE_COM_123_PATH), {'profiles': ('none',)}).code == 2
+
+
+def test_discover_loads_plugins_once_and_skips_broken_ones(known, monkeypatch):
+    def register_rules(target):
+        target.add(OPTIONAL, 'title lacks suffix', _missing_suffix)
+
+    def broken():
+        raise ImportError('no such module')
+
+    plugins = [
+        types.SimpleNamespace(name='acme', load=lambda: register_rules),
+        types.SimpleNamespace(name='broken', load=broken),
+    ]
+    monkeypatch.setattr(registry, '_entry_points', lambda: plugins)
+    monkeypatch.setattr(registry.REGISTRY, 'discovered', False)
+    assert [rule.rule for rule in registry.REGISTRY.rules(('optional',))] == ['6.2.99']
+    plugins.clear()
+    known.pop('6.2.99')
+    assert registry.REGISTRY.rules(('optional',)) == ()
+
+
+@pytest.mark.parametrize(
+    'text, profiles',
+    [('mandatory', ('mandatory',)), (' Optional, mandatory,optional', ('optional', 'mandatory'))],
+)
+def test_parse_profiles(text, profiles):
+    assert registry.parse_profiles(text) == profiles
+
+
+@pytest.mark.parametrize('text', ['', 'mandatory,recommended'])
+def test_parse_profiles_rejects_unknown_names(text):
+    with pytest.raises(ValueError, match='unknown rule profiles'):
+        registry.parse_profiles(text)
@@ -0,0 +1,48 @@
+import msgspec
+
+import csaf.result as result
+
+FINDING = result.Finding(
+    rule='6.1.1',
+    topic='Missing Definition of Product ID',
+    message='undefined product ids',
+    pointers=('/vulnerabilities/0/product_status/known_affected/0',),
+)
+RESULTS = [
+    result.Result(path='a.json', code=0, message=''),
+    result.Result(path='bb.json', code=1, message='undefined product ids', findings=(FINDING,)),
+    result.Result(path='ccc.json', code=1, message='advisory is too short to be valid'),
+]
+
+
+def test_rule_id():
+    assert result.rule_id((6, 1, 26)) == '6.1.26'
+
+
+def test_as_table_failures_only():
+    code, table = result.as_table(RESULTS, failures_only=True)
+    assert code == 1
+    assert 'a.json ' not in table
+    assert table.endswith('validated 3 advisories: 1 passed, 2 failed\n')
+
+
+def test_as_json_round_trip():
+    assert msgspec.json.decode(result.as_json(RESULTS), type=list[result.Result]) == RESULTS
+
+
+def test_as_sarif():
+    log = msgspec.json.decode(result.as_sarif(RESULTS))
+    assert log['version'] == '2.1.0'
+    run = log['runs'][0]
+    assert [rule['id'] for rule in run['tool']['driver']['rules']] == ['6.1.1', result.GENERAL_RULE]
+    first, second = run['results']
+    assert first['ruleId'] == '6.1.1'
+    assert first['level'] == 'error'
+    assert first['locations'][0]['physicalLocation']['artifactLocation']['uri'] == 'bb.json'
+    assert first['locations'][0]['logicalLocations'] == [{'fullyQualifiedName': FINDING.pointers[0]}]
+    assert second['ruleId'] == result.GENERAL_RULE
+    assert 'logicalLocations' not in second['locations'][0]
+
+
+def test_worst_of_none():
+    assert result.worst([]) == 0
@@ -0,0 +1,365 @@
+import copy
+import sys
+from test import conftest
+
+import msgspec
+
+import csaf.mandatory.acyclic_product_ids as acy_pro_ids
+import csaf.metrics as metrics
+import csaf.mandatory.rules as rules
+from csaf.mandatory.index import branch_products, harvest
+
+FAILED_DEFINED_PRODUCT_IDS_PATH = conftest.FIXTURES / 'user' / 'failed_is_valid_defined_product_ids.json'
+
+PRODUCT_TREE_DEEP = {
+    'branches': [
+        {
+            'category': 'vendor',
+            'name': 'ACME',
+            'branches': [
+                {
+                    'category': 'product_name',
+                    'name': 'Rocket',
+                    'branches': [
+                        {
+                            'category': 'product_version',
+                            'name': '1',
+                            'product': {'name': 'Rocket 1', 'product_id': 'CSAFPID-1'},
+                        },
+                        {
+                            'category': 'product_version',
+                            'name': '2',
+                            'product': {'name': 'Rocket 2', 'product_id': 'CSAFPID-2'},
+                        },
+                    ],
+                },
+            ],
+        },
+        {
+            'category': 'vendor',
+            'name': 'Other',
+            'product': {'name': 'Other', 'product_id': 'CSAFPID-3'},
+        },
+    ],
+    'full_product_names': [{'name': 'Product A', 'product_id': 'CSAFPID-4'}],
+    'product_groups': [{'group_id': 'CSAFGID-1', 'product_ids': ['CSAFPID-1', 'CSAFPID-2']}],
+    'relationships': [
+        {
+            'category': 'installed_on',
+            'full_product_name': {'name': 'Rocket 1 on Product A', 'product_id': 'CSAFPID-5'},
+            'product_reference': 'CSAFPID-1',
+            'relates_to_product_reference': 'CSAFPID-4',
+        }
+    ],
+}
+
+VULNERABILITIES = [
+    {
+        'product_status': {'known_affected': ['CSAFPID-1', 'CSAFPID-5'], 'fixed': ['CSAFPID-2']},
+        'remediations': [
+            {'category': 'vendor_fix', 'details': 'Update.', 'product_ids': ['CSAFPID-1'], 'group_ids': ['CSAFGID-1']}
+        ],
+        'threats': [{'category': 'impact', 'details': 'Boom.', 'group_ids': ['CSAFGID-1']}],
+    }
+]
+
+
+def _doc(**members):
+    doc = {'document': copy.deepcopy(conftest.META_OK), 'product_tree': copy.deepcopy(PRODUCT_TREE_DEEP)}
+    doc['vulnerabilities'] = copy.deepcopy(VULNERABILITIES)
+    doc.update(members)
+    return doc
+
+
+def test_harvest_finds_all_definitions_with_pointers():
+    index = harvest(_doc())
+    assert index.product_ids == [
+        ('/product_tree/branches/0/branches/0/branches/0/product/product_id', 'CSAFPID-1'),
+        ('/product_tree/branches/0/branches/0/branches/1/product/product_id', 'CSAFPID-2'),
+        ('/product_tree/branches/1/product/product_id', 'CSAFPID-3'),
+        ('/product_tree/full_product_names/0/product_id', 'CSAFPID-4'),
+        ('/product_tree/relationships/0/full_product_name/product_id', 'CSAFPID-5'),
+    ]
+    assert index.group_ids == [('/product_tree/product_groups/0/group_id', 'CSAFGID-1')]
+    assert ('/vulnerabilities/0/product_status/known_affected/1', 'CSAFPID-5') in index.product_refs
+    assert index.group_refs == [
+        ('/vulnerabilities/0/remediations/0/group_ids/0', 'CSAFGID-1'),
+        ('/vulnerabilities/0/threats/0/group_ids/0', 'CSAFGID-1'),
+    ]
+    assert index.relationships == [('/product_tree/relationships/0', 'CSAFPID-5', 'CSAFPID-1', 'CSAFPID-4')]
+    assert [value for _, value in index.statuses[0]['known_affected']] == ['CSAFPID-1', 'CSAFPID-5']
+
+
+def test_harvest_tolerates_schema_violations():
+    index = harvest({'document': [], 'product_tree': {'branches': 42}, 'vulnerabilities': [None, {'scores': 'x'}]})
+    assert index.product_ids == []
+    assert len(index.statuses) == 2
+
+
+def test_branch_products_visits_every_branch_in_document_order():
+    branches = copy.deepcopy(PRODUCT_TREE_DEEP['branches'])
+    branches[0]['branches'].append({'category': 'product_name', 'name': 'Late', 'product': {'product_id': 'CSAFPID-6'}})
+    assert [(pointer, product['product_id']) for pointer, product in branch_products(branches)] == [
+        ('/product_tree/branches/0/branches/0/branches/0/product', 'CSAFPID-1'),
+        ('/product_tree/branches/0/branches/0/branches/1/product', 'CSAFPID-2'),
+        ('/product_tree/branches/0/branches/1/product', 'CSAFPID-6'),
+        ('/product_tree/branches/1/product', 'CSAFPID-3'),
+    ]
+    assert list(branch_products(None)) == []
+
+
+def test_branch_products_beyond_recursion_limit():
+    depth = 2 * sys.getrecursionlimit()
+    leaf = {'category': 'product_version', 'name': 'leaf', 'product': {'product_id': 'CSAFPID-DEEP'}}
+    for _ in range(depth):
+        leaf = {'category': 'vendor', 'name': 'nested', 'branches': [leaf]}
+    (pointer, product), *more = branch_products([leaf], '')
+    assert not more
+    assert product['product_id'] == 'CSAFPID-DEEP'
+    assert pointer == '/0' + '/branches/0' * depth + '/product'
+
+
+def test_is_valid_ok():
+    assert rules.is_valid(_doc()) is NotImplemented
+
+
+def test_is_valid_fixture_defined_in_branches():
+    with open(FAILED_DEFINED_PRODUCT_IDS_PATH, 'rb') as handle:
+        doc = msgspec.json.decode(handle.read())
+    assert rules.is_valid_defined_product_ids(doc) is True
+    assert rules.is_valid(doc) is NotImplemented
+
+
+def test_is_valid_unique_product_ids_deep_branch_duplicate():
+    doc = _doc()
+    doc['product_tree']['full_product_names'][0]['product_id'] = 'CSAFPID-2'
+    assert rules.is_valid_unique_product_ids(doc) is False
+    assert rules.is_valid(doc) is False
+
+
+def test_is_valid_unique_group_ids():
+    doc = _doc()
+    doc['product_tree']['product_groups'].append({'group_id': 'CSAFGID-1', 'product_ids': ['CSAFPID-3', 'CSAFPID-4']})
+    assert rules.is_valid_unique_group_ids(doc) is False
+
+
+def test_is_valid_defined_product_ids():
+    doc = _doc()
+    doc['vulnerabilities'][0]['scores'] = [{'products': ['CSAFPID-9080700']}]
+    assert rules.is_valid_defined_product_ids(doc) is False
+    assert rules.is_valid(doc) is False
+
+
+def test_is_valid_defined_group_ids():
+    doc = _doc()
+    doc['vulnerabilities'][0]['threats'][0]['group_ids'] = ['CSAFGID-1020301']
+    assert rules.is_valid_defined_group_ids(doc) is False
+
+
+def test_is_valid_translator():
+    doc = _doc()
+    assert rules.is_valid_translator(doc) is True
+    doc['document']['publisher']['category'] = 'translator'
+    assert rules.is_valid_translator(doc) is False
+    doc['document']['source_lang'] = 'de'
+    assert rules.is_valid_translator(doc) is True
+
+
+def test_is_valid_category():
+    doc = _doc()
+    doc['document']['category'] = 'Security_Incident_Response'
+    assert rules.is_valid_category(doc) is False
+
+
+def _relationship(product_id, product_reference, relates_to):
+    return {
+        'category': 'installed_on',
+        'full_product_name': {'name': product_id, 'product_id': product_id},
+        'product_reference': product_reference,
+        'relates_to_product_reference': relates_to,
+    }
+
+
+def test_is_valid_acyclic_product_ids_self_reference():
+    doc = _doc()
+    doc['product_tree']['relationships'].append(_relationship('CSAFPID-6', 'CSAFPID-4', 'CSAFPID-6'))
+    assert rules.is_valid_acyclic_product_ids(doc) is False
+    assert rules._offending_circular_product_ids(harvest(doc)) == (
+        '/product_tree/relationships/1/full_product_name/product_id',
+    )
+
+
+def test_is_valid_acyclic_product_ids_cycle_and_diamond():
+    doc = _doc()
+    doc['product_tree']['relationships'] = [
+        _relationship('CSAFPID-6', 'CSAFPID-5', 'CSAFPID-7'),
+        _relationship('CSAFPID-7', 'CSAFPID-5', 'CSAFPID-4'),
+        _relationship('CSAFPID-5', 'CSAFPID-1', 'CSAFPID-4'),
+    ]
+    assert rules.is_valid_acyclic_product_ids(doc) is True
+    doc['product_tree']['relationships'][2]['relates_to_product_reference'] = 'CSAFPID-6'
+    assert rules._offending_circular_product_ids(harvest(doc)) == tuple(
+        f'/product_tree/relationships/{pos}/full_product_name/product_id' for pos in range(3)
+    )
+
+
+def test_is_valid_acyclic_product_ids_long_chain_without_recursion():
+    size = 5 * sys.getrecursionlimit()
+    relationships = [_relationship(f'R-{pos}', f'R-{pos + 1}', 'CSAFPID-4') for pos in range(size)]
+    relationships.append(_relationship(f'R-{size}', 'CSAFPID-1', 'CSAFPID-4'))
+    doc = _doc()
+    doc['product_tree']['relationships'] = relationships
+    assert rules.is_valid_acyclic_product_ids(doc) is True
+    relationships[-1]['product_reference'] = 'R-0'
+    assert len(rules._offending_circular_product_ids(harvest(doc))) == size + 1
+
+
+def test_circular_ignores_leaves_and_finds_components():
+    assert acy_pro_ids.circular({}) == set()
+    assert acy_pro_ids.circular({'a': ['b', 'leaf'], 'b': ['c'], 'c': ['a'], 'd': ['a']}) == {'a', 'b', 'c'}
+    assert acy_pro_ids.circular({'a': ['a'], 'b': ['a']}) == {'a'}
+
+
+def test_is_valid_consistent_product_status():
+    doc = _doc()
+    status = doc['vulnerabilities'][0]['product_status']
+    status['recommended'] = ['CSAFPID-1']
+    assert rules.is_valid_consistent_product_status(doc) is True
+    status['known_not_affected'] = ['CSAFPID-4', 'CSAFPID-1']
+    status['last_affected'] = ['CSAFPID-5']
+    assert rules._offending_product_status(harvest(doc)) == (
+        '/vulnerabilities/0/product_status/known_affected/0',
+        '/vulnerabilities/0/product_status/known_not_affected/1',
+    )
+
+
+def test_is_valid_consistent_product_status_per_vulnerability():
+    doc = _doc()
+    doc['vulnerabilities'] = [
+        {'product_status': {'fixed': [f'CSAFPID-{n}' for n in range(5000)]}},
+        {'product_status': {'known_affected': [f'CSAFPID-{n}' for n in range(5000)]}},
+    ]
+    assert rules.is_valid_consistent_product_status(doc) is True
+    doc['vulnerabilities'][1]['product_status']['first_fixed'] = ['CSAFPID-4999']
+    assert rules._offending_product_status(harvest(doc)) == (
+        '/vulnerabilities/1/product_status/known_affected/4999',
+        '/vulnerabilities/1/product_status/first_fixed/0',
+    )
+
+
+def test_evaluate_reports_all_failing_rules_with_pointers():
+    doc = _doc()
+    doc['document']['category'] = 'veX'
+    doc['product_tree']['full_product_names'][0]['product_id'] = 'CSAFPID-2'
+    doc['vulnerabilities'][0]['threats'][0]['group_ids'] = ['CSAFGID-1020301']
+    findings = rules.evaluate(doc)
+    assert [finding.rule for finding in findings] == ['6.1.26', '6.1.2', '6.1.1', '6.1.4']
+    assert findings[0].pointers == ('/document/category',)
+    assert findings[1].pointers == (
+        '/product_tree/branches/0/branches/0/branches/1/product/product_id',
+        '/product_tree/full_product_names/0/product_id',
+    )
+    assert findings[2].topic == 'Missing Definition of Product ID'
+    assert findings[2].pointers == ('/product_tree/relationships/0/relates_to_product_reference',)
+    assert findings[3].pointers == ('/vulnerabilities/0/threats/0/group_ids/0',)
+    assert all(finding.severity == 'error' for finding in findings)
+
+
+def test_evaluate_ok():
+    assert rules.evaluate(_doc()) == ()
+
+
+def test_evaluate_bails_out_at_first_failing_rule(monkeypatch):
+    monkeypatch.setattr(metrics, 'REGISTRY', metrics.Metrics())
+    doc = _doc()
+    doc['document']['category'] = 'veX'
+    doc['vulnerabilities'][0]['threats'][0]['group_ids'] = ['CSAFGID-1020301']
+    assert [finding.rule for finding in rules.evaluate(doc, bail_out=True)] == ['6.1.26']
+    assert [finding.rule for finding in rules.evaluate(doc)] == ['6.1.26', '6.1.4']
+
+
+def test_evaluate_records_metrics_and_schedules_by_cost_when_bailing_out(monkeypatch):
+    registry = metrics.Metrics()
+    monkeypatch.setattr(metrics, 'REGISTRY', registry)
+    doc = _doc()
+    doc['document']['category'] = 'veX'
+    doc['vulnerabilities'][0]['threats'][0]['group_ids'] = ['CSAFGID-1020301']
+    rules.evaluate(doc)
+    assert registry.stats['6.1.26'].runs == registry.stats['6.1.4'].runs == 1
+    assert registry.stats['6.1.4'].failures == 1
+    registry.stats['6.1.26'].seconds = 1.0
+    assert [finding.rule for finding in rules.evaluate(doc, bail_out=True)] == ['6.1.4']
+
+
+def test_is_valid_cvss_computation():
+    doc = _doc()
+    doc['vulnerabilities'][0]['scores'] = [
+        {'products': ['CSAFPID-1'], **copy.deepcopy(conftest.VULNERABILITY_SCORE_LOG4J)}
+    ]
+    assert rules.is_valid_cvss_computation(doc) is True
+    assert rules.is_valid_consistent_cvss(doc) is True
+    doc['vulnerabilities'][0]['scores'][0]['cvss_v2'] = {
+        'version': '2.0',
+        'vectorString': 'AV:N/AC:L/Au:N/C:P/I:P/A:P/E:F/RL:OF/RC:C',
+        'baseScore': 7.5,
+        'temporalScore': 6.2,
+    }
+    assert rules.is_valid_cvss_computation(doc) is True
+    doc['vulnerabilities'][0]['scores'][0]['cvss_v3'] = {
+        'version': '3.1',
+        'vectorString': 'CVSS:3.1/AV:L/AC:L/PR:H/UI:R/S:U/C:H/I:H/A:H',
+        'baseScore': 10.0,
+        'baseSeverity': 'LOW',
+    }
+    assert rules._offending_cvss_computation(harvest(doc)) == (
+        '/vulnerabilities/0/scores/0/cvss_v3/baseScore',
+        '/vulnerabilities/0/scores/0/cvss_v3/baseSeverity',
+    )
+
+
+def test_is_valid_consistent_cvss():
+    doc = _doc()
+    cvss_v3 = {
+        'version': '3.0',
+        'vectorString': 'CVSS:3.1/AV:L/AC:L/PR:H/UI:R/S:U/C:H/I:H/A:H',
+        'attackVector': 'NETWORK',
+        'attackComplexity': 'LOW',
+        'privilegesRequired': 'NONE',
+        'userInteraction': 'NONE',
+        'scope': 'CHANGED',
+        'confidentialityImpact': 'HIGH',
+        'integrityImpact': 'HIGH',
+        'availabilityImpact': 'LOW',
+        'exploitCodeMaturity': 'NOT_DEFINED',
+        'modifiedScope': 'CHANGED',
+        'baseScore': 9.6,
+        'baseSeverity': 'CRITICAL',
+    }
+    doc['vulnerabilities'][0]['scores'] = [{'products': ['CSAFPID-1'], 'cvss_v3': cvss_v3}]
+    pointer = '/vulnerabilities/0/scores/0/cvss_v3'
+    assert rules._offending_cvss_properties(harvest(doc)) == tuple(
+        f'{pointer}/{name}'
+        for name in (
+            'version',
+            'attackVector',
+            'privilegesRequired',
+            'userInteraction',
+            'scope',
+            'availabilityImpact',
+            'modifiedScope',
+        )
+    )
+    cvss_v3['vectorString'] = 'CVSS:3.0/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:L/MS:C'
+    assert rules.is_valid_consistent_cvss(doc) is True
+
+
+def test_cvss_rules_skip_invalid_vectors():
+    doc = _doc()
+    doc['vulnerabilities'][0]['scores'] = [
+        {
+            'products': ['CSAFPID-1'],
+            'cvss_v2': {'vectorString': 'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H', 'baseScore': 1.0},
+            'cvss_v3': {'vectorString': 'CVSS:3.1/AV:N/AC:L', 'baseScore': 1.0, 'attackVector': 'LOCAL'},
+        }
+    ]
+    assert rules.evaluate(doc) == ()
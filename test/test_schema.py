@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from referencing.exceptions import Unresolvable
+
+import csaf.csaf as api
+import csaf.schema as schema
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH
+
+
+def test_registry_resolves_bundled_schemas_only():
+    resolver = schema.registry().resolver()
+    for uri in schema.CVSS_SCHEMA_IDS.values():
+        assert resolver.lookup(uri).contents['type'] == 'object'
+    with pytest.raises(Unresolvable):
+        resolver.lookup('https://example.com/not/bundled.json')
+
+
+def test_validator_is_built_once():
+    assert schema.validator() is schema.validator()
+    assert schema.registry() is schema.registry()
+
+
+def test_validate_conforming_document():
+    assert schema.validate(json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())) == ()
+
+
+def test_validate_reports_pointers_in_document_order():
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['vulnerabilities'] = [{'cve': 'CVE-22-1', 'scores': [{'products': ['a'], 'cvss_v3': {'version': '3.1'}}]}]
+    findings = schema.validate(doc)
+    assert [finding.pointers for finding in findings] == [
+        ('/vulnerabilities/0/cve',),
+        ('/vulnerabilities/0/scores/0/cvss_v3',),
+    ]
+    assert all(finding.rule == schema.SCHEMA_RULE for finding in findings)
+
+
+def test_validate_orders_array_indices_numerically():
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['vulnerabilities'] = [{'cve': 'CVE-22-1' if pos in (2, 10) else f'CVE-2022-{pos:04d}'} for pos in range(11)]
+    findings = schema.validate(doc)
+    assert [finding.pointers for finding in findings] == [('/vulnerabilities/2/cve',), ('/vulnerabilities/10/cve',)]
+    assert schema.order(['b', 10, 'a']) > schema.order(['b', 2, 'z'])
+
+
+def test_pointer_escapes_tokens():
+    assert schema.pointer(['a/b', 'c~d', 0]) == '/a~1b/c~0d/0'
+    assert schema.pointer([]) == ''
+
+
+def test_assess_with_schema_option():
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['vulnerabilities'] = [{'cve': 'CVE-22-1'}]
+    data = json.dumps(doc).encode()
+    assert api.assess_buffer('x.json', data).code == 0
+    result = api.assess_buffer('x.json', data, schema=True)
+    assert result.code == 1
+    assert result.message == 'advisory fails schema validation'
+    assert result.findings[0].pointers == ('/vulnerabilities/0/cve',)
+    assert api.assess('validate', 'commit', str(CSAF_EXAMPLE_COM_123_PATH), {'schema': True}).code == 0
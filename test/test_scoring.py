@@ -0,0 +1,114 @@
+from array import array
+
+import pytest
+
+from test import conftest
+
+import csaf.scoring as scoring
+
+VECTOR_V31_LOW = 'CVSS:3.1/AV:L/AC:L/PR:H/UI:R/S:U/C:H/I:H/A:H'
+VECTORS = {
+    conftest.CVSS31_VECTOR_STRING_LOG4J: (10.0, 10.0, 10.0),
+    conftest.CVSS30_VECTOR_STRING_LOG4J: (10.0, 10.0, 10.0),
+    VECTOR_V31_LOW: (6.5, 6.5, 6.5),
+    'CVSS:3.1/AV:N/AC:L/PR:L/UI:N/S:C/C:L/I:L/A:N': (6.4, 6.4, 6.4),
+    'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H/E:P/RL:O/RC:C': (9.8, 8.8, 8.8),
+    'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H/CR:L/IR:L/AR:L/MAV:L/MS:C': (9.8, 9.8, 7.6),
+    'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:N/I:N/A:N': (0.0, 0.0, 0.0),
+    conftest.CVSS2_VECTOR_STRING_LOG4J: (9.3, 9.3, 9.3),
+    'AV:N/AC:L/Au:N/C:P/I:P/A:P/E:F/RL:OF/RC:C': (7.5, 6.2, 6.2),
+    'AV:N/AC:L/Au:N/C:N/I:N/A:C/E:F/RL:OF/RC:C/CDP:H/TD:H/CR:M/IR:M/AR:H': (7.8, 6.4, 9.2),
+}
+
+
+@pytest.mark.parametrize('vector,expected', VECTORS.items())
+def test_compute(vector, expected):
+    scores = scoring.compute(scoring.parse(vector))
+    assert (scores.base, scores.temporal, scores.environmental) == expected
+
+
+def test_compute_many_matches_compute_in_order():
+    parsed = [scoring.parse(vector) for vector in VECTORS for _ in range(3)]
+    assert scoring.compute_many(parsed) == [scoring.compute(one) for one in parsed]
+    assert scoring.compute_many([]) == []
+
+
+def test_score_columns():
+    rows = [scoring.parse(conftest.CVSS31_VECTOR_STRING_LOG4J)[1], scoring.parse(VECTOR_V31_LOW)[1]]
+    codes = scoring.columns('3.1', rows)
+    assert len(codes) == len(scoring.METRICS['3.1'])
+    assert all(isinstance(column, array) and len(column) == 2 for column in codes)
+    base, temporal, environmental = scoring.score_columns('3.1', codes)
+    assert [list(base), list(temporal), list(environmental)] == [[10.0, 6.5]] * 3
+
+
+def test_base_table_covers_all_combinations():
+    assert len(scoring.base_table('2.0')) == 3**6
+    assert len(scoring.base_table('3.1')) == 4 * 2 * 3 * 2 * 2 * 3 * 3 * 3
+    assert max(scoring.base_table('3.0')) == 10.0
+
+
+def test_properties():
+    expanded = scoring.properties(scoring.parse('CVSS:3.0/AV:P/AC:H/PR:L/UI:R/S:U/C:L/I:N/A:H/E:U/MPR:H'))
+    assert expanded['version'] == '3.0'
+    assert expanded['attackVector'] == 'PHYSICAL'
+    assert expanded['exploitCodeMaturity'] == 'UNPROVEN'
+    assert expanded['remediationLevel'] == 'NOT_DEFINED'
+    assert expanded['modifiedPrivilegesRequired'] == 'HIGH'
+    assert expanded['modifiedScope'] == 'NOT_DEFINED'
+    expanded = scoring.properties(scoring.parse('AV:A/AC:M/Au:S/C:P/I:N/A:C/CDP:LM'))
+    assert expanded['authentication'] == 'SINGLE'
+    assert expanded['collateralDamagePotential'] == 'LOW_MEDIUM'
+    assert expanded['targetDistribution'] == 'NOT_DEFINED'
+
+
+@pytest.mark.parametrize(
+    'score,rating', [(0.0, 'NONE'), (0.1, 'LOW'), (3.9, 'LOW'), (4.0, 'MEDIUM'), (7.0, 'HIGH'), (9.0, 'CRITICAL')]
+)
+def test_severity(score, rating):
+    assert scoring.severity(score) == rating
+
+
+@pytest.mark.parametrize(
+    'vector,message',
+    [
+        ('CVSS:4.0/AV:N', 'unknown CVSS version'),
+        ('CVSS:2.0/AV:N/AC:L/Au:N/C:P/I:P/A:P', 'unknown CVSS version'),
+        ('CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H/Au:N', 'unknown CVSS 3.1 metric'),
+        ('CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H/AV:L', 'repeated CVSS 3.1 metric'),
+        ('CVSS:3.1/AV:X/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H', 'invalid value of CVSS 3.1 metric'),
+        ('CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C', r'missing CVSS 3.1 base metrics \(C, I, A\)'),
+        ('AV:N/AC:L/Au:N/C:P/I:P', r'missing CVSS 2.0 base metrics \(A\)'),
+        ('', 'unknown CVSS 2.0 metric'),
+    ],
+)
+def test_parse_rejects_invalid_vectors(vector, message):
+    with pytest.raises(ValueError, match=message):
+        scoring.parse(vector)
+
+
+def test_lookup_interns_parsed_vectors_and_scores():
+    scoring.lookup.cache_clear()
+    vector = scoring.lookup(conftest.CVSS31_VECTOR_STRING_LOG4J)
+    assert vector.matches == '3.1'
+    assert vector.parsed == scoring.parse(conftest.CVSS31_VECTOR_STRING_LOG4J)
+    assert vector.scores == scoring.Scores(base=10.0, temporal=10.0, environmental=10.0)
+    assert scoring.lookup(conftest.CVSS31_VECTOR_STRING_LOG4J) is vector
+    info = scoring.lookup.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (1, 1, scoring.MEMO_SIZE)
+
+
+@pytest.mark.parametrize(
+    'text,matches,valid',
+    [
+        (conftest.CVSS2_VECTOR_STRING_LOG4J, '2.0', True),
+        (conftest.CVSS30_VECTOR_STRING_LOG4J, '3.0', True),
+        ('CVSS:3.1/AV:N/AC:L', '3.1', False),  # matches the schema pattern but lacks base metrics
+        ('CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H/', '', False),
+        ('CVSS:4.0/AV:N', '', False),
+    ],
+)
+def test_lookup_matches_schema_pattern(text, matches, valid):
+    vector = scoring.lookup(text)
+    assert vector.matches == matches
+    assert (vector.parsed is not None, vector.scores is not None) == (valid, valid)
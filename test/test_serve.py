@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import pathlib
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+
+import csaf.serve as serve
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH
+
+
+async def _request(connect, method, target, body=b''):
+    reader, writer = await connect()
+    head = f'{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n'
+    writer.write(head.encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, payload = response.partition(b'\r\n')
+    return int(status_line.split()[1]), json.loads(payload.partition(b'\r\n\r\n')[2])
+
+
+@pytest_asyncio.fixture
+async def service(tmp_path):
+    started = asyncio.get_running_loop().create_future()
+    unix_socket = str(tmp_path / 'csaf.sock')
+    task = asyncio.create_task(serve.serve(port=0, unix_socket=unix_socket, started=started))
+    servers = await started
+    port = servers[0].sockets[0].getsockname()[1]
+    yield (lambda: asyncio.open_connection('127.0.0.1', port)), (lambda: asyncio.open_unix_connection(unix_socket))
+    task.cancel()
+    await task
+    assert not pathlib.Path(unix_socket).exists()
+
+
+@pytest.mark.asyncio
+async def test_validate_over_tcp_and_unix_socket(service):
+    tcp, unix = service
+    status, result = await _request(
+        tcp, 'POST', '/validate?engine=msgspec&schema=1', CSAF_EXAMPLE_COM_123_PATH.read_bytes()
+    )
+    assert status == HTTPStatus.OK
+    assert result == {'path': serve.SUBMISSION_NAME, 'code': 0, 'message': '', 'findings': []}
+
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['document']['category'] = 'veX'
+    status, result = await _request(unix, 'POST', '/validate?name=veX.json', json.dumps(doc).encode())
+    assert status == HTTPStatus.OK
+    assert result['path'] == 'veX.json'
+    assert result['code'] == 1
+    assert result['findings'][0]['rule'] == '6.1.26'
+
+
+@pytest.mark.asyncio
+async def test_health_and_errors(service):
+    tcp, _ = service
+    status, health = await _request(tcp, 'GET', '/health')
+    assert status == HTTPStatus.OK
+    assert health['status'] == 'ok'
+    assert (await _request(tcp, 'GET', '/validate'))[0] == HTTPStatus.METHOD_NOT_ALLOWED
+    assert (await _request(tcp, 'POST', '/nowhere'))[0] == HTTPStatus.NOT_FOUND
+    assert (await _request(tcp, 'POST', '/validate?engine=fast', b'{}'))[0] == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_read_request_rejects_oversized_bodies(monkeypatch):
+    monkeypatch.setattr(serve, 'MAX_BODY_BYTES', 10)
+    reader = asyncio.StreamReader()
+    reader.feed_data(b'POST /validate HTTP/1.1\r\nContent-Length: 11\r\n\r\n')
+    with pytest.raises(serve.BadRequest) as caught:
+        await serve.read_request(reader)
+    assert caught.value.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+@pytest.mark.asyncio
+async def test_broken_worker_pool_answers_internal_server_error_and_is_replaced():
+    loop = asyncio.get_running_loop()
+    broken = ProcessPoolExecutor(max_workers=1)
+    os.kill(await loop.run_in_executor(broken, os.getpid), signal.SIGKILL)
+    service = serve.Service(broken, lambda: ProcessPoolExecutor(max_workers=1))
+    server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        async with server:
+            answers = [
+                await _request(
+                    lambda: asyncio.open_connection('127.0.0.1', port),
+                    'POST',
+                    '/validate',
+                    CSAF_EXAMPLE_COM_123_PATH.read_bytes(),
+                )
+                for _ in range(2)
+            ]
+    finally:
+        service.executor.shutdown()
+    assert answers[0] == (HTTPStatus.INTERNAL_SERVER_ERROR, {'status': 500, 'error': 'validation failed'})
+    assert answers[1][0] == HTTPStatus.OK
+    assert service.executor is not broken
+
+
+@pytest.mark.asyncio
+async def test_read_request_decodes_chunked_bodies(monkeypatch):
+    reader = asyncio.StreamReader()
+    reader.feed_data(b'POST /validate HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n')
+    reader.feed_data(b'5;name=value\r\n{"a":\r\n3\r\n 1}\r\n0\r\nX-Trailer: 1\r\n\r\n')
+    assert (await serve.read_request(reader))[3] == b'{"a": 1}'
+
+    monkeypatch.setattr(serve, 'MAX_BODY_BYTES', 4)
+    for head, chunks, status in (
+        (b'Transfer-Encoding: chunked', b'5\r\n{"a":\r\n0\r\n\r\n', HTTPStatus.REQUEST_ENTITY_TOO_LARGE),
+        (b'Transfer-Encoding: chunked', b'x\r\n', HTTPStatus.BAD_REQUEST),
+        (b'Transfer-Encoding: chunked', b'2\r\n{}--0\r\n\r\n', HTTPStatus.BAD_REQUEST),
+        (b'Transfer-Encoding: gzip', b'', HTTPStatus.NOT_IMPLEMENTED),
+    ):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'POST /validate HTTP/1.1\r\n' + head + b'\r\n\r\n' + chunks)
+        with pytest.raises(serve.BadRequest) as caught:
+            await serve.read_request(reader)
+        assert caught.value.status == status
@@ -0,0 +1,115 @@
+import json
+
+import msgspec
+import pytest
+
+import csaf.csaf as api
+import csaf.stream as stream
+from csaf.mandatory.index import Index, harvest, harvest_events
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH
+
+
+def _doc():
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['product_tree'] = {
+        'relationships': [
+            {
+                'category': 'installed_on',
+                'full_product_name': {'name': 'A on B', 'product_id': 'CSAFPID-3'},
+                'product_reference': 'CSAFPID-1',
+                'relates_to_product_reference': 'CSAFPID-2',
+            }
+        ],
+        'branches': [
+            {
+                'category': 'vendor',
+                'name': 'Example',
+                'branches': [
+                    {'category': 'product_name', 'name': 'A', 'product': {'name': 'A', 'product_id': 'CSAFPID-1'}}
+                ],
+            }
+        ],
+        'full_product_names': [{'name': 'B', 'product_id': 'CSAFPID-2'}],
+        'product_groups': [{'group_id': 'CSAFGID-1', 'product_ids': ['CSAFPID-1', 'CSAFPID-2']}],
+    }
+    doc['vulnerabilities'] = [
+        {
+            'notes': [{'category': 'summary', 'text': 'Long text ' * 100}],
+            'product_status': {'known_affected': ['CSAFPID-1'], 'fixed': ['CSAFPID-3']},
+            'threats': [{'category': 'impact', 'details': 'bad', 'group_ids': ['CSAFGID-1']}],
+        },
+        'not an object',
+        {'scores': [{'products': ['CSAFPID-9'], 'cvss_v3': {}}]},
+    ]
+    return doc
+
+
+def test_events_yield_sections_in_harvest_order_without_unused_members():
+    pointers, values = zip(*stream.events(json.dumps(_doc()).encode()))
+    assert pointers == (
+        '/document',
+        '/product_tree/branches',
+        '/product_tree/full_product_names',
+        '/product_tree/product_groups',
+        '/product_tree/relationships',
+        '/vulnerabilities/0',
+        '/vulnerabilities/1',
+        '/vulnerabilities/2',
+    )
+    assert values[1] == [{'branches': [{'product': {'product_id': 'CSAFPID-1'}}]}]
+    assert values[4][0] == {
+        'full_product_name': {'product_id': 'CSAFPID-3'},
+        'product_reference': 'CSAFPID-1',
+        'relates_to_product_reference': 'CSAFPID-2',
+    }
+    assert 'notes' not in values[5]
+    assert values[5]['product_status'] == {'known_affected': ['CSAFPID-1'], 'fixed': ['CSAFPID-3']}
+    assert values[6] == {}
+
+
+def test_events_tolerate_sections_of_unexpected_shape():
+    data = json.dumps({'document': {}, 'product_tree': [], 'vulnerabilities': {}}).encode()
+    assert list(stream.events(data)) == [('/document', {})]
+    with pytest.raises(msgspec.DecodeError):
+        list(stream.events(b'{"document": '))
+
+
+def test_harvest_events_matches_harvest():
+    doc = _doc()
+    full, streamed = harvest(doc), harvest_events(stream.events(json.dumps(doc).encode()))
+    for slot in Index.__slots__:
+        if slot != 'document':
+            assert getattr(streamed, slot) == getattr(full, slot), slot
+    assert streamed.document == {'document': doc['document']}
+
+
+def test_harvest_events_matches_harvest_for_product_tree_members_of_unexpected_shape():
+    doc = _doc()
+    doc['product_tree']['branches'].append('not an object')
+    doc['product_tree']['full_product_names'][0]['product_identification_helper'] = {'purl': 'pkg:pypi/csaf'}
+    doc['product_tree']['relationships'][0]['full_product_name'] = 42
+    full, streamed = harvest(doc), harvest_events(stream.events(json.dumps(doc).encode()))
+    for slot in ('product_ids', 'product_refs', 'group_ids', 'purls', 'relationships'):
+        assert getattr(streamed, slot) == getattr(full, slot), slot
+
+
+def test_oversized_advisories_are_validated_section_by_section(tmp_path, monkeypatch):
+    path = tmp_path / 'large.json'
+    path.write_text(json.dumps(_doc()))
+    expected = api.assess('validate', 'commit', str(path), {})
+    assert expected.code == 1
+    assert expected.findings[0].rule == '6.1.1'
+
+    def materialize(data):
+        raise AssertionError('oversized advisory decoded in one piece')
+
+    monkeypatch.setattr(api, 'CSAF_WARN_MAX_BYTES', 1000)
+    monkeypatch.setattr(api, 'CSAF_MMAP_MIN_BYTES', 0)
+    monkeypatch.setattr(api, 'verify_json', materialize)
+    assert api.assess('validate', 'commit', str(path), {}) == expected
+
+    path.write_text('{"document": {"category": "csaf_base"}' + ' ' * 2000 + '}')
+    result = api.assess('validate', 'commit', str(path), {})
+    assert (result.code, result.message) == (1, 'missing document property (csaf_version)')
+    path.write_text('{"document": ' + ' ' * 2000)
+    assert api.assess('validate', 'commit', str(path), {}).message == 'advisory is no valid JSON'
@@ -0,0 +1,108 @@
+import copy
+import json
+import typing
+
+import msgspec
+import pytest
+from pydantic import BaseModel, RootModel, ValidationError
+
+import csaf.csaf as api
+import csaf.mandatory.rules as rules
+import csaf.structs as structs
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH
+
+
+def _models(model, seen):
+    """Yield the pydantic models reachable from model (unwrapping root models)."""
+    if model in seen:
+        return
+    seen.add(model)
+    if not issubclass(model, RootModel):
+        yield model
+    for field in model.model_fields.values():
+        todo = [field.annotation]
+        while todo:
+            thing = todo.pop()
+            todo.extend(typing.get_args(thing))
+            if isinstance(thing, type) and issubclass(thing, BaseModel):
+                yield from _models(thing, seen)
+
+
+def test_structs_mirror_the_fields_of_the_pydantic_models():
+    for model in _models(api.CSAF, set()):
+        struct = getattr(structs, model.__name__)
+        encoded = set(struct.__struct_encode_fields__)
+        if struct.__struct_config__.tag_field:
+            encoded.add(struct.__struct_config__.tag_field)
+        assert encoded == {field.alias or key for key, field in model.model_fields.items()}, model.__name__
+
+
+def test_decode_engines_agree_on_fixture():
+    data = CSAF_EXAMPLE_COM_123_PATH.read_bytes()
+    typed = api.decode(data, 'msgspec')
+    model = api.decode(data, 'pydantic')
+    assert isinstance(typed, structs.CSAF)
+    assert typed.document.tracking.id == model.document.tracking.id
+    assert typed.document.publisher.category == model.document.publisher.category.value
+
+
+def test_decode_tagged_cvss_versions():
+    score = {'products': ['CSAFPID-1'], 'cvss_v3': {'version': '3.0', 'vectorString': 'CVSS:3.0/AV:N'}}
+    score['cvss_v3'].update({'baseScore': 9.8, 'baseSeverity': 'CRITICAL'})
+    assert isinstance(msgspec.json.decode(json.dumps(score), type=structs.Score).cvss_v3, structs.CVSS30)
+    score['cvss_v3']['version'] = '3.1'
+    with pytest.raises(msgspec.ValidationError, match=r'\$\.cvss_v3\.vectorString'):
+        msgspec.json.decode(json.dumps(score), type=structs.Score)
+
+
+def test_decode_cvss_v2_impacts():
+    cvss_v2 = {
+        'version': '2.0',
+        'vectorString': 'AV:N/AC:M/Au:N/C:C/I:C/A:P',
+        'accessVector': 'NETWORK',
+        'accessComplexity': 'MEDIUM',
+        'authentication': 'NONE',
+        'confidentialityImpact': 'COMPLETE',
+        'integrityImpact': 'COMPLETE',
+        'availabilityImpact': 'PARTIAL',
+        'baseScore': 9.0,
+    }
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['product_tree'] = {'full_product_names': [{'name': 'A', 'product_id': 'CSAFPID-1'}]}
+    doc['vulnerabilities'] = [{'scores': [{'products': ['CSAFPID-1'], 'cvss_v2': cvss_v2}]}]
+    assert rules.is_valid_consistent_cvss(doc) is True
+    data = json.dumps(doc)
+    assert api.decode(data, 'msgspec').vulnerabilities[0].scores[0].cvss_v2.availability_impact == 'PARTIAL'
+    assert api.decode(data, 'pydantic').vulnerabilities[0].scores[0].cvss_v2.availability_impact.value == 'PARTIAL'
+    cvss_v2['availabilityImpact'] = 'LOW'
+    data = json.dumps(doc)
+    with pytest.raises(msgspec.ValidationError, match=r'availabilityImpact'):
+        api.decode(data, 'msgspec')
+    with pytest.raises(ValidationError):
+        api.decode(data, 'pydantic')
+
+
+def test_decode_rejects_what_pydantic_rejects():
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    broken = copy.deepcopy(doc)
+    broken['document']['publisher']['category'] = 'nobody'
+    data = json.dumps(broken)
+    with pytest.raises(msgspec.ValidationError, match=r'\$\.document\.publisher\.category'):
+        api.decode(data, 'msgspec')
+    with pytest.raises(ValidationError):
+        api.decode(data, 'pydantic')
+    with pytest.raises(ValueError, match='unknown engine'):
+        api.decode(data, 'simdjson')
+
+
+def test_assess_buffer_type_checks_with_engine():
+    doc = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text())
+    doc['vulnerabilities'] = [{'cve': 'CVE-22-1'}]
+    data = json.dumps(doc).encode()
+    assert api.assess_buffer('x.json', data).code == 0
+    for engine in api.ENGINES:
+        result = api.assess_buffer('x.json', data, engine)
+        assert result.code == 1
+        assert result.message.startswith('advisory fails type check (')
+    assert api.assess('validate', 'commit', str(CSAF_EXAMPLE_COM_123_PATH), {'engine': 'msgspec'}).code == 0
+    assert api.assess('validate', 'commit', str(CSAF_EXAMPLE_COM_123_PATH), {'engine': 'simdjson'}).message == 'USAGE'
@@ -0,0 +1,118 @@
+import json
+
+import csaf.csaf as api
+import csaf.schema as conformance
+from csaf.vex import Vex, as_dict, vulnerability_key
+from test.conftest import CSAF_EXAMPLE_COM_123_PATH
+
+VECTOR_STRING = 'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H'
+CVE = 'CVE-2021-44228'
+PRODUCT_TREE = {
+    'full_product_names': [
+        {'name': 'A', 'product_id': 'CSAFPID-1'},
+        {'name': 'B', 'product_id': 'CSAFPID-2'},
+        {'name': 'C', 'product_id': 'CSAFPID-3'},
+    ],
+    'product_groups': [{'group_id': 'CSAFGID-1', 'product_ids': ['CSAFPID-1', 'CSAFPID-3']}],
+}
+VULNERABILITIES = [
+    {
+        'cve': CVE,
+        'product_status': {
+            'first_affected': ['CSAFPID-3'],
+            'known_affected': ['CSAFPID-1', 'CSAFPID-3'],
+            'fixed': ['CSAFPID-2'],
+        },
+        'remediations': [
+            {'category': 'vendor_fix', 'details': 'Update.', 'group_ids': ['CSAFGID-1']},
+            {'category': 'mitigation', 'details': 'Block.', 'product_ids': ['CSAFPID-1'], 'group_ids': ['CSAFGID-1']},
+        ],
+        'threats': [{'category': 'impact', 'details': 'Remote code execution.', 'product_ids': ['CSAFPID-1']}],
+        'scores': [
+            {
+                'products': ['CSAFPID-1'],
+                'cvss_v3': {
+                    'version': '3.1',
+                    'vectorString': VECTOR_STRING,
+                    'baseScore': 10.0,
+                    'baseSeverity': 'CRITICAL',
+                },
+            }
+        ],
+    },
+    {
+        'id': {'system_name': 'Tracker', 'text': 'BUG-42'},
+        'product_status': {'known_affected': ['CSAFPID-2']},
+    },
+]
+
+
+def _advisory():
+    advisory = json.loads(CSAF_EXAMPLE_COM_123_PATH.read_text(encoding='utf-8'))
+    advisory['product_tree'] = PRODUCT_TREE
+    advisory['vulnerabilities'] = VULNERABILITIES
+    return advisory
+
+
+def _check(vex):
+    assert vex.keys == (CVE, 'BUG-42')
+    assert vex.groups == {'CSAFGID-1': ('CSAFPID-1', 'CSAFPID-3')}
+    assert vex.status('CSAFPID-1', CVE) == ('known_affected',)
+    assert vex.status('CSAFPID-3', CVE) == ('first_affected', 'known_affected')
+    assert vex.status('CSAFPID-2', CVE) == ('fixed',)
+    assert vex.products(CVE, 'known_affected') == ('CSAFPID-1', 'CSAFPID-3')
+    assert vex.affected(CVE) == ('CSAFPID-3', 'CSAFPID-1')
+    assert vex.affecting('CSAFPID-2') == ('BUG-42',)
+    assert vex.affecting('CSAFPID-3') == (CVE,)
+    assert [item['category'] for item in vex.remediations('CSAFPID-1', CVE)] == ['vendor_fix', 'mitigation']
+    assert [item['category'] for item in vex.remediations('CSAFPID-3', CVE)] == ['vendor_fix', 'mitigation']
+    assert vex.remediations('CSAFPID-2', CVE) == ()
+    assert [item['category'] for item in vex.threats('CSAFPID-1', CVE)] == ['impact']
+    assert vex.threats('CSAFPID-3', CVE) == ()
+    assert [score['cvss_v3']['baseScore'] for score in vex.scores('CSAFPID-1', CVE)] == [10.0]
+
+
+def test_vex_of_decoded_json():
+    advisory = _advisory()
+    assert not conformance.validate(advisory)
+    _check(Vex(advisory))
+
+
+def test_vex_of_models_and_structs():
+    data = json.dumps(_advisory()).encode()
+    for engine in ('pydantic', 'msgspec'):
+        _check(Vex(api.decode(data, engine)))
+
+
+def test_vex_unknown_lookups_are_empty():
+    vex = Vex(_advisory())
+    assert vex.status('CSAFPID-9', CVE) == ()
+    assert vex.status('CSAFPID-1', 'CVE-1999-0001') == ()
+    assert vex.products(CVE, 'recommended') == ()
+    assert vex.affected('CVE-1999-0001') == ()
+    assert vex.affecting('CSAFPID-9') == ()
+    assert vex.remediations('CSAFPID-9', CVE) == vex.threats('CSAFPID-9', CVE) == vex.scores('CSAFPID-9', CVE) == ()
+
+
+def test_vex_tolerates_schema_violations():
+    vex = Vex({'product_tree': [], 'vulnerabilities': [42, {'cve': CVE, 'product_status': {'fixed': 'CSAFPID-1'}}]})
+    assert vex.keys == (CVE,)
+    assert vex.status('CSAFPID-1', CVE) == ()
+    assert Vex({}).keys == ()
+
+
+def test_vex_expand_skips_unknown_groups():
+    vex = Vex(_advisory())
+    assert vex.expand(['CSAFPID-3'], ['CSAFGID-1', 'CSAFGID-9']) == ('CSAFPID-3', 'CSAFPID-1')
+    assert vex.expand(None, None) == ()
+
+
+def test_vulnerability_key():
+    assert vulnerability_key({'cve': CVE, 'id': {'system_name': 'Tracker', 'text': 'BUG-42'}}) == CVE
+    assert vulnerability_key({'id': {'system_name': 'Tracker', 'text': 'BUG-42'}}) == 'BUG-42'
+    assert vulnerability_key({'id': 'BUG-42'}) == vulnerability_key({}) == ''
+
+
+def test_as_dict_passes_decoded_json_through():
+    advisory = _advisory()
+    assert as_dict(advisory) is advisory